@@ -0,0 +1,93 @@
+""" Benchmark of the forecast of the top N of a tournament in progress """
+import argparse
+import json
+import random
+import time
+
+from bench.pairing_benchmark import create_participants, get_random_results
+from controllers.forecast import NUMBER_OF_SIMULATIONS, forecast_top_n
+from controllers.swiss_system import apply_results, pair_round
+from models.round import Round
+
+
+""" Time within which a forecast must answer, in seconds """
+TARGET_SECONDS = 5
+
+
+def run(
+    number_of_players: int,
+    number_of_played_rounds: int,
+    number_of_rounds: int,
+    top_n: int,
+    number_of_processes: int,
+):
+    """Time forecast_top_n on a synthetic tournament with random results
+    Args:
+    number_of_players - number of players in the tournament
+    number_of_played_rounds - number of rounds played before the forecast
+    number_of_rounds - number of rounds in the tournament
+    top_n - number of places counted
+    number_of_processes - number of processes running the simulations
+
+    Return:
+    dict - benchmark results"""
+    random_generator = random.Random(0)
+    players = create_participants(number_of_players)
+    matches = []
+    for round_number in range(1, number_of_played_rounds + 1):
+        round_matches = pair_round(players, round_number)
+        current_round = Round(round_number=round_number, matches=round_matches)
+        results = get_random_results(round_matches, random_generator)
+        apply_results(current_round, results)
+        matches += round_matches
+
+    start = time.perf_counter()
+    forecast_top_n(
+        players,
+        number_of_played_rounds,
+        number_of_rounds,
+        top_n,
+        matches,
+        seed=0,
+        number_of_processes=number_of_processes,
+    )
+    duration = time.perf_counter() - start
+
+    return {
+        "players": number_of_players,
+        "played_rounds": number_of_played_rounds,
+        "rounds": number_of_rounds,
+        "top_n": top_n,
+        "simulations": NUMBER_OF_SIMULATIONS,
+        "processes": number_of_processes,
+        "seconds": round(duration, 2),
+        "target_seconds": TARGET_SECONDS,
+        "meets_target": duration <= TARGET_SECONDS,
+    }
+
+
+def main():
+    """Parse arguments and print the benchmark results as json"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--played-rounds", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=1)
+    arguments = parser.parse_args()
+
+    print(
+        json.dumps(
+            run(
+                arguments.players,
+                arguments.played_rounds,
+                arguments.rounds,
+                arguments.top,
+                arguments.processes,
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
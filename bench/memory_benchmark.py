@@ -0,0 +1,160 @@
+""" Benchmark of the memory used by the DatabaseHandler to load a large database """
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from controllers.database_handler import SCHEMA_VERSION
+
+
+def create_db_file(
+    file_path: str,
+    number_of_players: int,
+    number_of_tournaments: int,
+    players_per_tournament: int,
+    number_of_rounds: int,
+):
+    """Write a db.json file holding finished tournaments with all their rounds and matches
+    Args:
+    file_path - path of the json file
+    number_of_players - number of players in the players table
+    number_of_tournaments - number of tournaments
+    players_per_tournament - number of players in each tournament
+    number_of_rounds - number of rounds in each tournament"""
+    random_generator = random.Random(0)
+    players = {
+        str(i): {
+            "player_id": i,
+            "last_name": f"PLAYER{i}",
+            "first_name": "Bench",
+            "date_of_birth": "01/01/1990",
+            "sex": "M",
+            "ranking": i,
+        }
+        for i in range(1, number_of_players + 1)
+    }
+    tournaments = {}
+    rounds = {}
+    matches = {}
+    for tournament_id in range(1, number_of_tournaments + 1):
+        player_ids = random_generator.sample(
+            range(1, number_of_players + 1), players_per_tournament
+        )
+        round_ids = []
+        for round_number in range(1, number_of_rounds + 1):
+            round_id = len(rounds) + 1
+            match_ids = []
+            for i in range(0, players_per_tournament, 2):
+                match_id = len(matches) + 1
+                matches[str(match_id)] = {
+                    "tournament_id": tournament_id,
+                    "round_id": round_id,
+                    "round_number": round_number,
+                    "pair_of_players": [player_ids[i], player_ids[i + 1]],
+                    "match_id": match_id,
+                    "winner": [player_ids[i]],
+                }
+                match_ids.append(match_id)
+            rounds[str(round_id)] = {
+                "id": round_id,
+                "round_number": round_number,
+                "round_name": f"round{round_number}",
+                "tournament_id": tournament_id,
+                "matches": match_ids,
+                "is_round_finished": True,
+                "start_date_time": "2030-01-01 10:00:00",
+                "end_date_time": "2030-01-01 11:00:00",
+            }
+            round_ids.append(round_id)
+        tournaments[str(tournament_id)] = {
+            "id": tournament_id,
+            "name": f"Open {tournament_id}",
+            "location": "Paris",
+            "date": "01/01/2030",
+            "number_of_rounds": number_of_rounds,
+            "list_of_rounds": round_ids,
+            "list_of_players": player_ids,
+            "scores": {
+                str(player_id): {"total_score": 1.0, "opponents_list": player_ids[:4]}
+                for player_id in player_ids
+            },
+            "time_control": "Blitz",
+            "description": "",
+            "is_finished": True,
+            "final_result": player_ids,
+        }
+    with open(file_path, "w") as db_file:
+        json.dump(
+            {
+                "meta": {"1": {"schema_version": SCHEMA_VERSION}},
+                "players": players,
+                "tournaments": tournaments,
+                "rounds": rounds,
+                "matches": matches,
+            },
+            db_file,
+        )
+
+
+def run(arguments):
+    """Load all the tables of a synthetic database and measure the memory held
+    by the loaded objects
+    Arg:
+    arguments - parsed command line arguments
+
+    Return:
+    dict - benchmark results"""
+    create_db_file(
+        "db.json",
+        arguments.players,
+        arguments.tournaments,
+        arguments.players_per_tournament,
+        arguments.rounds,
+    )
+
+    from controllers.database_handler import DatabaseHandler
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    db_handler = DatabaseHandler()
+    number_of_objects = (
+        len(db_handler.players)
+        + len(db_handler.tournaments)
+        + len(db_handler.rounds)
+        + len(db_handler.matches)
+    )
+    duration = time.perf_counter() - start
+    gc.collect()
+    current_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "loaded_objects": number_of_objects,
+        "db_size_bytes": os.path.getsize("db.json"),
+        "load_seconds": round(duration, 2),
+        "retained_memory_mb": round(current_memory / 1024 / 1024, 1),
+        "peak_memory_mb": round(peak_memory / 1024 / 1024, 1),
+    }
+
+
+def main():
+    """Parse arguments and print the benchmark results as json"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--tournaments", type=int, default=200)
+    parser.add_argument("--players-per-tournament", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=7)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        print(json.dumps(run(arguments)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+""" Benchmark of the pairing of the rounds of a large tournament """
+import argparse
+import json
+import random
+import time
+
+from controllers.swiss_system import apply_results, pair_round
+from models.participant import Participant
+from models.player import Player
+from models.round import Round
+
+
+def create_participants(number_of_players: int):
+    """Create the participants of a synthetic tournament
+    Arg:
+    number_of_players - number of players in the tournament
+
+    Return:
+    list - Participants ranked by their id"""
+    return [
+        Participant(
+            Player(
+                player_id=i,
+                last_name=f"PLAYER{i}",
+                first_name="Bench",
+                date_of_birth="01/01/1990",
+                sex="M",
+                ranking=i,
+            )
+        )
+        for i in range(1, number_of_players + 1)
+    ]
+
+
+def get_random_results(matches: list, random_generator: random.Random):
+    """Get random results of the matches: 45% won by each player, 10% of draws
+    Args:
+    matches - list of matches of the round
+    random_generator - random generator of the results
+
+    Return:
+    list - winner ids of each match"""
+    results = []
+    for match in matches:
+        result = random_generator.random()
+        if result < 0.45:
+            results.append([match.player_01.player_id])
+        elif result < 0.9:
+            results.append([match.player_02.player_id])
+        else:
+            results.append([match.player_01.player_id, match.player_02.player_id])
+    return results
+
+
+def run(number_of_players: int, number_of_rounds: int, pairing_engine: str):
+    """Time pair_round on the rounds of a synthetic tournament
+    Args:
+    number_of_players - number of players in the tournament
+    number_of_rounds - number of rounds paired after the first one
+    pairing_engine - "greedy", "blossom" or "score_groups"
+
+    Return:
+    dict - benchmark results"""
+    random_generator = random.Random(0)
+    players = create_participants(number_of_players)
+
+    durations = []
+    for round_number in range(1, number_of_rounds + 2):
+        start = time.perf_counter()
+        matches = pair_round(players, round_number, pairing_engine=pairing_engine)
+        if round_number > 1:
+            durations.append(time.perf_counter() - start)
+        current_round = Round(round_number=round_number, matches=matches)
+        apply_results(current_round, get_random_results(matches, random_generator))
+
+    return {
+        "players": number_of_players,
+        "pairing_engine": pairing_engine,
+        "ms_per_round": [round(duration * 1000, 1) for duration in durations],
+        "total_seconds": round(sum(durations), 2),
+    }
+
+
+def main():
+    """Parse arguments and print the benchmark results as json"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument(
+        "--engine", choices=("greedy", "blossom", "score_groups"), default="greedy"
+    )
+    arguments = parser.parse_args()
+
+    print(json.dumps(run(arguments.players, arguments.rounds, arguments.engine)))
+
+
+if __name__ == "__main__":
+    main()
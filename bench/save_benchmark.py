@@ -0,0 +1,129 @@
+""" Benchmark of the DatabaseHandler save methods on a large database """
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from controllers.database_handler import SCHEMA_VERSION
+from models.database import TransactionalJSONStorage
+
+
+STORAGE_CALLS = {"read": 0, "write": 0}
+
+
+def count_storage_calls():
+    """Wrap the storage file read and write to count the calls made by each save"""
+    read = TransactionalJSONStorage.read
+    write_to_file = TransactionalJSONStorage.write_to_file
+
+    def counted_read(storage):
+        if storage.transaction_data is None:
+            STORAGE_CALLS["read"] += 1
+        return read(storage)
+
+    def counted_write_to_file(storage, data):
+        STORAGE_CALLS["write"] += 1
+        return write_to_file(storage, data)
+
+    TransactionalJSONStorage.read = counted_read
+    TransactionalJSONStorage.write_to_file = counted_write_to_file
+
+
+def get_serialized_player(player_id: int):
+    """Get a synthetic serialized player
+    Arg:
+    player_id - unique id of the player
+
+    Return:
+    dict - serialized player"""
+    return {
+        "player_id": player_id,
+        "last_name": f"PLAYER{player_id}",
+        "first_name": "Bench",
+        "date_of_birth": "01/01/1990",
+        "sex": "M",
+        "ranking": player_id,
+    }
+
+
+def create_db_file(file_path: str, number_of_players: int, number_of_matches: int):
+    """Write a db.json file holding the given number of players and matches
+    Args:
+    file_path - path of the json file
+    number_of_players - number of players in the players table
+    number_of_matches - number of matches in the matches table"""
+    players = {
+        str(i): get_serialized_player(i) for i in range(1, number_of_players + 1)
+    }
+    matches = {
+        str(i): {
+            "tournament_id": 1,
+            "round_id": 1,
+            "round_number": 1,
+            "pair_of_players": [1, 2],
+            "match_id": i,
+            "winner": [1],
+        }
+        for i in range(1, number_of_matches + 1)
+    }
+    with open(file_path, "w") as db_file:
+        json.dump(
+            {
+                "meta": {"1": {"schema_version": SCHEMA_VERSION}},
+                "players": players,
+                "matches": matches,
+            },
+            db_file,
+        )
+
+
+def run(number_of_matches: int, number_of_saves: int):
+    """Time save_match_to_db on a database holding number_of_matches matches
+    Args:
+    number_of_matches - number of matches already in the database
+    number_of_saves - number of matches to save
+
+    Return:
+    dict - benchmark results"""
+    from controllers.database_handler import DatabaseHandler
+    from models.match import Match
+
+    create_db_file("db.json", 200, number_of_matches)
+    db_handler = DatabaseHandler()
+    pair_of_players = (db_handler.players[0], db_handler.players[1])
+
+    STORAGE_CALLS["read"] = 0
+    STORAGE_CALLS["write"] = 0
+    start = time.perf_counter()
+    for i in range(number_of_saves):
+        match = Match(
+            tournament_id=1, round_number=2, pair_of_players=pair_of_players, winner=[1]
+        )
+        db_handler.save_match_to_db(match)
+    duration = time.perf_counter() - start
+
+    return {
+        "matches_in_db": number_of_matches,
+        "db_size_bytes": os.path.getsize("db.json"),
+        "ms_per_save": round(duration * 1000 / number_of_saves, 2),
+        "reads_per_save": STORAGE_CALLS["read"] / number_of_saves,
+        "writes_per_save": STORAGE_CALLS["write"] / number_of_saves,
+    }
+
+
+def main():
+    """Parse arguments and print the benchmark results as json"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=5000)
+    parser.add_argument("--saves", type=int, default=30)
+    arguments = parser.parse_args()
+
+    count_storage_calls()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        print(json.dumps(run(arguments.matches, arguments.saves)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+""" Simulation of a full swiss tournament with synthetic players, created and played
+through TournamentManager with scripted answers, measuring the pairing and save times,
+the size of the database and the peak memory """
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from functools import partial
+from unittest import mock
+
+
+""" Winner prompt of RoundView, answered with the drawn result of the match """
+WINNER_PROMPT = "Veuillez entrer l'id du gagnant du match "
+
+""" DatabaseHandler methods writing a tournament to db, each call is one save """
+SAVE_METHODS = (
+    "save_tournament_to_db",
+    "save_match_to_db",
+    "save_round_to_db",
+    "update_match_in_db",
+    "update_round_in_db",
+    "update_tournament_in_db",
+)
+
+""" Pairing time of each round, number of saves and save time of each phase:
+"tournament" (its creation), the round numbers and "final" (its close).
+The save time includes the commits of the transactions. """
+TIMINGS = {"phase": "tournament", "pairing": [], "saves": {}, "seconds": {}}
+
+
+def get_ratings(number_of_players: int, random_generator: random.Random):
+    """Draw Elo ratings for the players, the best rating going to ranking 1
+    Args:
+    number_of_players - number of players in the tournament
+    random_generator - random generator of the ratings
+
+    Return:
+    list - ratings sorted from the best, the rating of ranking r is at index r - 1"""
+    ratings = [random_generator.gauss(1800, 300) for i in range(number_of_players)]
+    return sorted(ratings, reverse=True)
+
+
+def get_result(
+    match, ratings: dict, results_mode: str, random_generator: random.Random
+):
+    """Draw the result of a match. The bye (nobody player) is won by the other player.
+    With Elo results, the draw rate is 25% between equal players and decreases
+    with the rating difference, the expected score gives the rest.
+    Args:
+    match - Match to play
+    ratings - Elo ratings by player id
+    results_mode - "random" (45% won by each player, 10% of draws) or "elo"
+    random_generator - random generator of the results
+
+    Return:
+    list - winner id, or both ids in case of a draw"""
+    id_01 = match.player_01.player_id
+    id_02 = match.player_02.player_id
+    if id_02 == 0:
+        return [id_01]
+    if id_01 == 0:
+        return [id_02]
+
+    if results_mode == "elo":
+        expected_score = 1 / (1 + 10 ** ((ratings[id_02] - ratings[id_01]) / 400))
+        draw_probability = 0.25 * (1 - abs(expected_score - 0.5) * 2)
+        win_probability = expected_score - draw_probability / 2
+    else:
+        draw_probability = 0.1
+        win_probability = 0.45
+
+    result = random_generator.random()
+    if result < win_probability:
+        return [id_01]
+    if result < win_probability + draw_probability:
+        return [id_01, id_02]
+    return [id_02]
+
+
+class ScriptedInput:
+    """Replacement of input answering the prompts of TournamentManager:
+    the tournament and its players, then the drawn winner of each match"""
+
+    def __init__(self, answers: list, draw_winner):
+        """Init attributes:
+        answers - iterator of the answers of the tournament prompts
+        draw_winner - function giving the winner ids of a match
+        matches - matches of the round being played, in the order of the prompts"""
+        self.answers = iter(answers)
+        self.draw_winner = draw_winner
+        self.matches = []
+
+    def __call__(self, prompt=""):
+        """Answer a prompt
+        Arg:
+        prompt - text of the prompt
+
+        Return:
+        str - answer"""
+        if prompt.startswith(WINNER_PROMPT):
+            match_number = int(prompt[len(WINNER_PROMPT):].split()[0])
+            winner = self.draw_winner(self.matches[match_number - 1])
+            return " ".join(str(player_id) for player_id in winner)
+        return next(self.answers)
+
+
+def start_phase(phase):
+    """Count the following saves in a new phase
+    Arg:
+    phase - round number, "tournament" or "final" """
+    TIMINGS["phase"] = phase
+    TIMINGS["saves"].setdefault(phase, 0)
+    TIMINGS["seconds"].setdefault(phase, 0)
+
+
+def time_saves(owner, method_name: str, is_save=True):
+    """Wrap a write method to add its time, and its call if it is a save,
+    to the current phase
+    Args:
+    owner - class or instance holding the method
+    method_name - name of the method
+    is_save - count the calls as saves, a commit only adds its time"""
+    method = getattr(owner, method_name)
+
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        TIMINGS["seconds"][TIMINGS["phase"]] += time.perf_counter() - start
+        if is_save:
+            TIMINGS["saves"][TIMINGS["phase"]] += 1
+        return result
+
+    setattr(owner, method_name, timed_method)
+
+
+def time_pairing(round_generator_class, method_name: str, scripted_input):
+    """Wrap a pairing method of RoundGenerator to time it, to give its matches
+    to the scripted input and to count the following saves in the next round
+    Args:
+    round_generator_class - RoundGenerator
+    method_name - generate_first_round or generate_next_round
+    scripted_input - ScriptedInput answering the winner prompts"""
+    method = getattr(round_generator_class, method_name)
+
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        matches = method(*args, **kwargs)
+        TIMINGS["pairing"].append(time.perf_counter() - start)
+        scripted_input.matches = matches
+        start_phase(len(TIMINGS["pairing"]))
+        return matches
+
+    setattr(round_generator_class, method_name, timed_method)
+
+
+def start_final_phase(tournament_manager_class):
+    """Wrap the close of the tournament to count its saves in the "final" phase
+    Arg:
+    tournament_manager_class - TournamentManager"""
+    method = tournament_manager_class.update_tournament_in_db
+
+    def final_method(*args, **kwargs):
+        start_phase("final")
+        return method(*args, **kwargs)
+
+    tournament_manager_class.update_tournament_in_db = final_method
+
+
+def get_ms_per_save(phase):
+    """Get the average save time of a phase
+    Arg:
+    phase - round number, "tournament" or "final"
+
+    Return:
+    float - time per save in ms"""
+    if TIMINGS["saves"][phase] == 0:
+        return 0
+    return round(TIMINGS["seconds"][phase] * 1000 / TIMINGS["saves"][phase], 3)
+
+
+def get_directory_size(directory_path: str):
+    """Get the size of all the files of a directory, whatever the storage backend
+    Arg:
+    directory_path - path of the directory
+
+    Return:
+    int - size in bytes"""
+    size = 0
+    for root, directories, files in os.walk(directory_path):
+        for file_name in files:
+            size += os.path.getsize(os.path.join(root, file_name))
+    return size
+
+
+def get_peak_memory_mb():
+    """Get the peak resident memory of the process
+
+    Return:
+    float - peak memory in MB"""
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    """ Linux counts in kilobytes, macOS in bytes """
+    if sys.platform == "darwin":
+        peak_memory /= 1024
+    return round(peak_memory / 1024, 1)
+
+
+def run(arguments):
+    """Create the players, then create and play the tournament through
+    TournamentManager, RoundGenerator and RoundView, the prompts being answered
+    with the drawn results
+    Arg:
+    arguments - parsed command line arguments
+
+    Return:
+    dict - benchmark results"""
+    os.environ["CTM_DB_BACKEND"] = arguments.backend
+    os.environ["CTM_PAIRING_ENGINE"] = arguments.engine
+    from controllers.database_handler import DatabaseHandler
+    from controllers.round_generator import RoundGenerator
+    from controllers.tournament_manager import TournamentManager
+
+    random_generator = random.Random(arguments.seed)
+    ratings_by_ranking = get_ratings(arguments.players, random_generator)
+    db_handler = DatabaseHandler()
+
+    start = time.perf_counter()
+    with db_handler.transaction():
+        players = []
+        for i in range(arguments.players):
+            player = db_handler.create_player(
+                last_name=f"PLAYER{i + 1}",
+                first_name="Bench",
+                date_of_birth="01/01/1990",
+                sex="M",
+                ranking=i + 1,
+            )
+            db_handler.save_player_to_db(player)
+            players.append(player)
+    players_save_seconds = time.perf_counter() - start
+    ratings = {
+        player.player_id: ratings_by_ranking[i] for i, player in enumerate(players)
+    }
+
+    scripted_input = ScriptedInput(
+        ["Bench open", "Paris", "01/01/2099", str(arguments.rounds), "Blitz", "Bench"]
+        + [str(len(players))]
+        + [str(player.player_id) for player in players],
+        partial(
+            get_result,
+            ratings=ratings,
+            results_mode=arguments.results,
+            random_generator=random_generator,
+        ),
+    )
+    for method_name in SAVE_METHODS:
+        time_saves(DatabaseHandler, method_name)
+    time_saves(db_handler.database, "commit_transaction", is_save=False)
+    time_pairing(RoundGenerator, "generate_first_round", scripted_input)
+    time_pairing(RoundGenerator, "generate_next_round", scripted_input)
+    start_final_phase(TournamentManager)
+    start_phase("tournament")
+
+    with open(os.devnull, "w") as devnull:
+        with mock.patch("builtins.input", scripted_input):
+            with contextlib.redirect_stdout(devnull):
+                TournamentManager()
+
+    round_numbers = range(1, len(TIMINGS["pairing"]) + 1)
+    return {
+        "players": arguments.players,
+        "rounds": arguments.rounds,
+        "pairing_engine": arguments.engine,
+        "results": arguments.results,
+        "backend": arguments.backend,
+        "players_save_seconds": round(players_save_seconds, 3),
+        "pairing_ms_per_round": [
+            round(duration * 1000, 1) for duration in TIMINGS["pairing"]
+        ],
+        "saves_per_round": [TIMINGS["saves"][number] for number in round_numbers],
+        "save_ms_per_round": [
+            round(TIMINGS["seconds"][number] * 1000, 1) for number in round_numbers
+        ],
+        "ms_per_save": [get_ms_per_save(number) for number in round_numbers],
+        "final_saves": TIMINGS["saves"]["final"],
+        "final_save_ms": round(TIMINGS["seconds"]["final"] * 1000, 1),
+        "db_size_bytes": get_directory_size("."),
+        "peak_memory_mb": get_peak_memory_mb(),
+    }
+
+
+def main():
+    """Parse arguments and print the benchmark results as json"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument(
+        "--engine", choices=("greedy", "blossom", "score_groups"), default="greedy"
+    )
+    parser.add_argument("--results", choices=("random", "elo"), default="elo")
+    parser.add_argument(
+        "--backend",
+        choices=("tinydb", "journal", "sharded", "sqlite"),
+        default=os.environ.get("CTM_DB_BACKEND", "tinydb"),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        print(json.dumps(run(arguments)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,403 @@
 """ Define the database handler controller """
+from contextlib import contextmanager
 from operator import attrgetter
 from tinydb import Query
+from tinydb.table import Document
 
-from models.database import Database
+from models.database import get_database
 from models.player import Player
+from models.participant import Participant, create_no_player
 from models.tournament import Tournament
 from models.round import Round
 from models.match import Match
 
+from controllers.report_cache import ReportCache
+
+
+""" Version of the format of the stored documents:
+1 - tournaments, rounds and matches embed full copies of players, rounds and matches
+2 - they reference them by id, the players' scores are kept in the tournament's "scores" """
+SCHEMA_VERSION = 2
+
 
 class DatabaseHandler:
-    """DatabaseHandler class"""
+    """DatabaseHandler class
+
+    Only one instance exists per process: every controller and view calling
+    DatabaseHandler() gets the same, already loaded, repository."""
+
+    instance = None
+
+    def __new__(cls):
+        """Return the shared instance, creating it on first call."""
+        if cls.instance is None:
+            cls.instance = super().__new__(cls)
+            cls.instance.is_loaded = False
+        return cls.instance
 
     def __init__(self):
-        """Init attributes:
-        database - instance of Database
-        players_table - tinydb table for Player
-        tournaments_table - tinydb table for Tournament
-        rounds_table - tinydb table for Round
-        matches_table - tinydb table for Match
-        players - deserialized list of Players
-        tournaments - deserialized list of Tournaments
-        rounds - deserialized list of Rounds
-        matches - deserialized list of matches
+        """Init attributes (only once per process):
+        database - instance of Database, ShardedDatabase or SQLiteDatabase,
+            according to the configured backend
+        players_table - table for Player
+        tournaments_table - table for Tournament
+        rounds_table - table for Round
+        matches_table - table for Match
+        meta_table - table holding the schema version
+        deserialized_lists - deserialized objects by table name, in the order of db
+            once the table is loaded (see the players, tournaments, rounds and
+            matches properties)
+        loaded_table_names - names of the tables whose documents are all deserialized
+        identity_map - dict of loaded objects by table name, then by unique id
+        tournaments_by_status - index of tournaments by is_finished, then by id
+        rounds_by_tournament - index of rounds by tournament id
+        matches_by_tournament - index of matches by tournament id
+        matches_by_round - index of matches by (tournament id, round number)
+        tournament_players_by_id - index of the players of each tournament by
+            tournament id, then by player id
+        unlinked_round_ids - ids of the rounds of the tournaments loaded before their rounds
+        loaded_tournament_ids - ids of the tournaments whose rounds and matches are loaded
+        next_ids - next unique id to allocate by table name, computed on first allocation
+        transaction_depth - number of nested transactions in progress
+        report_cache - ReportCache of the reports, invalidated by the writes
         QueryItem - tinydb query item
 
         init methods:
         create_tables - create tinydb tables
-        load_deserialized_players - populate players list with deserialized Players from db
-        load_deserialized_tournaments - populate tournaments list with deserialized Tournaments from db
-        load_deserialized_rounds - populate rounds list with deserialized Rounds from db
-        load_deserialized_matches - populate matches list with deserialized Matches from db"""
+        migrate_schema - convert documents stored with an older schema version
 
-        self.database = Database()
+        The documents are deserialized on first access, one by one when looked up
+        by id, or a whole table at once through the list properties."""
+        if self.is_loaded:
+            return
+
+        self.database = get_database()
+        self.transaction_depth = 0
 
         self.players_table = None
         self.tournaments_table = None
         self.rounds_table = None
         self.matches_table = None
+        self.meta_table = None
 
         self.create_tables()
+        self.migrate_schema()
+
+        self.identity_map = {
+            "players": {},
+            "tournaments": {},
+            "rounds": {},
+            "matches": {},
+        }
+        self.tournaments_by_status = {False: {}, True: {}}
+        self.rounds_by_tournament = {}
+        self.matches_by_tournament = {}
+        self.matches_by_round = {}
+        self.tournament_players_by_id = {}
+        self.unlinked_round_ids = {}
+        self.loaded_tournament_ids = set()
+        self.deserialized_lists = {
+            "players": [],
+            "tournaments": [],
+            "rounds": [],
+            "matches": [],
+        }
+        self.loaded_table_names = set()
+        self.next_ids = {}
+        self.report_cache = ReportCache()
 
-        self.players = []
-        self.load_deserialized_players()
+        self.QueryItem = Query()
 
-        self.tournaments = []
-        self.load_deserialized_tournaments()
+        self.is_loaded = True
+
+    def reload(self):
+        """Discard the loaded objects and load them again from db"""
+        self.is_loaded = False
+        self.__init__()
+
+    @property
+    def players(self):
+        """Deserialized list of all the Players, loaded on first access"""
+        self.load_table("players")
+        return self.deserialized_lists["players"]
+
+    @property
+    def tournaments(self):
+        """Deserialized list of all the Tournaments, loaded on first access"""
+        self.load_table("tournaments")
+        return self.deserialized_lists["tournaments"]
+
+    @property
+    def rounds(self):
+        """Deserialized list of all the Rounds, loaded on first access"""
+        self.load_table("rounds")
+        return self.deserialized_lists["rounds"]
+
+    @property
+    def matches(self):
+        """Deserialized list of all the Matches, loaded on first access"""
+        self.load_table("matches")
+        return self.deserialized_lists["matches"]
+
+    def load_table(self, table_name: str):
+        """Deserialize all the documents of a table, once
+        Arg:
+        table_name - name of the tinydb table"""
+        if table_name in self.loaded_table_names:
+            return
+        self.loaded_table_names.add(table_name)
+        if table_name in ["rounds", "matches"]:
+            self.loaded_table_names.update(["rounds", "matches"])
+        if table_name == "players":
+            self.load_deserialized_players()
+        elif table_name == "tournaments":
+            self.load_deserialized_tournaments()
+        elif self.database.is_sharded:
+            """ Rounds and matches are loaded with their tournament """
+            for tournament in self.tournaments:
+                self.load_tournament(tournament)
+        else:
+            """ Rounds and matches are loaded with their tournament,
+            reading each table once for all the tournaments """
+            serialized_matches = self.group_documents_by_tournament(self.matches_table)
+            serialized_rounds = self.group_documents_by_tournament(self.rounds_table)
+            for tournament in self.tournaments:
+                self.load_tournament(
+                    tournament,
+                    serialized_matches.get(tournament.id, []),
+                    serialized_rounds.get(tournament.id, []),
+                )
+
+    @contextmanager
+    def transaction(self):
+        """Buffer all the writes made inside the with block and
+        flush them in one atomic write when the outermost block ends.
+        If an exception is raised, the writes are discarded
+        and the objects are reloaded from db.
+
+        Usage:
+        with db_handler.transaction():
+            ..."""
+        if self.transaction_depth == 0:
+            self.database.begin_transaction()
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.database.rollback_transaction()
+                self.reload()
+            raise
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.database.commit_transaction()
 
-        self.rounds = []
-        self.load_deserialized_rounds()
+    def create_tables(self):
+        """Create tables"""
+        self.players_table = self.database.table("players")
+        self.tournaments_table = self.database.table("tournaments")
+        self.rounds_table = self.database.table("rounds")
+        self.matches_table = self.database.table("matches")
+        self.meta_table = self.database.table("meta")
 
-        self.matches = []
-        self.load_deserialized_matches()
+    def get_schema_version(self):
+        """Get the schema version of the stored documents
 
-        self.QueryItem = Query()
+        Return:
+        int - schema version, 1 for databases created before versioning"""
+        meta = self.meta_table.get(doc_id=1)
+        if meta is None:
+            return 1
+        return meta["schema_version"]
+
+    def migrate_schema(self):
+        """Convert the documents stored with schema version 1, embedding copies
+        of players, rounds and matches, to references by id, in one transaction"""
+        if self.get_schema_version() >= SCHEMA_VERSION:
+            return
+
+        self.database.begin_transaction()
+        try:
+            self.tournaments_table.update(self.migrate_tournament_document)
+            self.rounds_table.update(self.migrate_round_document)
+            self.matches_table.update(self.migrate_match_document)
+            self.meta_table.insert(
+                Document({"schema_version": SCHEMA_VERSION}, doc_id=1)
+            )
+        except BaseException:
+            self.database.rollback_transaction()
+            raise
+        self.database.commit_transaction()
+
+    def migrate_tournament_document(self, document: dict):
+        """Replace embedded players and rounds of a tournament document by their ids
+        and keep the players' scores in "scores"
+        Arg:
+        document - tournament dict from db, updated in place"""
+        scores = {}
+        for player in document["list_of_players"] + document["final_result"]:
+            scores.setdefault(
+                str(player["player_id"]),
+                {
+                    "total_score": player["total_score"],
+                    "opponents_list": player["opponents_list"],
+                    "ranking": player["ranking"],
+                },
+            )
+        document["scores"] = scores
+        document["list_of_players"] = [
+            player["player_id"] for player in document["list_of_players"]
+        ]
+        document["final_result"] = [
+            player["player_id"] for player in document["final_result"]
+        ]
+        document["list_of_rounds"] = [round["id"] for round in document["list_of_rounds"]]
+
+    def migrate_round_document(self, document: dict):
+        """Replace embedded matches of a round document by their ids
+        Arg:
+        document - round dict from db, updated in place"""
+        document["matches"] = [match["match_id"] for match in document["matches"]]
 
-    def create_tables(self):
-        """Create tinydb tables"""
-        self.players_table = self.database.db.table("players")
-        self.tournaments_table = self.database.db.table("tournaments")
-        self.rounds_table = self.database.db.table("rounds")
-        self.matches_table = self.database.db.table("matches")
+    def migrate_match_document(self, document: dict):
+        """Replace embedded players of a match document by their ids
+        Arg:
+        document - match dict from db, updated in place"""
+        document["pair_of_players"] = [
+            player["player_id"] for player in document["pair_of_players"]
+        ]
+
+    def get_loaded_object(self, table_name: str, id: int):
+        """Get an already loaded object from the identity map
+        Args:
+        table_name - name of the tinydb table of the object
+        id - unique id of the object
+
+        Return:
+        loaded object or None"""
+        return self.identity_map[table_name].get(id)
+
+    def register_object(self, table_name: str, id: int, object):
+        """Add an object to the identity map and to its deserialized list
+        Args:
+        table_name - name of the tinydb table of the object
+        id - unique id of the object
+        object - object to register"""
+        self.identity_map[table_name][id] = object
+        self.deserialized_lists[table_name].append(object)
+        self.add_to_indexes(table_name, object)
+
+    def allocate_id(self, table_name: str):
+        """Allocate the unique id of a new object before its insertion,
+        so that the id is part of the inserted document.
+        Arg:
+        table_name - name of the tinydb table of the object
+
+        Return:
+        id(int) - unique id, also used as the tinydb doc_id"""
+        if table_name not in self.next_ids:
+            self.next_ids[table_name] = self.get_first_free_id(table_name)
+        id = self.next_ids[table_name]
+        self.next_ids[table_name] += 1
+        return id
+
+    def get_first_free_id(self, table_name: str):
+        """Get the id following the highest id stored in a table,
+        reading the doc_ids without deserializing the documents
+        Arg:
+        table_name - name of the tinydb table
+
+        Return:
+        int - first free id"""
+        tables = {
+            "players": self.players_table,
+            "tournaments": self.tournaments_table,
+            "rounds": self.rounds_table,
+            "matches": self.matches_table,
+        }
+        loaded_ids = list(self.identity_map[table_name].keys())
+        if self.database.is_sharded and table_name in ["rounds", "matches"]:
+            """ Rounds and matches of the shards not opened yet may have higher ids """
+            return max(loaded_ids + [self.database.get_next_id(table_name) - 1]) + 1
+        stored_ids = [document.doc_id for document in tables[table_name]]
+        return max(loaded_ids + stored_ids, default=0) + 1
+
+    def add_to_indexes(self, table_name: str, object):
+        """Add a registered object to the secondary indexes of its table
+        (players are indexed by id in the identity map)
+        Args:
+        table_name - name of the tinydb table of the object
+        object - registered object"""
+        if table_name == "tournaments":
+            self.tournaments_by_status[bool(object.is_finished)][object.id] = object
+            self.tournament_players_by_id[object.id] = {
+                player.player_id: player
+                for player in object.list_of_players + object.final_result
+            }
+        elif table_name == "rounds":
+            self.rounds_by_tournament.setdefault(object.tournament_id, []).append(
+                object
+            )
+        elif table_name == "matches":
+            self.matches_by_tournament.setdefault(object.tournament_id, []).append(
+                object
+            )
+            self.matches_by_round.setdefault(
+                (object.tournament_id, object.round_number), []
+            ).append(object)
+
+    def update_player_in_db(self, player: Player, fields: list):
+        """Write the given fields of an already saved player to db
+        Args:
+        player(Player) - player object, already updated
+        fields - names of the fields to write"""
+        serialized_player = player.get_serialized_player()
+        self.players_table.update(
+            {field: serialized_player[field] for field in fields},
+            doc_ids=[player.player_id],
+        )
+        self.report_cache.invalidate("players")
+
+    def update_tournament_in_db(self, tournament: Tournament, fields: list):
+        """Write the given fields of an already saved tournament to db
+        and keep the status index up to date
+        Args:
+        tournament(Tournament) - tournament object, already updated
+        fields - names of the fields to write"""
+        serialized_tournament = tournament.get_serialized_tournament()
+        self.tournaments_table.update(
+            {field: serialized_tournament[field] for field in fields},
+            doc_ids=[tournament.id],
+        )
+        self.tournaments_by_status[not tournament.is_finished].pop(tournament.id, None)
+        self.tournaments_by_status[bool(tournament.is_finished)][
+            tournament.id
+        ] = tournament
+        self.report_cache.invalidate_tournament(tournament.id)
+
+    def update_round_in_db(self, round: Round, fields: list):
+        """Write the given fields of an already saved round to db
+        Args:
+        round(Round) - round object, already updated
+        fields - names of the fields to write"""
+        serialized_round = round.get_serialized_round()
+        self.rounds_table.update(
+            {field: serialized_round[field] for field in fields}, doc_ids=[round.id]
+        )
+        self.report_cache.invalidate_tournament(round.tournament_id)
+
+    def update_match_in_db(self, match: Match, fields: list):
+        """Write the given fields of an already saved match to db
+        Args:
+        match(Match) - match object, already updated
+        fields - names of the fields to write"""
+        serialized_match = match.get_serialized_match()
+        self.matches_table.update(
+            {field: serialized_match[field] for field in fields},
+            doc_ids=[match.match_id],
+        )
+        self.report_cache.invalidate_tournament(match.tournament_id)
 
     def create_player(
         self,
@@ -85,9 +422,7 @@ class DatabaseHandler:
             first_name=first_name,
             date_of_birth=date_of_birth,
             sex=sex,
-            total_score=0,
             ranking=ranking,
-            opponents_list=[],
         )
         return player
 
@@ -97,26 +432,24 @@ class DatabaseHandler:
         player(Player) - player object
 
         Return:
-        serialized_player_updated - player dict from db, updated with the corresponding unique id"""
+        serialized_player - saved player dict, with the corresponding unique id"""
+        player.player_id = self.allocate_id("players")
         serialized_player = player.get_serialized_player()
+        self.save_to_db(self.players_table, serialized_player, player.player_id)
+        self.register_object("players", player.player_id, player)
+        self.report_cache.invalidate("players")
+        return serialized_player
 
-        """ Store doc_id of the saved player and update player_id with the same. """
-        player_id = self.save_to_db(self.players_table, serialized_player)
-        updated_ids = self.players_table.update(
-            {"player_id": player_id}, doc_ids=[player_id]
-        )
-        serialized_player_updated = self.players_table.get(doc_id=updated_ids[0])
-        return serialized_player_updated
-
-    def save_to_db(self, table, serialized_data):
-        """Insert serialized data to the corresponding table
+    def save_to_db(self, table, serialized_data, doc_id: int):
+        """Insert serialized data to the corresponding table, in a single write
         Args:
         table - tinydb table
         serialized_data - serialized data to save to db
+        doc_id - unique id allocated for the data
 
         Return:
         id(int) - doc_id of the inserted data"""
-        id = table.insert(serialized_data)
+        id = table.insert(Document(serialized_data, doc_id=doc_id))
         return id
 
     def get_deserialized_player(self, serialized_player):
@@ -132,17 +465,65 @@ class DatabaseHandler:
             serialized_player["first_name"],
             serialized_player["date_of_birth"],
             serialized_player["sex"],
-            serialized_player["total_score"],
             serialized_player["ranking"],
-            serialized_player["opponents_list"],
         )
         return player
 
+    def create_no_player(self):
+        """Create the player named nobody, added to a tournament
+        with an odd number of players
+
+        Return:
+        participant(Participant) - nobody player, with id 0"""
+        return create_no_player()
+
+    def get_tournament_player(self, player_id: int, serialized_scores: dict):
+        """Get the participant of a player with the score, opponents and ranking
+        of a tournament. Tournaments saved before the ranking was kept with the scores
+        take the current ranking of the player.
+        Args:
+        player_id - unique id of the player
+        serialized_scores - "scores" dict of the serialized tournament
+
+        Return:
+        participant(Participant) - player of the tournament"""
+        if player_id == 0:
+            participant = self.create_no_player()
+        else:
+            participant = Participant(self.get_player_object_from_id(player_id))
+        score = serialized_scores.get(str(player_id))
+        if score is not None:
+            participant.total_score = score["total_score"]
+            participant.opponents = set(score["opponents_list"])
+            participant.ranking = score.get("ranking", participant.ranking)
+        return participant
+
+    def get_player_in_a_tournament(self, tournament_id: int, player_id: int):
+        """Get the player object of a tournament from its id
+        Args:
+        tournament_id - unique id of the tournament
+        player_id - unique id of the player
+
+        Return:
+        participant(Participant) - player of the tournament"""
+        players_by_id = self.tournament_players_by_id.setdefault(tournament_id, {})
+        player = players_by_id.get(player_id)
+        if player is None:
+            player = self.get_tournament_player(player_id, {})
+            players_by_id[player_id] = player
+        return player
+
     def load_deserialized_players(self):
-        """Populate the list of players with deserialized players"""
+        """Populate the list of players with all the players of db, in the order of db,
+        deserializing the players not loaded yet"""
+        players = []
         for player in self.players_table:
-            deserialized_player = self.get_deserialized_player(player)
-            self.players.append(deserialized_player)
+            deserialized_player = self.get_loaded_object("players", player.doc_id)
+            if deserialized_player is None:
+                deserialized_player = self.get_deserialized_player(player)
+                self.register_object("players", player.doc_id, deserialized_player)
+            players.append(deserialized_player)
+        self.deserialized_lists["players"] = players
 
     def create_tournament(
         self,
@@ -164,7 +545,7 @@ class DatabaseHandler:
         time_control - time control (bullet, blitz or coup rapide)
         description - description for the tournament
         number_of_players - number of players in the tournament
-        players - list of Players
+        players - list of Players, each taking part through a new Participant
         final_result - sorted list of players according to their score at the end of the tournament
 
         Return:
@@ -175,7 +556,7 @@ class DatabaseHandler:
             date=tournament_date,
             number_of_rounds=number_of_rounds,
             list_of_rounds=[],
-            list_of_players=players,
+            list_of_players=[Participant(player) for player in players],
             time_control=time_control,
             description=description,
             is_finished=False,
@@ -189,55 +570,193 @@ class DatabaseHandler:
         tournament(Tournament) - tournament object
 
         Return:
-        serialized_tournament_updated - tournament dict from db, updated with the corresponding unique id"""
+        serialized_tournament - saved tournament dict, with the corresponding unique id"""
+        tournament.id = self.allocate_id("tournaments")
         serialized_tournament = tournament.get_serialized_tournament()
-
-        """ Store doc_id of the saved tournament and update id of the tournament with the same. """
-        tournament_id = self.save_to_db(self.tournaments_table, serialized_tournament)
-        updated_ids = self.tournaments_table.update(
-            {"id": tournament_id}, doc_ids=[tournament_id]
-        )
-        serialized_tournament_updated = self.tournaments_table.get(
-            doc_id=updated_ids[0]
-        )
-        return serialized_tournament_updated
+        self.save_to_db(self.tournaments_table, serialized_tournament, tournament.id)
+        self.loaded_tournament_ids.add(tournament.id)
+        self.register_object("tournaments", tournament.id, tournament)
+        self.report_cache.invalidate_tournament(tournament.id)
+        return serialized_tournament
 
     def get_deserialized_tournament(self, serialized_tournament):
-        """Get deserialized tournament from a serialized tournament
+        """Get deserialized tournament from a serialized tournament,
+        from the identity map if it is already loaded
         Arg:
         serialized_tournament - tournament dict from db
 
         Return:
         tournament(Tournament) - tournament object"""
+        loaded_tournament = self.get_loaded_object(
+            "tournaments", serialized_tournament["id"]
+        )
+        if loaded_tournament is not None:
+            return loaded_tournament
+
+        """ One Participant per player of the tournament, shared by
+        list_of_players and final_result. When reading one player reads the whole
+        file, all the players are read at once instead of one by one. """
+        if self.database.reads_whole_file:
+            self.load_table("players")
+        scores = serialized_tournament["scores"]
+        players_by_id = {}
+        for player_id in (
+            serialized_tournament["list_of_players"]
+            + serialized_tournament["final_result"]
+        ):
+            if player_id not in players_by_id:
+                players_by_id[player_id] = self.get_tournament_player(player_id, scores)
+
         tournament = Tournament(
             serialized_tournament["id"],
             serialized_tournament["name"],
             serialized_tournament["location"],
             serialized_tournament["date"],
             serialized_tournament["number_of_rounds"],
+            [],
             [
-                self.get_deserialized_round(round)
-                for round in serialized_tournament["list_of_rounds"]
-            ],
-            [
-                self.get_deserialized_player(player)
-                for player in serialized_tournament["list_of_players"]
+                players_by_id[player_id]
+                for player_id in serialized_tournament["list_of_players"]
             ],
             serialized_tournament["time_control"],
             serialized_tournament["description"],
             serialized_tournament["is_finished"],
             [
-                self.get_deserialized_player(player)
-                for player in serialized_tournament["final_result"]
+                players_by_id[player_id]
+                for player_id in serialized_tournament["final_result"]
             ],
         )
+        """ Rounds are linked now if they are loaded, else by load_tournament """
+        round_ids = serialized_tournament["list_of_rounds"]
+        if all(self.get_loaded_object("rounds", id) for id in round_ids):
+            tournament.list_of_rounds = [
+                self.get_loaded_object("rounds", id) for id in round_ids
+            ]
+        else:
+            self.unlinked_round_ids[tournament.id] = round_ids
+        if tournament.id:
+            self.register_object("tournaments", tournament.id, tournament)
         return tournament
 
     def load_deserialized_tournaments(self):
-        """Populate the list of tournaments with deserialized tournaments"""
-        for tournament in self.tournaments_table:
-            deserialized_tournament = self.get_deserialized_tournament(tournament)
-            self.tournaments.append(deserialized_tournament)
+        """Populate the list of tournaments with all the tournaments of db,
+        in the order of db, deserializing the tournaments not loaded yet"""
+        self.deserialized_lists["tournaments"] = [
+            self.get_deserialized_tournament(tournament)
+            for tournament in self.tournaments_table
+        ]
+
+    def get_documents_in_a_tournament(self, table, tournament_id: int):
+        """Get the documents of a rounds or matches table belonging to a tournament
+        Args:
+        table - rounds or matches table
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of documents"""
+        if self.database.is_sharded:
+            return table.get_documents_in_shard(tournament_id)
+        if self.database.indexes_tournament_id:
+            return table.search_by_tournament(tournament_id)
+        return [
+            document
+            for document in table
+            if document["tournament_id"] == tournament_id
+        ]
+
+    def group_documents_by_tournament(self, table):
+        """Group the documents of a rounds or matches table by tournament
+        Arg:
+        table - rounds or matches table
+
+        Return:
+        dict - lists of documents by tournament id"""
+        documents_by_tournament = {}
+        for document in table:
+            documents_by_tournament.setdefault(document["tournament_id"], []).append(
+                document
+            )
+        return documents_by_tournament
+
+    def load_tournament(
+        self, tournament: Tournament, serialized_matches=None, serialized_rounds=None
+    ):
+        """Deserialize the rounds and matches of a tournament, on first use.
+        With a sharded database, the tournaments are deserialized from the catalog,
+        their players and scores are also read from their shard.
+        Args:
+        tournament(Tournament) - registered tournament
+        serialized_matches - match dicts of the tournament, read from db if None
+        serialized_rounds - round dicts of the tournament, read from db if None"""
+        if tournament.id in self.loaded_tournament_ids:
+            return
+        self.loaded_tournament_ids.add(tournament.id)
+
+        round_ids = self.unlinked_round_ids.pop(tournament.id, None)
+        if self.database.is_sharded:
+            serialized_tournament = self.tournaments_table.get(doc_id=tournament.id)
+            tournament.list_of_players = [
+                self.get_player_in_a_tournament(tournament.id, player_id)
+                for player_id in serialized_tournament["list_of_players"]
+            ]
+            """ The players of the catalog are shared with final_result,
+            update them in place """
+            players_by_id = self.tournament_players_by_id[tournament.id]
+            for player_id, player in players_by_id.items():
+                score = serialized_tournament["scores"].get(str(player_id))
+                if score is not None:
+                    player.total_score = score["total_score"]
+                    player.opponents = set(score["opponents_list"])
+                    player.ranking = score.get("ranking", player.ranking)
+            round_ids = serialized_tournament["list_of_rounds"]
+
+        if serialized_matches is None:
+            serialized_matches = self.get_documents_in_a_tournament(
+                self.matches_table, tournament.id
+            )
+        if serialized_rounds is None:
+            serialized_rounds = self.get_documents_in_a_tournament(
+                self.rounds_table, tournament.id
+            )
+        """ Matches are loaded before the rounds referencing them """
+        for match in serialized_matches:
+            self.get_deserialized_match(match)
+        for round in serialized_rounds:
+            self.get_deserialized_round(round)
+        if round_ids is not None:
+            tournament.list_of_rounds = [
+                self.get_loaded_object("rounds", id)
+                for id in round_ids
+                if self.get_loaded_object("rounds", id) is not None
+            ]
+        self.apply_score_changes(tournament)
+
+    def apply_score_changes(self, tournament: Tournament):
+        """Apply the score changes saved with each round, in the order of the rounds,
+        on top of the scores saved with the tournament. A change holds the total
+        score, so the changes already included in the tournament's scores give
+        the same result. The nobody player is added back to an ongoing tournament
+        which gave a bye.
+        Arg:
+        tournament(Tournament) - tournament whose rounds are loaded"""
+        players_by_id = {
+            player.player_id: player
+            for player in tournament.list_of_players + tournament.final_result
+        }
+        for round in sorted(
+            self.rounds_by_tournament.get(tournament.id, []),
+            key=attrgetter("round_number"),
+        ):
+            for player_id, score_change in round.score_changes.items():
+                player = players_by_id.get(int(player_id))
+                if player is None:
+                    if int(player_id) != 0 or tournament.is_finished:
+                        continue
+                    player = self.create_no_player()
+                    tournament.list_of_players.append(player)
+                    players_by_id[0] = player
+                player.total_score = score_change["total_score"]
+                player.opponents.update(score_change["new_opponents"])
 
     def validate_player_id_exists(self, player_id: int):
         """Validate player id exists in the db
@@ -246,10 +765,7 @@ class DatabaseHandler:
 
         Return:
         bool - player id exists in db"""
-        for player in self.players:
-            if player.player_id == player_id:
-                return True
-        return False
+        return self.get_player_object_from_id(player_id) is not None
 
     def save_round_to_db(self, round: Round):
         """Save round to database.
@@ -257,87 +773,89 @@ class DatabaseHandler:
         round(Round) - round object
 
         Return:
-        serialized_round_updated - round dict from db, updated with corresponding unique id"""
+        serialized_round - saved round dict, with corresponding unique id"""
+        round.id = self.allocate_id("rounds")
         serialized_round = round.get_serialized_round()
-
-        """ Store doc_id of the saved round and update id with the same. """
-        round_id = self.save_to_db(self.rounds_table, serialized_round)
-        updated_ids = self.rounds_table.update({"id": round_id}, doc_ids=[round_id])
-        serialized_round_updated = self.rounds_table.get(doc_id=updated_ids[0])
-        return serialized_round_updated
+        self.save_to_db(self.rounds_table, serialized_round, round.id)
+        self.register_object("rounds", round.id, round)
+        self.report_cache.invalidate_tournament(round.tournament_id)
+        return serialized_round
 
     def get_deserialized_round(self, serialized_round):
-        """Get deserialized round from a serialized round
+        """Get deserialized round from a serialized round,
+        from the identity map if it is already loaded
 
         Arg:
         serialized_round - round dict from db
 
         Return:
         round(Round) - round object"""
+        loaded_round = self.get_loaded_object("rounds", serialized_round["id"])
+        if loaded_round is not None:
+            return loaded_round
+
         round = Round(
             serialized_round["id"],
             serialized_round["round_number"],
             serialized_round["round_name"],
             serialized_round["tournament_id"],
             [
-                self.get_deserialized_match(match)
-                for match in serialized_round["matches"]
+                self.get_loaded_object("matches", match_id)
+                for match_id in serialized_round["matches"]
+                if self.get_loaded_object("matches", match_id) is not None
             ],
             serialized_round["is_round_finished"],
+            serialized_round.get("score_changes", {}),
         )
         round.start_date_time = serialized_round["start_date_time"]
         round.end_date_time = serialized_round["end_date_time"]
+        if round.id:
+            self.register_object("rounds", round.id, round)
         return round
 
-    def load_deserialized_rounds(self):
-        """Populate the list of rounds with deserialized ronuds."""
-        for round in self.rounds_table:
-            deserialized_round = self.get_deserialized_round(round)
-            self.rounds.append(deserialized_round)
-
     def save_match_to_db(self, match: Match):
         """Save match to database.
         Arg:
         match(Match) - match object
 
         Return:
-        serialized_match_updated - match dict from db, updated with corresponding unique id"""
+        serialized_match - saved match dict, with corresponding unique id"""
+        match.match_id = self.allocate_id("matches")
         serialized_match = match.get_serialized_match()
-
-        """ Store doc_id of the saved match and update match_id with the same. """
-        match_id = self.save_to_db(self.matches_table, serialized_match)
-        updated_ids = self.matches_table.update(
-            {"match_id": match_id}, doc_ids=[match_id]
-        )
-        serialized_match_updated = self.matches_table.get(doc_id=updated_ids[0])
-        return serialized_match_updated
+        self.save_to_db(self.matches_table, serialized_match, match.match_id)
+        self.register_object("matches", match.match_id, match)
+        self.report_cache.invalidate_tournament(match.tournament_id)
+        return serialized_match
 
     def get_deserialized_match(self, serialized_match):
-        """Get deserialized match from a serialized match
+        """Get deserialized match from a serialized match,
+        from the identity map if it is already loaded
         Arg:
         serialized_match - match dict from db
 
         Return:
         match(Match) - match object"""
+        loaded_match = self.get_loaded_object("matches", serialized_match["match_id"])
+        if loaded_match is not None:
+            return loaded_match
+
         match = Match(
             serialized_match["tournament_id"],
             serialized_match["round_id"],
             serialized_match["round_number"],
-            [
-                self.get_deserialized_player(player)
-                for player in serialized_match["pair_of_players"]
-            ],
+            tuple(
+                self.get_player_in_a_tournament(
+                    serialized_match["tournament_id"], player_id
+                )
+                for player_id in serialized_match["pair_of_players"]
+            ),
             serialized_match["match_id"],
             serialized_match["winner"],
         )
+        if match.match_id:
+            self.register_object("matches", match.match_id, match)
         return match
 
-    def load_deserialized_matches(self):
-        """Populate the list of matches with deserialized matches"""
-        for match in self.matches_table:
-            deserialized_match = self.get_deserialized_match(match)
-            self.matches.append(deserialized_match)
-
     def order_player_alphabetically(self, players: list):
         """Sort players in the alphabetical order
         Arg:
@@ -365,11 +883,82 @@ class DatabaseHandler:
 
         Return:
         list_of_players - list of Players in the tournament"""
-        list_of_players = []
-        for tournament in self.tournaments:
-            if tournament.id == tournament_id:
-                list_of_players = tournament.list_of_players
-        return list_of_players
+        tournament = self.get_tournament_by_id(tournament_id)
+        if tournament is None:
+            return []
+        return tournament.list_of_players
+
+    def get_tournament_by_id(self, tournament_id: int):
+        """Get tournament object from its unique id
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        tournament object or None"""
+        tournament = self.get_loaded_object("tournaments", tournament_id)
+        if tournament is None and "tournaments" not in self.loaded_table_names:
+            serialized_tournament = self.tournaments_table.get(doc_id=tournament_id)
+            if serialized_tournament is not None:
+                tournament = self.get_deserialized_tournament(serialized_tournament)
+        if tournament is not None:
+            self.load_tournament(tournament)
+        return tournament
+
+    def get_tournaments_by_status(self, is_finished: bool):
+        """Get finished or ongoing tournaments
+        Arg:
+        is_finished - True for finished tournaments, False for ongoing ones
+
+        Return:
+        list of Tournaments"""
+        self.load_table("tournaments")
+        return list(self.tournaments_by_status[is_finished].values())
+
+    def get_rounds_in_a_tournament(self, tournament_id: int):
+        """Get saved rounds of a tournament, in the order they were saved
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of Rounds"""
+        self.get_tournament_by_id(tournament_id)
+        return self.rounds_by_tournament.get(tournament_id, [])
+
+    def get_matches_in_a_tournament(self, tournament_id: int):
+        """Get saved matches of a tournament, in the order they were saved
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of Matches"""
+        self.get_tournament_by_id(tournament_id)
+        return self.matches_by_tournament.get(tournament_id, [])
+
+    def get_matches_in_a_round(self, tournament_id: int, round_number: int):
+        """Get saved matches of a round, in the order they were saved
+        Args:
+        tournament_id - unique id of the tournament
+        round_number - round number within the tournament
+
+        Return:
+        list of Matches"""
+        self.get_tournament_by_id(tournament_id)
+        return self.matches_by_round.get((tournament_id, round_number), [])
+
+    def get_matches_of_finished_rounds(self, tournament_id: int):
+        """Get saved matches of the finished rounds of a tournament
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of Matches"""
+        matches = []
+        for round in self.get_rounds_in_a_tournament(tournament_id):
+            if round.is_round_finished:
+                matches.extend(
+                    self.get_matches_in_a_round(tournament_id, round.round_number)
+                )
+        return matches
 
     def get_player_object_from_id(self, player_id: int):
         """Get player object from player_id
@@ -378,7 +967,11 @@ class DatabaseHandler:
         player_id - unique id of the player
 
         Return:
-        player object"""
-        for player in self.players:
-            if player.player_id == player_id:
-                return player
+        player object or None"""
+        player = self.get_loaded_object("players", player_id)
+        if player is None and "players" not in self.loaded_table_names:
+            serialized_player = self.players_table.get(doc_id=player_id)
+            if serialized_player is not None:
+                player = self.get_deserialized_player(serialized_player)
+                self.register_object("players", player_id, player)
+        return player
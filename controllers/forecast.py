@@ -0,0 +1,356 @@
+""" Forecast the final standings of a tournament by simulating its remaining rounds
+with the pairing of the application and results drawn from the rankings. The
+simulated finals are ranked with the tie-breaks, like the standings """
+import math
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from models.participant import Participant, create_no_player
+
+from controllers.pairing import PAIRING_ENGINE
+from controllers.standings import Standings
+from controllers.swiss_system import pair_players, sort_players_by_ranking
+from controllers.tie_break import TieBreaks, compute_tie_breaks
+
+
+""" Number of simulations of the remaining rounds of a forecast """
+NUMBER_OF_SIMULATIONS = 2000
+
+""" The players only have a ranking: ranking 1 is given this Elo rating,
+and each time the ranking doubles the rating goes down by RATING_STEP """
+TOP_RATING = 2700
+RATING_STEP = 150
+
+""" Draw rate between players of the same rating, decreasing with the gap
+of their ratings """
+DRAW_RATE = 0.25
+
+""" Number of values of the 32-bit integers drawn for the results """
+DRAW_RESOLUTION = 2**32
+
+""" Number of simulations run by each task of the process pool, each task has its
+own seed so a forecast does not depend on the number of cores """
+SIMULATIONS_PER_TASK = 250
+
+
+def get_pseudo_rating(ranking: int):
+    """Get an Elo rating from the ranking of a player
+    Arg:
+    ranking - ranking of the player, 1 being the best
+
+    Return:
+    float - pseudo Elo rating"""
+    return TOP_RATING - RATING_STEP * math.log2(max(ranking, 1))
+
+
+def get_result_thresholds(player_01, player_02):
+    """Get the probabilities of a match as thresholds of a uniform draw:
+    player_01 wins below the first one, the match is a draw below the second one,
+    player_02 wins above. The bye (nobody player) is won by the other player.
+    Args:
+    player_01 - first Participant of the match
+    player_02 - second Participant of the match
+
+    Return:
+    tuple - (win threshold, draw threshold)"""
+    if player_02.player_id == 0:
+        return 1.0, 1.0
+    if player_01.player_id == 0:
+        return 0.0, 0.0
+    rating_gap = get_pseudo_rating(player_02.ranking) - get_pseudo_rating(
+        player_01.ranking
+    )
+    expected_score = 1 / (1 + 10 ** (rating_gap / 400))
+    draw_probability = DRAW_RATE * (1 - abs(expected_score - 0.5) * 2)
+    win_probability = expected_score - draw_probability / 2
+    return win_probability, win_probability + draw_probability
+
+
+def get_pair_result(player_01, player_02):
+    """Get what the simulations need to play a pair, kept from one simulation
+    to the next since the same pairs come back
+    Args:
+    player_01 - first Participant of the match
+    player_02 - second Participant of the match
+
+    Return:
+    tuple - win and draw thresholds of get_result_thresholds as 32-bit integers,
+    ids of the two players"""
+    win_threshold, draw_threshold = get_result_thresholds(player_01, player_02)
+    return (
+        int(win_threshold * DRAW_RESOLUTION),
+        int(draw_threshold * DRAW_RESOLUTION),
+        player_01.player_id,
+        player_02.player_id,
+    )
+
+
+def add_game(tie_breaks, player, opponent, points: float, round_number: int):
+    """Add a simulated game to the games and the weighted points of a player.
+    The bye counts for the score but not as an opponent.
+    Args:
+    tie_breaks - TieBreaks holding the games of the player
+    player - Participant whose game is added
+    opponent - Participant met by the player
+    points - points scored by the player
+    round_number - number of the round of the game"""
+    if opponent.player_id:
+        tie_breaks.games[player.player_id].append((opponent.player_id, points))
+    tie_breaks.weighted_points[player.player_id] += round_number * points
+
+
+def set_final_tie_breaks(
+    tie_breaks, score_group: list, players: list, played_tie_breaks, simulated_rounds
+):
+    """Set the tie-breaks of the players of a score group at the end of
+    a simulation, from the played rounds and the simulated ones
+    Args:
+    tie_breaks - TieBreaks reused by the simulations, set in place
+    score_group - Participants with the same final score
+    players - list of Participants of the tournament with their final scores
+    played_tie_breaks - TieBreaks of the participants after the played rounds
+    simulated_rounds - (round number, pairs, points of the first player of each pair)
+    of each simulated round"""
+    for field in (
+        tie_breaks.scores,
+        tie_breaks.games,
+        tie_breaks.buchholz,
+        tie_breaks.sonneborn_berger,
+        tie_breaks.weighted_points,
+    ):
+        field.clear()
+    for player in players:
+        tie_breaks.scores[player.player_id] = player.total_score
+    for player in score_group:
+        player_id = player.player_id
+        tie_breaks.games[player_id] = list(played_tie_breaks.games[player_id])
+        tie_breaks.weighted_points[player_id] = played_tie_breaks.weighted_points[
+            player_id
+        ]
+
+    score_group = set(score_group)
+    for round_number, pairs, points_of_round in simulated_rounds:
+        for (player_01, player_02), points in zip(pairs, points_of_round):
+            if player_01 in score_group:
+                add_game(tie_breaks, player_01, player_02, points, round_number)
+            if player_02 in score_group:
+                add_game(tie_breaks, player_02, player_01, 1.0 - points, round_number)
+
+    scores = tie_breaks.scores
+    for player_id, games in tie_breaks.games.items():
+        tie_breaks.buchholz[player_id] = sum(
+            scores[opponent_id] for opponent_id, points in games
+        )
+        tie_breaks.sonneborn_berger[player_id] = sum(
+            points * scores[opponent_id] for opponent_id, points in games
+        )
+
+
+def get_top_n(
+    players: list, top_n: int, tie_breaks, played_tie_breaks, simulated_rounds
+):
+    """Get the players of a simulated final in the top N, ranked by score,
+    tie-breaks and ranking like Standings. The players above the score of the
+    N-th place are in the top N whatever their tie-breaks, so the tie-breaks are
+    computed only for the score group of the N-th place, when it does not fit
+    in the remaining places.
+    Args:
+    players - list of Participants with their final scores, without the nobody player
+    top_n - number of places counted
+    tie_breaks - TieBreaks reused by the simulations
+    played_tie_breaks - TieBreaks of the participants after the played rounds
+    simulated_rounds - (round number, pairs, points of the first player of each pair)
+    of each simulated round
+
+    Return:
+    list - Participants in the top N"""
+    if top_n >= len(players):
+        return players
+    cut_score = sorted([player.total_score for player in players], reverse=True)[
+        top_n - 1
+    ]
+    top_players = [player for player in players if player.total_score > cut_score]
+    score_group = [player for player in players if player.total_score == cut_score]
+    number_of_places = top_n - len(top_players)
+    if len(score_group) <= number_of_places:
+        return top_players + score_group
+
+    set_final_tie_breaks(
+        tie_breaks, score_group, players, played_tie_breaks, simulated_rounds
+    )
+    return top_players + Standings(score_group, tie_breaks).top(number_of_places)
+
+
+def count_top_n_finishes(
+    participants: list,
+    tie_breaks,
+    first_round_number: int,
+    number_of_rounds: int,
+    top_n: int,
+    number_of_simulations: int,
+    pairing_engine: str,
+    seed,
+):
+    """Simulate the remaining rounds of a tournament and count how many times
+    each player finishes in the top N. The rounds are paired like in the
+    application, without creating their matches. The players and the tie-breaks
+    are buffers set back to the played rounds at the start of each simulation.
+    The results of a round are drawn at once, one 32-bit integer per pair read
+    from a single block of random bytes, compared to the thresholds of the pair.
+    Args:
+    participants - list of Participants with their current scores and opponents,
+    with the nobody player if their number is odd
+    tie_breaks - TieBreaks of the participants after the played rounds
+    first_round_number - number of the first round to simulate
+    number_of_rounds - number of rounds in the tournament
+    top_n - number of places counted
+    number_of_simulations - number of simulations to run
+    pairing_engine - "greedy", "blossom" or "score_groups"
+    seed - seed of the random generator of the results
+
+    Return:
+    dict - number of top N finishes by player id"""
+    random_generator = random.Random(seed)
+    results_by_pair = {}
+    top_n_finishes = {player.player_id: 0 for player in participants}
+
+    """ Kept in the order of the rankings, so sorting the players by score
+    only moves the players whose score differs """
+    players = sort_players_by_ranking(
+        [
+            Participant(
+                player.player, player.total_score, player.opponents, player.ranking
+            )
+            for player in participants
+        ]
+    )
+    ranked_players = [player for player in players if player.player_id]
+    played_rounds = [
+        (player, player.total_score, frozenset(player.opponents)) for player in players
+    ]
+    final_tie_breaks = TieBreaks()
+    simulated_rounds = []
+    draw_format = struct.Struct(f"<{len(players) // 2}I")
+    """ Every simulation starts from the played rounds, so its first round
+    has the same pairs """
+    first_pairs = pair_players(players, first_round_number, pairing_engine)
+
+    for simulation in range(number_of_simulations):
+        for player, total_score, opponents in played_rounds:
+            player.total_score = total_score
+            player.opponents.intersection_update(opponents)
+        simulated_rounds.clear()
+
+        for round_number in range(first_round_number, number_of_rounds + 1):
+            if round_number == first_round_number:
+                pairs = first_pairs
+            else:
+                pairs = pair_players(players, round_number, pairing_engine)
+            draws = draw_format.unpack(random_generator.randbytes(draw_format.size))
+            points_of_round = []
+            for pair, draw in zip(pairs, draws):
+                result = results_by_pair.get(pair)
+                if result is None:
+                    result = get_pair_result(*pair)
+                    results_by_pair[pair] = result
+                win_threshold, draw_threshold, player_01_id, player_02_id = result
+                player_01, player_02 = pair
+                player_01.opponents.add(player_02_id)
+                player_02.opponents.add(player_01_id)
+                if draw < win_threshold:
+                    points = 1.0
+                elif draw < draw_threshold:
+                    points = 0.5
+                else:
+                    points = 0.0
+                player_01.total_score += points
+                player_02.total_score += 1.0 - points
+                points_of_round.append(points)
+            simulated_rounds.append((round_number, pairs, points_of_round))
+
+        for player in get_top_n(
+            ranked_players, top_n, final_tie_breaks, tie_breaks, simulated_rounds
+        ):
+            top_n_finishes[player.player_id] += 1
+
+    return top_n_finishes
+
+
+def forecast_top_n(
+    participants: list,
+    number_of_played_rounds: int,
+    number_of_rounds: int,
+    top_n: int,
+    matches=(),
+    number_of_simulations=NUMBER_OF_SIMULATIONS,
+    pairing_engine=PAIRING_ENGINE,
+    seed=None,
+    number_of_processes=None,
+):
+    """Get the probability of each player to finish in the top N of the tournament.
+    The simulations are split in tasks run by a process pool, one process per core.
+    Args:
+    participants - list of Participants of the tournament with their current
+    scores and opponents
+    number_of_played_rounds - number of rounds already finished
+    number_of_rounds - number of rounds in the tournament
+    top_n - number of places counted
+    matches - Matches of the finished rounds with their winners, giving the
+    tie-breaks of the played rounds. Without them, only the simulated rounds
+    count in the tie-breaks
+    number_of_simulations - number of simulations of the remaining rounds
+    pairing_engine - "greedy", "blossom" or "score_groups"
+    seed - seed of the random generator of the results, for a reproducible forecast
+    number_of_processes - number of processes of the pool, one per core by default.
+    With 1, the simulations run in the calling process
+
+    Return:
+    dict - probability to finish in the top N by player id"""
+    participants = [player for player in participants if player.player_id]
+    if number_of_played_rounds >= number_of_rounds:
+        """ The standings are final """
+        number_of_simulations = 1
+    tie_breaks = compute_tie_breaks(
+        [player.player_id for player in participants], matches
+    )
+    """ The scores of the participants rank them, with or without their matches """
+    for player in participants:
+        tie_breaks.scores[player.player_id] = player.total_score
+    if len(participants) % 2:
+        """ Add the nobody player for the bye, like RoundGenerator """
+        participants.append(create_no_player())
+
+    simulations_by_task = [
+        min(SIMULATIONS_PER_TASK, number_of_simulations - i)
+        for i in range(0, number_of_simulations, SIMULATIONS_PER_TASK)
+    ]
+    random_generator = random.Random(seed)
+    seeds = [random_generator.getrandbits(64) for task in simulations_by_task]
+    arguments = (
+        repeat(participants),
+        repeat(tie_breaks),
+        repeat(number_of_played_rounds + 1),
+        repeat(number_of_rounds),
+        repeat(top_n),
+        simulations_by_task,
+        repeat(pairing_engine),
+        seeds,
+    )
+
+    if number_of_processes is None:
+        number_of_processes = os.cpu_count() or 1
+    if len(simulations_by_task) > 1 and number_of_processes > 1:
+        with ProcessPoolExecutor(number_of_processes) as executor:
+            counts_by_task = list(executor.map(count_top_n_finishes, *arguments))
+    else:
+        counts_by_task = list(map(count_top_n_finishes, *arguments))
+
+    return {
+        player.player_id: sum(counts[player.player_id] for counts in counts_by_task)
+        / number_of_simulations
+        for player in participants
+        if player.player_id
+    }
@@ -0,0 +1,487 @@
+""" Define the maximum weight matching of a general graph, with Edmonds' blossom
+algorithm and the primal-dual method of Galil (O(n^3)), based on the public domain
+implementation of Joris van Rantwijk """
+
+
+def max_weight_matching(edges: list, max_cardinality=False, perfect=False):
+    """Compute a maximum weight matching of a general undirected graph.
+    The weights should be integers, the dual variables then stay integers
+    and no rounding error can break the optimality.
+
+    Args:
+    edges - list of (vertex i, vertex j, weight) tuples, the vertices are numbered
+    from 0 and each pair of vertices should appear at most once
+    max_cardinality - only accept matchings with the maximum number of edges,
+    the one with the maximum weight among them is returned
+    perfect - only look for a perfect matching: the vertex duals then start from
+    the best edge of each vertex and the edges already tight are matched before the
+    first stage, which saves most of the stages. The matching returned is optimal
+    only if it is perfect.
+
+    Return:
+    list - mate of each vertex, -1 if the vertex is not matched"""
+    if not edges:
+        return []
+
+    number_of_edges = len(edges)
+    number_of_vertices = 0
+    for i, j, weight in edges:
+        number_of_vertices = max(number_of_vertices, i + 1, j + 1)
+    n = number_of_vertices
+    max_weight = max(0, max(weight for i, j, weight in edges))
+
+    """ Endpoint p of edge k is endpoint[p], with k = p // 2,
+    the other endpoint of the edge is endpoint[p ^ 1] """
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * number_of_edges)]
+    """ Remote endpoints of the edges of each vertex """
+    neighbour_endpoints = [[] for i in range(n)]
+    for k, (i, j, weight) in enumerate(edges):
+        neighbour_endpoints[i].append(2 * k + 1)
+        neighbour_endpoints[j].append(2 * k)
+
+    """ Remote endpoint of the matched edge of each vertex, -1 if single """
+    mate = n * [-1]
+    """ Label of each top level blossom: 0 free, 1 S (outer), 2 T (inner) """
+    label = (2 * n) * [0]
+    """ Endpoint through which each labelled blossom got its label """
+    label_end = (2 * n) * [-1]
+    """ Top level blossom containing each vertex """
+    in_blossom = list(range(n))
+    """ Blossoms numbered n to 2n - 1 are the non trivial blossoms """
+    blossom_parent = (2 * n) * [-1]
+    blossom_children = (2 * n) * [None]
+    blossom_base = list(range(n)) + n * [-1]
+    """ Endpoints linking the children of each blossom """
+    blossom_endpoints = (2 * n) * [None]
+    """ Least slack edge to an S blossom, for each free vertex and S blossom """
+    best_edge = (2 * n) * [-1]
+    """ Least slack edges to the other S blossoms, for each S blossom """
+    blossom_best_edges = (2 * n) * [None]
+    unused_blossoms = list(range(n, 2 * n))
+    used_blossoms = set()
+    """ Dual variables, twice the vertex duals so all the values stay integers """
+    dual = n * [max_weight] + n * [0]
+    """ Edges with zero slack, they may be used in the alternating trees """
+    allowed_edge = number_of_edges * [False]
+    queue = []
+    """ Vertices and blossoms whose best edge was set during the stage,
+    the dual updates only look at them instead of all the vertices and blossoms """
+    vertices_with_best_edge = []
+    blossoms_with_best_edge = []
+
+    if perfect:
+        """ The duals of the single vertices do not need to be equal
+        when every vertex ends up matched """
+        max_cardinality = True
+        best_weight = n * [None]
+        for i, j, weight in edges:
+            for v in (i, j):
+                if best_weight[v] is None or weight > best_weight[v]:
+                    best_weight[v] = weight
+        dual[:n] = [max_weight if w is None else w for w in best_weight]
+        for k, (i, j, weight) in enumerate(edges):
+            if mate[i] == -1 and mate[j] == -1 and dual[i] + dual[j] == 2 * weight:
+                mate[i] = 2 * k + 1
+                mate[j] = 2 * k
+        """ Lower the dual of each single vertex until one of its edges is tight,
+        and match it if the other endpoint is single too """
+        for v in range(n):
+            if mate[v] != -1 or not neighbour_endpoints[v]:
+                continue
+            dual[v] = max(
+                2 * edges[p // 2][2] - dual[endpoint[p]] for p in neighbour_endpoints[v]
+            )
+            for p in neighbour_endpoints[v]:
+                w = endpoint[p]
+                if mate[w] == -1 and dual[v] + dual[w] == 2 * edges[p // 2][2]:
+                    mate[v] = p
+                    mate[w] = p ^ 1
+                    break
+
+    def slack(k):
+        """Get twice the slack of edge k"""
+        i, j, weight = edges[k]
+        return dual[i] + dual[j] - 2 * weight
+
+    def blossom_leaves(b):
+        """Get the vertices of blossom b, without recursion as the blossoms
+        may be nested deeply"""
+        if b < n:
+            return [b]
+        leaves = []
+        blossoms = [b]
+        while blossoms:
+            for child in blossom_children[blossoms.pop()]:
+                if child < n:
+                    leaves.append(child)
+                else:
+                    blossoms.append(child)
+        return leaves
+
+    def assign_label(w, t, p):
+        """Label vertex w and its top level blossom with t through endpoint p,
+        a T blossom labels the blossom of its mate as S"""
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        best_edge[w] = best_edge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """Trace back from S vertices v and w to find a new blossom
+
+        Return:
+        int - base of the new blossom, -1 if an augmenting path was found"""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & 4:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if label_end[b] == -1:
+                """ Root of the tree """
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        """Create a new blossom with the given base, from edge k
+        linking two S vertices of the same tree"""
+        v, w, weight = edges[k]
+        bb = in_blossom[base]
+        bv = in_blossom[v]
+        bw = in_blossom[w]
+        b = unused_blossoms.pop()
+        used_blossoms.add(b)
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[bb] = b
+        blossom_children[b] = path = []
+        blossom_endpoints[b] = endpoints = []
+        """ Trace back from v to the base """
+        while bv != bb:
+            blossom_parent[bv] = b
+            path.append(bv)
+            endpoints.append(label_end[bv])
+            v = endpoint[label_end[bv]]
+            bv = in_blossom[v]
+        path.append(bb)
+        path.reverse()
+        endpoints.reverse()
+        endpoints.append(2 * k)
+        """ Trace back from w to the base """
+        while bw != bb:
+            blossom_parent[bw] = b
+            path.append(bw)
+            endpoints.append(label_end[bw] ^ 1)
+            w = endpoint[label_end[bw]]
+            bw = in_blossom[w]
+        label[b] = 1
+        label_end[b] = label_end[bb]
+        dual[b] = 0
+        for v in blossom_leaves(b):
+            if label[in_blossom[v]] == 2:
+                """ The former T vertices become S vertices """
+                queue.append(v)
+            in_blossom[v] = b
+        """ Compute the least slack edges to the other S blossoms """
+        best_edge_to = {}
+        for bv in path:
+            if blossom_best_edges[bv] is None:
+                edge_lists = [
+                    [p // 2 for p in neighbour_endpoints[v]] for v in blossom_leaves(bv)
+                ]
+            else:
+                edge_lists = [blossom_best_edges[bv]]
+            for edge_list in edge_lists:
+                for k in edge_list:
+                    i, j, weight = edges[k]
+                    if in_blossom[j] == b:
+                        i, j = j, i
+                    bj = in_blossom[j]
+                    if (
+                        bj != b
+                        and label[bj] == 1
+                        and (
+                            bj not in best_edge_to or slack(k) < slack(best_edge_to[bj])
+                        )
+                    ):
+                        best_edge_to[bj] = k
+            blossom_best_edges[bv] = None
+            best_edge[bv] = -1
+        blossom_best_edges[b] = list(best_edge_to.values())
+        best_edge[b] = -1
+        for k in blossom_best_edges[b]:
+            if best_edge[b] == -1 or slack(k) < slack(best_edge[b]):
+                best_edge[b] = k
+        blossoms_with_best_edge.append(b)
+
+    def expand_blossom(b, end_stage):
+        """Expand blossom b into its children,
+        relabelling them if b was a T blossom in the middle of a stage"""
+        for child in blossom_children[b]:
+            blossom_parent[child] = -1
+            if child < n:
+                in_blossom[child] = child
+            elif end_stage and dual[child] == 0:
+                expand_blossom(child, end_stage)
+            else:
+                for v in blossom_leaves(child):
+                    in_blossom[v] = child
+        if not end_stage and label[b] == 2:
+            """ Relabel the children on the even path from the entry child to the base """
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                j_step = 1
+                endpoint_trick = 0
+            else:
+                j_step = -1
+                endpoint_trick = 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[
+                    endpoint[
+                        blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick ^ 1
+                    ]
+                ] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowed_edge[blossom_endpoints[b][j - endpoint_trick] // 2] = True
+                j += j_step
+                p = blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick
+                allowed_edge[p // 2] = True
+                j += j_step
+            bv = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            label_end[endpoint[p ^ 1]] = label_end[bv] = p
+            best_edge[bv] = -1
+            j += j_step
+            """ The other children reached by the tree are labelled T again """
+            while blossom_children[b][j] != entry_child:
+                bv = blossom_children[b][j]
+                if label[bv] == 1:
+                    j += j_step
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossom_base[bv]]]] = 0
+                    assign_label(v, 2, label_end[v])
+                j += j_step
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_endpoints[b] = None
+        blossom_base[b] = -1
+        blossom_best_edges[b] = None
+        best_edge[b] = -1
+        unused_blossoms.append(b)
+        used_blossoms.discard(b)
+
+    def augment_blossom(b, v):
+        """Swap the matched and unmatched edges of blossom b on the path
+        from vertex v to the base, v becomes the new base"""
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= n:
+            augment_blossom(t, v)
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            j_step = 1
+            endpoint_trick = 0
+        else:
+            j_step = -1
+            endpoint_trick = 1
+        while j != 0:
+            j += j_step
+            t = blossom_children[b][j]
+            p = blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick
+            if t >= n:
+                augment_blossom(t, endpoint[p])
+            j += j_step
+            t = blossom_children[b][j]
+            if t >= n:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = blossom_children[b][i:] + blossom_children[b][:i]
+        blossom_endpoints[b] = blossom_endpoints[b][i:] + blossom_endpoints[b][:i]
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+
+    def augment_matching(k):
+        """Swap the matched and unmatched edges of the augmenting path
+        going through edge k"""
+        v, w, weight = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = in_blossom[s]
+                if bs >= n:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if label_end[bs] == -1:
+                    """ Root of the tree """
+                    break
+                t = endpoint[label_end[bs]]
+                bt = in_blossom[t]
+                s = endpoint[label_end[bt]]
+                j = endpoint[label_end[bt] ^ 1]
+                if bt >= n:
+                    augment_blossom(bt, j)
+                mate[j] = label_end[bt]
+                p = label_end[bt] ^ 1
+
+    """ Each stage looks for an augmenting path and adds one edge to the matching """
+    for stage in range(n):
+        label[:] = (2 * n) * [0]
+        best_edge[:] = (2 * n) * [-1]
+        blossom_best_edges[n:] = n * [None]
+        allowed_edge[:] = number_of_edges * [False]
+        queue[:] = []
+        vertices_with_best_edge[:] = []
+        blossoms_with_best_edge[:] = []
+
+        """ The single vertices are the roots of the alternating trees """
+        for v in range(n):
+            if mate[v] == -1 and label[in_blossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            """ Grow the trees from the S vertices through the tight edges """
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbour_endpoints[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allowed_edge[k]:
+                        k_slack = slack(k)
+                        if k_slack <= 0:
+                            allowed_edge[k] = True
+                    if allowed_edge[k]:
+                        if label[in_blossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[in_blossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            """ w is inside a T blossom but not reached yet """
+                            label[w] = 2
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == 1:
+                        b = in_blossom[v]
+                        if best_edge[b] == -1 or k_slack < slack(best_edge[b]):
+                            best_edge[b] = k
+                            blossoms_with_best_edge.append(b)
+                    elif label[w] == 0:
+                        if best_edge[w] == -1 or k_slack < slack(best_edge[w]):
+                            best_edge[w] = k
+                            vertices_with_best_edge.append(w)
+            if augmented:
+                break
+
+            """ No tight edge left, update the dual variables by the smallest delta:
+            1 - a vertex dual reaches zero, the matching is optimal
+            2 - an edge from an S vertex to a free vertex becomes tight
+            3 - an edge between two S blossoms becomes tight
+            4 - the dual of a T blossom reaches zero, it is expanded """
+            delta_type = -1
+            delta = delta_edge = delta_blossom = None
+            if not max_cardinality:
+                delta_type = 1
+                delta = min(dual[:n])
+            for v in vertices_with_best_edge:
+                if label[in_blossom[v]] == 0 and best_edge[v] != -1:
+                    d = slack(best_edge[v])
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 2
+                        delta_edge = best_edge[v]
+            for b in blossoms_with_best_edge:
+                if blossom_parent[b] == -1 and label[b] == 1 and best_edge[b] != -1:
+                    d = slack(best_edge[b]) // 2
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 3
+                        delta_edge = best_edge[b]
+            for b in used_blossoms:
+                if (
+                    blossom_parent[b] == -1
+                    and label[b] == 2
+                    and (delta_type == -1 or dual[b] < delta)
+                ):
+                    delta = dual[b]
+                    delta_type = 4
+                    delta_blossom = b
+            if delta_type == -1:
+                """ Maximum cardinality reached, finish with the optimum delta """
+                delta_type = 1
+                delta = max(0, min(dual[:n]))
+
+            dual[:n] = [
+                d - delta if label[b] == 1 else d + delta if label[b] == 2 else d
+                for d, b in zip(dual, in_blossom)
+            ]
+            for b in used_blossoms:
+                if blossom_parent[b] == -1:
+                    if label[b] == 1:
+                        dual[b] += delta
+                    elif label[b] == 2:
+                        dual[b] -= delta
+
+            if delta_type == 1:
+                break
+            elif delta_type == 2:
+                allowed_edge[delta_edge] = True
+                i, j, weight = edges[delta_edge]
+                if label[in_blossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                allowed_edge[delta_edge] = True
+                i, j, weight = edges[delta_edge]
+                queue.append(i)
+            else:
+                expand_blossom(delta_blossom, False)
+
+        if not augmented:
+            break
+
+        """ Expand the S blossoms whose dual reached zero """
+        for b in list(used_blossoms):
+            if (
+                blossom_parent[b] == -1
+                and blossom_base[b] >= 0
+                and label[b] == 1
+                and dual[b] == 0
+            ):
+                expand_blossom(b, True)
+
+    for v in range(n):
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+    return mate
@@ -0,0 +1,245 @@
+""" Define the optimal swiss pairing, solved as a maximum weight matching """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import attrgetter
+
+from controllers.max_weight_matching import max_weight_matching
+
+
+""" Pairing engine of the rounds after the first one, "greedy" (each player
+in the standings takes the first opponent available), "blossom"
+(maximum weight matching of the whole round) or "score_groups"
+(maximum weight matching inside each score group) """
+PAIRING_ENGINE = os.environ.get("CTM_PAIRING_ENGINE", "greedy")
+
+""" Number of players below each player in the standings it can be paired with,
+doubled until every player gets an opponent """
+NUMBER_OF_NEIGHBOURS = 8
+
+""" Number of players from which the score groups are paired in a process pool,
+starting the worker processes costs more than it saves on smaller rounds """
+PROCESS_POOL_MIN_PLAYERS = 2000
+
+
+def pair_players_greedily(sorted_players: list):
+    """Pair each player, in the order of the standings, with the first player
+    of the standings not paired yet and not met yet. The players left without
+    an opponent are then paired with the first player not paired yet, even if
+    they have already met.
+    The players not paired yet are kept in a doubly linked list of their positions,
+    so a paired player is removed at once instead of being skipped by every
+    following search: only the players already met are skipped, their ids being
+    read once before the searches.
+
+    Arg:
+    sorted_players - list of Participants sorted by score and ranking,
+    with an even number of players
+
+    Return:
+    list - (player_01, player_02) tuples, player_01 being the player looking for
+    an opponent, in the order the pairs were made"""
+    number_of_players = len(sorted_players)
+    """ Position number_of_players is the start and the end of the circular list """
+    start = number_of_players
+    next_position = list(range(1, number_of_players + 1)) + [0]
+    previous_position = [number_of_players] + list(range(number_of_players))
+    is_paired = number_of_players * [False]
+    player_ids = [player.player_id for player in sorted_players]
+
+    def pair(i: int, j: int):
+        """Remove players i and j from the list and add their pair"""
+        for position in (i, j):
+            is_paired[position] = True
+            next_position[previous_position[position]] = next_position[position]
+            previous_position[next_position[position]] = previous_position[position]
+        pairs.append((sorted_players[i], sorted_players[j]))
+
+    pairs = []
+    for i, player_01 in enumerate(sorted_players):
+        if is_paired[i]:
+            continue
+        opponents = player_01.opponents
+        j = next_position[start]
+        while j != start and (j == i or player_ids[j] in opponents):
+            j = next_position[j]
+        if j != start:
+            pair(i, j)
+
+    """ In case the previous attempt failed to assign matches to players """
+    for i in range(number_of_players):
+        if is_paired[i]:
+            continue
+        j = next_position[start]
+        if j == i:
+            j = next_position[j]
+        if j != start:
+            pair(i, j)
+    return pairs
+
+
+def get_pairing_edges(sorted_players: list, number_of_neighbours: int):
+    """Build the weighted compatibility graph of the players.
+    Each player is linked to the next players in the standings it has not met yet,
+    the weight decreases with the score difference and then with the distance
+    in the standings (which orders the players of the same score by ranking).
+    The bye is a game against the nobody player, a player who already had a bye
+    is not linked to it again like any other rematch.
+    Once the number of neighbours covers all the players, the rematches are added
+    with a weight lower than any other edge, so they are used only if needed.
+
+    Args:
+    sorted_players - list of Participants sorted by score and ranking
+    number_of_neighbours - number of not met players linked below each player
+
+    Return:
+    list - (position i, position j, weight) edges of the graph"""
+    number_of_players = len(sorted_players)
+    allow_rematches = number_of_neighbours >= number_of_players - 1
+    scores = [player.total_score for player in sorted_players]
+    """ Scores are counted in half points so the weights stay integers """
+    max_score_difference = int((max(scores) - min(scores)) * 2)
+    max_penalty = (max_score_difference + 1) * number_of_players
+    rematch_penalty = max_penalty * (number_of_players // 2 + 1)
+
+    edges = []
+    for i, player in enumerate(sorted_players):
+        opponents = player.opponents
+        number_of_linked_players = 0
+        for j in range(i + 1, number_of_players):
+            if number_of_linked_players >= number_of_neighbours:
+                break
+            opponent = sorted_players[j]
+            is_rematch = opponent.player_id in opponents
+            if is_rematch and not allow_rematches:
+                continue
+            score_difference = int(abs(scores[i] - scores[j]) * 2)
+            weight = max_penalty - (score_difference * number_of_players + j - i)
+            if not is_rematch:
+                weight += rematch_penalty
+                number_of_linked_players += 1
+            edges.append((i, j, weight))
+    return edges
+
+
+def get_pairing_positions(sorted_players: list):
+    """Pair all the players of a round by maximizing the total weight of the pairs
+
+    Arg:
+    sorted_players - list of Participants sorted by score and ranking,
+    with an even number of players
+
+    Return:
+    list - (i, j) positions of the paired players in sorted_players, with i < j,
+    in the order of the standings"""
+    number_of_players = len(sorted_players)
+    number_of_neighbours = NUMBER_OF_NEIGHBOURS
+    while True:
+        edges = get_pairing_edges(sorted_players, number_of_neighbours)
+        mate = max_weight_matching(edges, perfect=True)
+        if len(mate) == number_of_players and -1 not in mate:
+            break
+        number_of_neighbours *= 2
+
+    return [(i, j) for i, j in enumerate(mate) if i < j]
+
+
+def pair_players_by_max_weight(sorted_players: list):
+    """Pair all the players of a round by maximizing the total weight of the pairs
+
+    Arg:
+    sorted_players - list of Participants sorted by score and ranking,
+    with an even number of players
+
+    Return:
+    list - (player_01, player_02) tuples, player_01 being the best placed,
+    in the order of the standings"""
+    return [
+        (sorted_players[i], sorted_players[j])
+        for i, j in get_pairing_positions(sorted_players)
+    ]
+
+
+def get_score_groups(sorted_players: list):
+    """Split the players into groups of the same score. The lowest placed player
+    of a group with an odd number of players floats down to the next group.
+
+    Arg:
+    sorted_players - list of Participants sorted by score and ranking,
+    with an even number of players
+
+    Return:
+    list - lists of players with an even number of players, in the order of the standings"""
+    groups = []
+    floater = []
+    for score, players in groupby(sorted_players, key=attrgetter("total_score")):
+        group = floater + list(players)
+        floater = [group.pop()] if len(group) % 2 else []
+        if group:
+            groups.append(group)
+    return groups
+
+
+def has_a_rematch(pairs: list):
+    """Check if some players of the pairs have already met
+
+    Arg:
+    pairs - list of (player_01, player_02) tuples
+
+    Return:
+    bool - at least one pair is a rematch"""
+    return any(
+        player_02.player_id in player_01.opponents for player_01, player_02 in pairs
+    )
+
+
+def pair_score_groups(groups: list):
+    """Pair the players of each score group, in a process pool for large rounds
+
+    Arg:
+    groups - lists of players with an even number of players
+
+    Return:
+    list - list of (player_01, player_02) tuples of each group"""
+    number_of_players = sum(len(group) for group in groups)
+    if (
+        len(groups) > 1
+        and number_of_players >= PROCESS_POOL_MIN_PLAYERS
+        and (os.cpu_count() or 1) > 1
+    ):
+        with ProcessPoolExecutor() as executor:
+            positions_by_group = list(executor.map(get_pairing_positions, groups))
+    else:
+        positions_by_group = [get_pairing_positions(group) for group in groups]
+    return [
+        [(group[i], group[j]) for i, j in positions]
+        for group, positions in zip(groups, positions_by_group)
+    ]
+
+
+def pair_players_by_score_groups(sorted_players: list):
+    """Pair the players inside their score groups. The groups are independent
+    once the floaters are moved, so they are solved concurrently. A group which
+    can not be paired without a rematch is merged with the next one
+    (or the previous one for the last group) and paired again.
+
+    Arg:
+    sorted_players - list of Participants sorted by score and ranking,
+    with an even number of players
+
+    Return:
+    list - (player_01, player_02) tuples, player_01 being the best placed,
+    in the order of the standings"""
+    groups = get_score_groups(sorted_players)
+    pairs_by_group = pair_score_groups(groups)
+    while len(groups) > 1:
+        index = next(
+            (i for i, pairs in enumerate(pairs_by_group) if has_a_rematch(pairs)), None
+        )
+        if index is None:
+            break
+        index = min(index, len(groups) - 2)
+        groups[index:index + 2] = [groups[index] + groups[index + 1]]
+        pairs_by_group[index:index + 2] = [pair_players_by_max_weight(groups[index])]
+
+    return [pair for pairs in pairs_by_group for pair in pairs]
@@ -23,16 +23,11 @@ class PlayerUpdater:
             player = PlayerView()
             player.display_player_updater_menu()
             """ Update ranking of the player in database """
-            updated_ids = self.db_handler.players_table.update(
-                {"ranking": int(player.new_ranking)},
-                doc_ids=[int(player.player_id_to_update)],
-            )
-            serialized_player_updated = self.db_handler.players_table.get(
-                doc_id=updated_ids[0]
-            )
-            updated_player = self.db_handler.get_deserialized_player(
-                serialized_player_updated
+            updated_player = self.db_handler.get_player_object_from_id(
+                int(player.player_id_to_update)
             )
+            updated_player.ranking = int(player.new_ranking)
+            self.db_handler.update_player_in_db(updated_player, ["ranking"])
             print("Le classement a été mise à jour.")
             print(
                 f"Le classement de {updated_player} maitenant est {updated_player.ranking}"
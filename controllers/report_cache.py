@@ -0,0 +1,61 @@
+""" Define the cache of the reports, invalidated by the writes to the database """
+
+
+class ReportCache:
+    """Reports already computed or rendered, each kept with the versions of the
+    entities it was made from. A write to the database increments the version of
+    the entities it changes, so only the reports reading them are made again.
+
+    The versions are kept for the players, for the list of the tournaments and
+    for each tournament with its rounds and matches:
+    "players", "tournaments" and ("tournament", tournament id)."""
+
+    def __init__(self):
+        """Init attributes:
+        versions - number of writes by entity key
+        reports - (versions of the dependencies, report) by report key"""
+        self.versions = {}
+        self.reports = {}
+
+    def get_version(self, key):
+        """Get the version of an entity
+        Arg:
+        key - entity key
+
+        Return:
+        int - number of writes to the entity"""
+        return self.versions.get(key, 0)
+
+    def invalidate(self, *keys):
+        """Increment the version of the entities changed by a write, making the
+        reports depending on them out of date
+        Arg:
+        keys - entity keys"""
+        for key in keys:
+            self.versions[key] = self.get_version(key) + 1
+
+    def invalidate_tournament(self, tournament_id: int):
+        """Make the reports on a tournament and on the list of the tournaments
+        out of date, after a write to the tournament, one of its rounds or
+        one of its matches
+        Arg:
+        tournament_id - unique id of the tournament"""
+        self.invalidate("tournaments", ("tournament", tournament_id))
+
+    def get_report(self, report_key, dependencies: tuple, make_report):
+        """Get a report from the cache, or make it if it is missing or if one
+        of the entities it depends on was written since
+        Args:
+        report_key - key of the report, with its arguments
+        dependencies - entity keys read by the report
+        make_report - function without argument computing or rendering the report
+
+        Return:
+        report"""
+        versions = tuple(self.get_version(key) for key in dependencies)
+        cached_report = self.reports.get(report_key)
+        if cached_report is not None and cached_report[0] == versions:
+            return cached_report[1]
+        report = make_report()
+        self.reports[report_key] = (versions, report)
+        return report
@@ -0,0 +1,329 @@
+""" Export the reports to CSV, JSON Lines or a static HTML page. The rows are
+generated one by one and written as they come, without building the whole
+report in memory. The players and tournaments they are made from are those
+loaded by DatabaseHandler, which keeps them in memory """
+import csv
+import json
+from html import escape
+
+from controllers.database_handler import DatabaseHandler
+from controllers.report_query import (
+    generate_standing_rows,
+    get_all_tournaments,
+    get_rounds_with_matches,
+)
+
+
+""" Formats of the exported files """
+EXPORT_FORMATS = ("csv", "jsonl", "html")
+
+""" Reports that can be exported """
+REPORTS = ("players", "tournaments", "matches", "standings")
+
+""" Orders of the players, as in the player reports """
+PLAYER_ORDERS = ("name", "rank")
+
+""" Columns of each report, in the order they are written """
+PLAYER_COLUMNS = (
+    "player_id",
+    "last_name",
+    "first_name",
+    "date_of_birth",
+    "sex",
+    "ranking",
+)
+TOURNAMENT_COLUMNS = (
+    "id",
+    "name",
+    "location",
+    "date",
+    "number_of_rounds",
+    "number_of_players",
+    "time_control",
+    "description",
+    "is_finished",
+)
+MATCH_COLUMNS = (
+    "tournament_id",
+    "round_number",
+    "match_id",
+    "player_01_id",
+    "player_01",
+    "player_02_id",
+    "player_02",
+    "winner",
+)
+STANDING_COLUMNS = (
+    "rank",
+    "player_id",
+    "player",
+    "score",
+    "buchholz",
+    "median_buchholz",
+    "sonneborn_berger",
+    "cumulative",
+)
+
+
+def order_players(order="name", tournament_id=None):
+    """Sort the players of the database or of a tournament like the player reports
+    Args:
+    order - "name" for the alphabetical order, "rank" for the ranking order
+    tournament_id - unique id of the tournament, all the players by default
+
+    Return:
+    list of Players"""
+    db_handler = DatabaseHandler()
+    if tournament_id is None:
+        players = db_handler.players
+    else:
+        players = db_handler.get_players_in_a_tournament(tournament_id)
+    if order == "rank":
+        return db_handler.order_player_by_rank(players)
+    return db_handler.order_player_alphabetically(players)
+
+
+def get_ordered_players(order="name", tournament_id=None):
+    """Get the players of the database or of a tournament, in the order of the
+    player reports. The ordered list is kept in the report cache until a player
+    or the tournament is written, it must not be modified.
+    Args:
+    order - "name" for the alphabetical order, "rank" for the ranking order
+    tournament_id - unique id of the tournament, all the players by default
+
+    Return:
+    list of Players"""
+    if tournament_id is None:
+        dependencies = ("players",)
+    else:
+        dependencies = ("players", ("tournament", tournament_id))
+    return DatabaseHandler().report_cache.get_report(
+        ("ordered_players", order, tournament_id),
+        dependencies,
+        lambda: order_players(order, tournament_id),
+    )
+
+
+def generate_player_rows(order="name", tournament_id=None):
+    """Generate the rows of the player report
+    Args:
+    order - "name" for the alphabetical order, "rank" for the ranking order
+    tournament_id - unique id of the tournament, all the players by default
+
+    Return:
+    generator of dicts - one row per player"""
+    for player in get_ordered_players(order, tournament_id):
+        yield {
+            "player_id": player.player_id,
+            "last_name": player.last_name,
+            "first_name": player.first_name,
+            "date_of_birth": player.date_of_birth,
+            "sex": player.sex,
+            "ranking": player.ranking,
+        }
+
+
+def generate_tournament_rows(tournament_id=None):
+    """Generate the rows of the history of the tournaments
+    Arg:
+    tournament_id - unique id of the tournament, all the tournaments by default
+
+    Return:
+    generator of dicts - one row per tournament, in the order of db"""
+    db_handler = DatabaseHandler()
+    if tournament_id is None:
+        tournaments = db_handler.tournaments
+    else:
+        tournaments = [db_handler.get_tournament_by_id(tournament_id)]
+    for tournament in tournaments:
+        yield {
+            "id": tournament.id,
+            "name": tournament.name,
+            "location": tournament.location,
+            "date": tournament.date,
+            "number_of_rounds": tournament.number_of_rounds,
+            "number_of_players": len(
+                [player for player in tournament.list_of_players if player.player_id]
+            ),
+            "time_control": tournament.time_control,
+            "description": tournament.description,
+            "is_finished": tournament.is_finished,
+        }
+
+
+def generate_match_rows(tournament_id=None):
+    """Generate the rows of the match report, round by round
+    Arg:
+    tournament_id - unique id of the tournament, the matches of all
+    the tournaments by default
+
+    Return:
+    generator of dicts - one row per match, the winner ids separated by a space"""
+    if tournament_id is None:
+        tournament_ids = (tournament.id for tournament in get_all_tournaments())
+    else:
+        tournament_ids = [tournament_id]
+    for tournament_id in tournament_ids:
+        for round, matches in get_rounds_with_matches(tournament_id):
+            for match in matches:
+                yield {
+                    "tournament_id": tournament_id,
+                    "round_number": match.round_number,
+                    "match_id": match.match_id,
+                    "player_01_id": match.player_01.player_id,
+                    "player_01": str(match.player_01),
+                    "player_02_id": match.player_02.player_id,
+                    "player_02": str(match.player_02),
+                    "winner": " ".join(str(winner) for winner in match.winner),
+                }
+
+
+def write_csv(rows, columns: tuple, file):
+    """Write rows to a CSV file, with a header line
+    Args:
+    rows - iterable of dicts
+    columns - keys of the rows, in the order of the columns
+    file - text file opened without newline translation
+
+    Return:
+    int - number of rows written"""
+    writer = csv.DictWriter(file, fieldnames=columns)
+    writer.writeheader()
+    number_of_rows = 0
+    for row in rows:
+        writer.writerow(row)
+        number_of_rows += 1
+    return number_of_rows
+
+
+def write_json_lines(rows, columns: tuple, file):
+    """Write rows to a JSON Lines file, one JSON object per line
+    Args:
+    rows - iterable of dicts
+    columns - keys of the rows, in the order they are written
+    file - text file
+
+    Return:
+    int - number of rows written"""
+    number_of_rows = 0
+    for row in rows:
+        file.write(
+            json.dumps({column: row[column] for column in columns}, ensure_ascii=False)
+        )
+        file.write("\n")
+        number_of_rows += 1
+    return number_of_rows
+
+
+def write_html(rows, columns: tuple, file, title=""):
+    """Write rows to a static HTML page holding one table
+    Args:
+    rows - iterable of dicts
+    columns - keys of the rows, in the order of the columns
+    file - text file
+    title - title of the page
+
+    Return:
+    int - number of rows written"""
+    file.write(
+        '<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n'
+        + f"<title>{escape(title)}</title>\n</head>\n<body>\n"
+        + f"<h1>{escape(title)}</h1>\n<table>\n<thead>\n<tr>"
+    )
+    file.write("".join(f"<th>{escape(column)}</th>" for column in columns))
+    file.write("</tr>\n</thead>\n<tbody>\n")
+    number_of_rows = 0
+    for row in rows:
+        file.write("<tr>")
+        file.write(
+            "".join(f"<td>{escape(str(row[column]))}</td>" for column in columns)
+        )
+        file.write("</tr>\n")
+        number_of_rows += 1
+    file.write("</tbody>\n</table>\n</body>\n</html>\n")
+    return number_of_rows
+
+
+def write_rows(rows, columns: tuple, file, export_format: str, title=""):
+    """Write rows in the given format
+    Args:
+    rows - iterable of dicts
+    columns - keys of the rows, in the order of the columns
+    file - text file opened without newline translation
+    export_format - "csv", "jsonl" or "html"
+    title - title of the HTML page
+
+    Return:
+    int - number of rows written"""
+    if export_format == "csv":
+        return write_csv(rows, columns, file)
+    elif export_format == "jsonl":
+        return write_json_lines(rows, columns, file)
+    elif export_format == "html":
+        return write_html(rows, columns, file, title)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+
+def write_report(
+    report: str,
+    file,
+    export_format: str,
+    order="name",
+    tournament_id=None,
+):
+    """Write a report to an open file
+    Args:
+    report - one of REPORTS
+    file - text file opened without newline translation
+    export_format - "csv", "jsonl" or "html"
+    order - order of the players, "name" or "rank"
+    tournament_id - unique id of the tournament of the report, all the tournaments
+    by default. Required for the standings
+
+    Return:
+    int - number of rows written"""
+    if report == "players":
+        rows = generate_player_rows(order, tournament_id)
+        columns = PLAYER_COLUMNS
+        title = "Liste des joueurs"
+    elif report == "tournaments":
+        rows = generate_tournament_rows(tournament_id)
+        columns = TOURNAMENT_COLUMNS
+        title = "Liste des tournois"
+    elif report == "matches":
+        rows = generate_match_rows(tournament_id)
+        columns = MATCH_COLUMNS
+        title = "Liste des matchs"
+    elif report == "standings":
+        rows = generate_standing_rows(tournament_id)
+        columns = STANDING_COLUMNS
+        title = "Classement"
+    else:
+        raise ValueError(f"Unknown report: {report}")
+    if tournament_id is not None and report != "tournaments":
+        title += f" du tournoi {tournament_id}"
+
+    return write_rows(rows, columns, file, export_format, title)
+
+
+def export_report(
+    report: str,
+    file_path: str,
+    export_format: str,
+    order="name",
+    tournament_id=None,
+):
+    """Export a report to a file
+    Args:
+    report - one of REPORTS
+    file_path - path of the exported file
+    export_format - "csv", "jsonl" or "html"
+    order - order of the players, "name" or "rank"
+    tournament_id - unique id of the tournament of the report, all the tournaments
+    by default. Required for the standings
+
+    Return:
+    int - number of rows written"""
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        return write_report(report, file, export_format, order, tournament_id)
@@ -0,0 +1,78 @@
+""" Define the queries of the reports. The rounds and the matches are read from
+the indexes of DatabaseHandler, each table of db being read at most once """
+from controllers.database_handler import DatabaseHandler
+from controllers.standings import Standings
+from controllers.tie_break import compute_tie_breaks
+
+
+def get_all_tournaments():
+    """Get all the tournaments with their players, rounds and matches loaded.
+    The players are read first, then the rounds and the matches are grouped by
+    tournament in one pass over their tables, instead of being searched
+    for each tournament.
+
+    Return:
+    list of Tournaments, in the order of db"""
+    db_handler = DatabaseHandler()
+    db_handler.load_table("players")
+    db_handler.load_table("rounds")
+    return db_handler.tournaments
+
+
+def get_rounds_with_matches(tournament_id: int):
+    """Get the rounds of a tournament with their matches
+    Arg:
+    tournament_id - unique id of the tournament
+
+    Return:
+    list - (Round, list of Matches) tuples, in the order the rounds were saved"""
+    db_handler = DatabaseHandler()
+    return [
+        (round, db_handler.get_matches_in_a_round(tournament_id, round.round_number))
+        for round in db_handler.get_rounds_in_a_tournament(tournament_id)
+    ]
+
+
+def get_winners(match):
+    """Get the winners of a match
+    Arg:
+    match - Match with the ids of its winners
+
+    Return:
+    list of Players"""
+    db_handler = DatabaseHandler()
+    return [db_handler.get_player_object_from_id(winner) for winner in match.winner]
+
+
+def generate_standing_rows(tournament_id: int):
+    """Generate the rows of the standings of a tournament after its finished
+    rounds, with the tie-breaks of the players. Shared by the console report
+    and the export.
+    Arg:
+    tournament_id - unique id of the tournament
+
+    Return:
+    generator of dicts - one row per player, in the order of the standings"""
+    db_handler = DatabaseHandler()
+    players = db_handler.get_players_in_a_tournament(tournament_id)
+    standings = Standings(
+        players,
+        compute_tie_breaks(
+            [player.player_id for player in players],
+            db_handler.get_matches_of_finished_rounds(tournament_id),
+        ),
+    )
+    for player in standings.get_players():
+        buchholz, median_buchholz, sonneborn_berger, cumulative = (
+            standings.tie_breaks.get_tie_breaks(player.player_id)
+        )
+        yield {
+            "rank": standings.rank_of(player.player_id),
+            "player_id": player.player_id,
+            "player": str(player),
+            "score": player.total_score,
+            "buchholz": buchholz,
+            "median_buchholz": median_buchholz,
+            "sonneborn_berger": sonneborn_berger,
+            "cumulative": cumulative,
+        }
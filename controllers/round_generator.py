@@ -1,14 +1,19 @@
 """ Define the round generator controller """
-from operator import attrgetter
-from math import ceil
-
-from models.player import Player
 from models.round import Round
-from models.match import Match
 
 from views.round import RoundView
 
 from controllers.database_handler import DatabaseHandler
+from controllers.pairing import PAIRING_ENGINE
+from controllers.swiss_system import (
+    add_points,
+    get_score_changes,
+    pair_round,
+    sort_players_by_ranking,
+    sort_players_by_score,
+)
+from controllers.standings import Standings
+from controllers.tie_break import compute_tie_breaks
 
 
 class RoundGenerator:
@@ -22,19 +27,28 @@ class RoundGenerator:
         load_from_first_match: bool,
         starting_round_number=1,
         starting_match_number=0,
+        pairing_engine=PAIRING_ENGINE,
     ):
         """Init the following attributes:
         db_handler - instance of DatabaseHandler
         tournament_id - unique id of the tournament
-        list_of_players - list of player objects
+        list_of_players - list of Participants
         number_of_rounds - number of rounds in the tournament
         load_from_first_match (bool) - load from match number 1
         starting_round_number - round number to load
         starting_match_number - match number to load
+        pairing_engine - "greedy", "blossom" or "score_groups" pairing
+        of the rounds after the first one
         round_view - RoundView object
         rounds - list of Round objects in the tournament
         number_of_matches_in_round - number of matches in a round
-        final_result - sorted list of players according to their scores in the tournament
+        players_by_id - players of the tournament by their id
+        saved_scores - (total score, set of opponents) by player id,
+        as saved in db
+        standings - Standings of the players with their tie-breaks, computed from
+        the finished rounds and updated with each result
+        final_result - sorted list of players according to their scores
+        and their tie-breaks in the tournament
 
         Init the methods:
         handle_odd_number_of_players - add a nobody player
@@ -50,9 +64,25 @@ class RoundGenerator:
         self.load_from_first_match = load_from_first_match
         self.starting_round_number = starting_round_number
         self.starting_match_number = starting_match_number
+        self.pairing_engine = pairing_engine
 
         self.handle_odd_number_of_players(self.list_of_players)
         self.number_of_matches_in_round = len(self.list_of_players) / 2
+        self.players_by_id = {
+            player.player_id: player for player in self.list_of_players
+        }
+        self.saved_scores = {
+            player.player_id: (player.total_score, set(player.opponents))
+            for player in self.list_of_players
+        }
+
+        self.standings = Standings(
+            self.list_of_players,
+            compute_tie_breaks(
+                self.players_by_id,
+                self.db_handler.get_matches_of_finished_rounds(self.tournament_id),
+            ),
+        )
 
         self.round_view = None
         self.rounds = []
@@ -73,15 +103,15 @@ class RoundGenerator:
             self.create_next_rounds_and_save(starting_round_number=2, starting_match=0)
         else:
             """Load from rounds greater than 1"""
-            for round in self.db_handler.rounds:
-                if int(round.tournament_id) == self.tournament_id:
-                    self.rounds.append(round)
+            self.rounds = list(
+                self.db_handler.get_rounds_in_a_tournament(self.tournament_id)
+            )
             self.create_next_rounds_and_save(
                 starting_round_number=self.starting_round_number,
                 starting_match=self.starting_match_number,
             )
 
-        self.final_result = self.sort_player_by_score(self.list_of_players)
+        self.final_result = self.standings.get_players()
         self.delete_no_player()
 
     def sort_player_by_ranking(self, players_list: list):
@@ -91,8 +121,7 @@ class RoundGenerator:
 
         Returns:
         list - sorted list of players"""
-        sorted_list = sorted(players_list, key=attrgetter("ranking"), reverse=False)
-        return sorted_list
+        return sort_players_by_ranking(players_list)
 
     def sort_player_by_score(self, players_list: list):
         """Sort players by their ranking and then sort the list by score
@@ -101,61 +130,29 @@ class RoundGenerator:
 
         Returns:
         list - sorted list of players"""
-        sorted_players_by_rank = self.sort_player_by_ranking(players_list)
-        sorted_list = sorted(
-            sorted_players_by_rank, key=lambda player: player.total_score, reverse=True
-        )
-        return sorted_list
+        return sort_players_by_score(players_list)
 
     def handle_odd_number_of_players(self, players: list):
         """Add a player object named nobody incase of odd number of players
-        in the tournament
+        in the tournament. A tournament loaded after a bye already has it.
 
         Args:
-        players (list) - List of player objects"""
-        no_player = Player(
-            player_id=0,
-            last_name="nobody",
-            first_name="nobody",
-            date_of_birth="",
-            sex="",
-            total_score=0,
-            ranking=1000000,
-            opponents_list=[],
-        )
-        if len(players) % 2 == 0:
-            pass
-        else:
-            players.append(no_player)
-            self.list_of_players.append(no_player)
+        players (list) - List of player objects, with the nobody player added"""
+        if len(players) % 2 != 0:
+            players.append(self.db_handler.create_no_player())
 
     def delete_no_player(self):
-        """Delete no player from players"""
-        if len(self.list_of_players) % 2 != 0:
-            del self.list_of_players[-1]
+        """Delete the nobody player from the players of the tournament"""
+        self.list_of_players[:] = [
+            player for player in self.list_of_players if player.player_id
+        ]
 
     def generate_first_round(self):
         """Generate first round according to swiss system
 
         Returns:
         list - list of matches in the first round"""
-        players = self.sort_player_by_ranking(self.list_of_players)
-        first_matches = []
-
-        half_the_total_players = int(len(self.list_of_players) / 2)
-        for i in range(0, half_the_total_players):
-            player_01 = players[i]
-            player_02 = players[i + half_the_total_players]
-            player_01.opponents_list.append(player_02.player_id)
-            player_02.opponents_list.append(player_01.player_id)
-            """ Create match object """
-            match_name = Match(
-                tournament_id=self.tournament_id,
-                round_number=1,
-                pair_of_players=(player_01, player_02),
-            )
-            first_matches.append(match_name)
-        return first_matches
+        return pair_round(self.list_of_players, 1, self.tournament_id)
 
     def get_player_object_from_id(self, player_id: int):
         """Get player object from player_id
@@ -165,108 +162,43 @@ class RoundGenerator:
 
         Return:
         player object"""
-        for player in self.list_of_players:
-            if player.player_id == player_id:
-                return player
+        return self.players_by_id.get(player_id)
 
-    def add_score(self, winners_id_list):
+    def add_score(self, winners_id_list, matches=()):
         """Add score according to the match results
          - winner gain 1 point
          - if match is a draw winners gain 0.5 points
+        and update the standings with the results of the matches
 
         Args:
-        winners_id_list - list of winners id strings from RoundView"""
+        winners_id_list - list of winners id strings from RoundView
+        matches - matches of the round with their winners"""
 
         for winner in winners_id_list:
-            if len(winner) > 1:
-                for w in winner:
-                    if w.isnumeric():
-                        player = self.get_player_object_from_id(int(w))
-                        player.total_score = player.total_score + 0.5
-            else:
-                player = self.get_player_object_from_id(int(winner[0]))
-                player.total_score = player.total_score + 1.0
-
-        for tournament in self.db_handler.tournaments:
-            if tournament.id == self.tournament_id:
-                self.update_players_score_in_tournament(tournament)
-
-    def generate_next_round(self):
-        """Generate next round according to swiss system
+            add_points(self.players_by_id, [int(w) for w in winner if w.isnumeric()])
+        if matches:
+            self.standings.add_round(matches)
 
-        Returns:
-        list - list of matches in the next round"""
+    def get_score_changes(self):
+        """Get the scores and the new opponents of the players changed since
+        the last saved round, saved with the round instead of rewriting
+        the scores of all the players in the tournament
 
-        players = self.sort_player_by_score(self.list_of_players)
-        has_a_match = {}
-        for player in players:
-            has_a_match[player] = False
-
-        matches = []
+        Return:
+        dict - total score and new opponents by player id string"""
+        return get_score_changes(self.list_of_players, self.saved_scores)
 
-        for i in range(0, int(len(players))):
-            player_01 = players[i]
-            match_generation = self.generate_match(
-                player_01, players, has_a_match, matches, False
-            )
-            matches = match_generation[0]
-            has_a_match = match_generation[1]
-
-        """ In case the previous attempt failed to assign matches to players """
-        number_of_matches_in_round = ceil(len(self.list_of_players) / 2)
-        if number_of_matches_in_round > len(matches):
-            for i in range(0, int(len(players))):
-                player_01 = players[i]
-                match_generation = self.generate_match(
-                    player_01, players, has_a_match, matches, True
-                )
-                matches = match_generation[0]
-                has_a_match = match_generation[1]
-        return matches
+    def generate_next_round(self, round_number: int):
+        """Generate next round according to swiss system
 
-    def generate_match(
-        self,
-        player_01: Player,
-        sorted_players: list,
-        has_a_match: dict,
-        matches: list,
-        force_pairing=False,
-    ):
-        """Generate matches for a round
-        Args:
-        player_01 - first player of the potential match
-        sorted_players - sorted list of players by ranking and score
-        has_a_match - dictionary with players as keys and boolean (has a match or not) as values
-        matches - list of matches of a round
-        force pairing - if remaining players without matches, force pairing
+        Arg:
+        round_number - number of the round to generate
 
         Returns:
-        matches - list of matches in the round
-        has_a_match - dictionary with players as keys and boolean (has a match or not) as values"""
-        if has_a_match[player_01] is False:
-            for opponent in sorted_players:
-                if (
-                    opponent is not player_01
-                    and has_a_match[opponent] is False
-                    and (
-                        opponent.player_id not in player_01.opponents_list
-                        or force_pairing
-                    )
-                ):
-                    player_02 = opponent
-                    has_a_match[player_01] = True
-                    has_a_match[player_02] = True
-                    player_01.opponents_list.append(player_02.player_id)
-                    player_02.opponents_list.append(player_01.player_id)
-                    match = Match(
-                        tournament_id=self.tournament_id,
-                        round_number=-1,
-                        pair_of_players=(player_01, player_02),
-                        winner=[],
-                    )
-                    matches.append(match)
-                    break
-        return matches, has_a_match
+        list - list of matches in the next round"""
+        return pair_round(
+            self.list_of_players, round_number, self.tournament_id, self.pairing_engine
+        )
 
     def create_first_round_and_save(self, starting_match: int):
         """Generate first round and save it to db
@@ -282,39 +214,31 @@ class RoundGenerator:
             matches=first_matches,
         )
 
-        """ Create RoundView object for the first round and
-        mark the first round as finished. """
+        """ Create RoundView object for the first round. Each result is saved
+        when it is entered, so an interrupted round resumes from the next match """
         self.round_view = RoundView(
             round_01, self.number_of_matches_in_round, starting_match
         )
-        round_01 = self.round_view.round
-        round_01.is_round_finished = True
-        """ Add score for winners """
-        self.add_score(self.round_view.winners_list)
-        """ Save the end date time """
-        round_01.end_date_time = str(self.round_view.round_end_date_time)
-        first_matches = self.round_view.matches
-        saved_first_matches = []
-        """ Reload matches to round """
-        for match in self.db_handler.matches:
-            if match.tournament_id == self.tournament_id and match.round_number == 1:
-                saved_first_matches.append(match)
-        """ Update matches with round's id """
-        for match in saved_first_matches:
-            match.round_id = round_01.id
-            self.db_handler.matches_table.update(
-                {"round_id": round_01.id}, doc_ids=[match.match_id]
+        """ Save the round, close it and save the scores in one write """
+        with self.db_handler.transaction():
+            self.round_view.save_round_to_db_with_matches()
+            round_01 = self.round_view.round
+            round_01.is_round_finished = True
+            """ Add score for winners """
+            self.add_score(self.round_view.winners_list, self.round_view.matches)
+            """ Save the end date time """
+            round_01.end_date_time = str(self.round_view.round_end_date_time)
+            round_01.score_changes = self.get_score_changes()
+            first_matches = self.round_view.matches
+            """ Update saved matches of the round with round's id """
+            for match in self.db_handler.get_matches_in_a_round(self.tournament_id, 1):
+                match.round_id = round_01.id
+                self.db_handler.update_match_in_db(match, ["round_id"])
+            """ Update round in db """
+            self.db_handler.update_round_in_db(
+                round_01, ["is_round_finished", "end_date_time", "score_changes"]
             )
-        """ Update round in db """
-        self.db_handler.rounds_table.update(
-            {"is_round_finished": True}, doc_ids=[round_01.id]
-        )
-        self.db_handler.rounds_table.update(
-            {"end_date_time": round_01.end_date_time}, doc_ids=[round_01.id]
-        )
-        self.rounds.append(round_01)
-        """ Load the saved rounds again in db_handler's list """
-        self.db_handler.load_deserialized_rounds()
+            self.rounds.append(round_01)
 
     def create_next_rounds_and_save(
         self, starting_round_number: int, starting_match: int
@@ -328,58 +252,41 @@ class RoundGenerator:
         for r in range(starting_round_number, int(self.number_of_rounds) + 1):
             round_name = "round" + str(r)
             """ Create round object """
-            current_matches = self.generate_next_round()
+            current_matches = self.generate_next_round(r)
             current_round = Round(
                 round_number=r,
                 round_name=round_name,
                 tournament_id=self.tournament_id,
                 matches=current_matches,
             )
-            """ Create RoundView object for the round """
+            """ Create RoundView object for the round. Each result is saved
+            when it is entered, so an interrupted round resumes from the next match """
             self.round_view = RoundView(
                 current_round, self.number_of_matches_in_round, starting_match
             )
             """ Reset the starting match value """
             starting_match = 0
-            current_round = self.round_view.round
-            """ Add score for winners """
-            self.add_score(self.round_view.winners_list)
-            """ Mark the round as finished and update end date time """
-            current_round.end_date_time = str(self.round_view.round_end_date_time)
-            current_round.is_round_finished = True
-            current_matches = self.round_view.matches
-            current_saved_matches = []
-            """ Reload matches to round """
-            for match in self.db_handler.matches:
-                if (
-                    match.tournament_id == self.tournament_id
-                    and match.round_number == r
+            """ Save the round, close it and save the scores in one write """
+            with self.db_handler.transaction():
+                self.round_view.save_round_to_db_with_matches()
+                current_round = self.round_view.round
+                """ Add score for winners """
+                self.add_score(self.round_view.winners_list, self.round_view.matches)
+                """ Mark the round as finished and update end date time """
+                current_round.end_date_time = str(self.round_view.round_end_date_time)
+                current_round.is_round_finished = True
+                current_round.score_changes = self.get_score_changes()
+                current_matches = self.round_view.matches
+                """ Update saved matches of the round with round's id """
+                for match in self.db_handler.get_matches_in_a_round(
+                    self.tournament_id, r
                 ):
-                    current_saved_matches.append(match)
-            """ Update matches with round's id """
-            for match in current_saved_matches:
-                match.round_id = current_round.id
-                self.db_handler.matches_table.update({"round_id": current_round.id})
-            self.rounds.append(current_round)
-            """ Update round in db """
-            self.db_handler.rounds_table.update(
-                {"is_round_finished": True}, doc_ids=[current_round.id]
-            )
-            self.db_handler.rounds_table.update(
-                {"end_date_time": current_round.end_date_time},
-                doc_ids=[current_round.id],
-            )
+                    match.round_id = current_round.id
+                    self.db_handler.update_match_in_db(match, ["round_id"])
+                self.rounds.append(current_round)
+                """ Update round in db """
+                self.db_handler.update_round_in_db(
+                    current_round,
+                    ["is_round_finished", "end_date_time", "score_changes"],
+                )
             self.rounds.append(current_round)
-            """ Load rounds again to the db_handler list"""
-            self.db_handler.load_deserialized_rounds()
-
-    def update_players_score_in_tournament(self, tournament):
-        """Update players list in the tournament with their score"""
-        tournament.list_of_players = self.list_of_players
-        players_serialized = []
-        for player in self.list_of_players:
-            serialized_player = player.get_serialized_player()
-            players_serialized.append(serialized_player)
-        self.db_handler.tournaments_table.update(
-            {"list_of_players": players_serialized}, doc_ids=[tournament.id]
-        )
@@ -0,0 +1,123 @@
+""" Define the standings of a tournament, kept in order as the results are applied """
+from bisect import bisect_left, insort
+
+from controllers.tie_break import TieBreaks
+
+
+class Standings:
+    """Players of a tournament ordered by score, tie-breaks and ranking.
+    A sorted list of the sort keys of the players is kept: a result only moves
+    the players whose score or tie-breaks changed, each one found by bisection,
+    instead of sorting all the players again."""
+
+    def __init__(self, players: list, tie_breaks=None):
+        """Init attributes:
+        tie_breaks - TieBreaks of the players
+        players_by_id - Participants by player id, without the nobody player
+        sort_keys - sort key of each player by player id
+        sorted_keys - sort keys of all the players, in the order of the standings
+
+        Args:
+        players - list of Participants of the tournament
+        tie_breaks - TieBreaks of the players, without result by default"""
+        self.players_by_id = {
+            player.player_id: player for player in players if player.player_id
+        }
+        self.tie_breaks = (
+            TieBreaks(self.players_by_id) if tie_breaks is None else tie_breaks
+        )
+        self.sort_keys = {
+            player_id: self.get_sort_key(player_id)
+            for player_id in self.players_by_id
+        }
+        self.sorted_keys = sorted(self.sort_keys.values())
+
+    def get_sort_key(self, player_id: int):
+        """Get the key ordering a player in the standings: highest score, then
+        highest Buchholz, median Buchholz, Sonneborn-Berger and cumulative score,
+        then best ranking. With the same score, the highest cumulative score is
+        the lowest weighted points. The player id makes each key unique.
+        Arg:
+        player_id - unique id of the player
+
+        Return:
+        tuple - sort key"""
+        tie_breaks = self.tie_breaks
+        return (
+            -tie_breaks.scores[player_id],
+            -tie_breaks.buchholz[player_id],
+            -tie_breaks.get_median_buchholz(player_id),
+            -tie_breaks.sonneborn_berger[player_id],
+            tie_breaks.weighted_points[player_id],
+            self.players_by_id[player_id].ranking,
+            player_id,
+        )
+
+    def move_player(self, player_id: int):
+        """Move a player to its place after a change of its score or tie-breaks
+        Arg:
+        player_id - unique id of the player"""
+        old_key = self.sort_keys[player_id]
+        new_key = self.get_sort_key(player_id)
+        if new_key != old_key:
+            del self.sorted_keys[bisect_left(self.sorted_keys, old_key)]
+            insort(self.sorted_keys, new_key)
+            self.sort_keys[player_id] = new_key
+
+    def add_result(self, player_ids: list, winner_ids: list, round_number: int):
+        """Apply the result of a match to the tie-breaks and move the players of
+        the match and their opponents, whose tie-breaks changed
+        Args:
+        player_ids - ids of the two players of the match
+        winner_ids - id of the winner, or ids of both players in case of a draw
+        round_number - number of the round of the match"""
+        self.tie_breaks.add_result(player_ids, winner_ids, round_number)
+        moved_player_ids = set()
+        for player_id in player_ids:
+            if player_id in self.players_by_id:
+                moved_player_ids.add(player_id)
+                moved_player_ids.update(
+                    opponent_id
+                    for opponent_id, points in self.tie_breaks.games[player_id]
+                )
+        for player_id in moved_player_ids:
+            self.move_player(player_id)
+
+    def add_round(self, matches: list):
+        """Apply the results of all the matches of a round
+        Arg:
+        matches - Matches of the round with their winners"""
+        for match in matches:
+            self.add_result(
+                [player.player_id for player in match.pair_of_players],
+                [int(winner_id) for winner_id in match.winner],
+                match.round_number,
+            )
+
+    def rank_of(self, player_id: int):
+        """Get the place of a player in the standings
+        Arg:
+        player_id - unique id of the player
+
+        Return:
+        int - place of the player, starting from 1"""
+        return bisect_left(self.sorted_keys, self.sort_keys[player_id]) + 1
+
+    def top(self, number_of_players: int):
+        """Get the first players of the standings
+        Arg:
+        number_of_players - number of players to get
+
+        Return:
+        list - Participants in the order of the standings"""
+        return [
+            self.players_by_id[key[-1]]
+            for key in self.sorted_keys[:number_of_players]
+        ]
+
+    def get_players(self):
+        """Get all the players of the standings
+
+        Return:
+        list - Participants in the order of the standings"""
+        return self.top(len(self.sorted_keys))
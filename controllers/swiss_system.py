@@ -0,0 +1,147 @@
+""" Define the swiss system rounds, usable without the console and the database """
+from operator import attrgetter
+
+from models.match import Match
+from models.round import Round
+
+from controllers.pairing import (
+    PAIRING_ENGINE,
+    pair_players_greedily,
+    pair_players_by_max_weight,
+    pair_players_by_score_groups,
+)
+
+
+""" Pairing function of each pairing engine """
+PAIRING_FUNCTIONS = {
+    "greedy": pair_players_greedily,
+    "blossom": pair_players_by_max_weight,
+    "score_groups": pair_players_by_score_groups,
+}
+
+
+def sort_players_by_ranking(players: list):
+    """Sort players by their ranking
+    Arg:
+    players - list of Participants
+
+    Return:
+    list - sorted list of players"""
+    return sorted(players, key=attrgetter("ranking"))
+
+
+def sort_players_by_score(players: list):
+    """Sort players by score, then by ranking. The tie-breaks are left out: they
+    order the standings, not the pairings. The players are sorted by ranking, then
+    by score keeping the ranking order within each score, both sorts comparing
+    attributes instead of tuples built for each player. A list already in ranking
+    order is checked in one pass by the first sort.
+    Arg:
+    players - list of Participants
+
+    Return:
+    list - sorted list of players"""
+    return sorted(
+        sort_players_by_ranking(players), key=attrgetter("total_score"), reverse=True
+    )
+
+
+def pair_players(standings: list, round_number: int, pairing_engine=PAIRING_ENGINE):
+    """Get the pairs of a round. The first round pairs the first half of the
+    players by ranking with the second half, the next rounds use the pairing engine
+    on the players sorted by score.
+
+    Args:
+    standings - list of Participants, with the nobody player
+    if their number is odd
+    round_number - number of the round, starting from 1
+    pairing_engine - "greedy", "blossom" or "score_groups"
+
+    Return:
+    list - (player_01, player_02) tuples"""
+    if round_number == 1:
+        players = sort_players_by_ranking(standings)
+        half_the_total_players = len(players) // 2
+        return [
+            (players[i], players[i + half_the_total_players])
+            for i in range(half_the_total_players)
+        ]
+    return PAIRING_FUNCTIONS[pairing_engine](sort_players_by_score(standings))
+
+
+def pair_round(
+    standings: list, round_number: int, tournament_id=0, pairing_engine=PAIRING_ENGINE
+):
+    """Pair the players of a round with pair_players. The opponent history is
+    the opponents of each Participant, the new opponents are added to it.
+
+    Args:
+    standings - list of Participants, with the nobody player
+    if their number is odd
+    round_number - number of the round, starting from 1
+    tournament_id - unique id of the tournament
+    pairing_engine - "greedy", "blossom" or "score_groups"
+
+    Return:
+    list - Match objects of the round, without winner"""
+    matches = []
+    for player_01, player_02 in pair_players(standings, round_number, pairing_engine):
+        player_01.opponents.add(player_02.player_id)
+        player_02.opponents.add(player_01.player_id)
+        matches.append(
+            Match(
+                tournament_id=tournament_id,
+                round_number=round_number,
+                pair_of_players=(player_01, player_02),
+            )
+        )
+    return matches
+
+
+def add_points(players_by_id: dict, winner_ids: list):
+    """Add the points of a match: 1 point for the winner, 0.5 point for each player
+    in case of a draw
+    Args:
+    players_by_id - Participants by player id
+    winner_ids - id of the winner, or ids of both players in case of a draw"""
+    points = 0.5 if len(winner_ids) > 1 else 1.0
+    for winner_id in winner_ids:
+        players_by_id[winner_id].total_score += points
+
+
+def apply_results(round: Round, results: list):
+    """Record the results of the matches of a round and add the points
+    to the players
+    Args:
+    round - Round whose matches were paired by pair_round
+    results - winner ids of each match of round.matches, in the same order"""
+    for match, winner_ids in zip(round.matches, results):
+        match.winner = list(winner_ids)
+        match.round_number = round.round_number
+        add_points(
+            {player.player_id: player for player in match.pair_of_players},
+            match.winner,
+        )
+    round.is_round_finished = True
+
+
+def get_score_changes(players: list, saved_scores: dict):
+    """Get the players whose score or opponents changed since they were last saved,
+    and mark them as saved
+    Args:
+    players - list of Participants
+    saved_scores - (total score, set of opponents) by player id as last saved,
+    updated in place
+
+    Return:
+    dict - total score and new opponents by player id string"""
+    score_changes = {}
+    for player in players:
+        saved_score, saved_opponents = saved_scores.get(player.player_id, (0, set()))
+        if player.total_score != saved_score or player.opponents != saved_opponents:
+            score_changes[str(player.player_id)] = {
+                "total_score": player.total_score,
+                "new_opponents": sorted(player.opponents - saved_opponents),
+            }
+            saved_scores[player.player_id] = (player.total_score, set(player.opponents))
+    return score_changes
@@ -0,0 +1,192 @@
+""" Define the tie-breaks of the standings: Buchholz, median Buchholz,
+Sonneborn-Berger and cumulative score """
+
+
+class TieBreaks:
+    """Tie-break scores of the players of a tournament, updated with each result.
+    The bye (nobody player, id 0) gives its points to the player but does not count
+    as an opponent."""
+
+    def __init__(self, player_ids=()):
+        """Init attributes:
+        scores - score of each player by player id
+        games - (opponent id, points scored) of each game, by player id
+        buchholz - sum of the scores of the opponents, by player id
+        sonneborn_berger - sum of the scores of the opponents weighted
+        by the points scored against them, by player id
+        weighted_points - points scored multiplied by the number of their round,
+        by player id. The cumulative score after round k is (k + 1) * score minus
+        the weighted points, so it does not have to be updated for every player
+        at the end of each round
+        last_round_number - number of the last round with a result
+
+        Arg:
+        player_ids - ids of the players of the tournament"""
+        self.scores = {}
+        self.games = {}
+        self.buchholz = {}
+        self.sonneborn_berger = {}
+        self.weighted_points = {}
+        self.last_round_number = 0
+        for player_id in player_ids:
+            self.add_player(player_id)
+
+    def add_player(self, player_id: int):
+        """Add a player without any result
+        Arg:
+        player_id - unique id of the player"""
+        if player_id and player_id not in self.scores:
+            self.scores[player_id] = 0
+            self.games[player_id] = []
+            self.buchholz[player_id] = 0
+            self.sonneborn_berger[player_id] = 0
+            self.weighted_points[player_id] = 0
+
+    def add_points(self, player_id: int, points: float):
+        """Add points to a player and to the tie-breaks of its opponents
+        Args:
+        player_id - unique id of the player
+        points - points scored by the player"""
+        self.scores[player_id] += points
+        for opponent_id, points_scored in self.games[player_id]:
+            self.buchholz[opponent_id] += points
+            self.sonneborn_berger[opponent_id] += (1 - points_scored) * points
+
+    def add_result(self, player_ids: list, winner_ids: list, round_number: int):
+        """Apply the result of a match. The players become opponents with the score
+        they have before the match, then the points of the match are added.
+        Args:
+        player_ids - ids of the two players of the match
+        winner_ids - id of the winner, or ids of both players in case of a draw
+        round_number - number of the round of the match"""
+        points = 0.5 if len(winner_ids) > 1 else 1.0
+        self.last_round_number = max(self.last_round_number, round_number)
+        player_ids = [player_id for player_id in player_ids if player_id]
+        for player_id in player_ids:
+            self.add_player(player_id)
+
+        if len(player_ids) == 2:
+            for player_id, opponent_id in (player_ids, player_ids[::-1]):
+                points_scored = points if player_id in winner_ids else 0
+                self.games[player_id].append((opponent_id, points_scored))
+                self.buchholz[player_id] += self.scores[opponent_id]
+                self.sonneborn_berger[player_id] += (
+                    points_scored * self.scores[opponent_id]
+                )
+
+        for player_id in player_ids:
+            if player_id in winner_ids:
+                self.add_points(player_id, points)
+                self.weighted_points[player_id] += round_number * points
+
+    def add_round(self, matches: list):
+        """Apply the results of all the matches of a round
+        Arg:
+        matches - Matches of the round with their winners"""
+        for match in matches:
+            self.add_result(
+                [player.player_id for player in match.pair_of_players],
+                [int(winner_id) for winner_id in match.winner],
+                match.round_number,
+            )
+
+    def copy(self):
+        """Copy the tie-breaks, so results can be applied to the copy only
+
+        Return:
+        TieBreaks - copy of the tie-breaks"""
+        tie_breaks = TieBreaks()
+        tie_breaks.scores = dict(self.scores)
+        tie_breaks.games = {
+            player_id: list(games) for player_id, games in self.games.items()
+        }
+        tie_breaks.buchholz = dict(self.buchholz)
+        tie_breaks.sonneborn_berger = dict(self.sonneborn_berger)
+        tie_breaks.weighted_points = dict(self.weighted_points)
+        tie_breaks.last_round_number = self.last_round_number
+        return tie_breaks
+
+    def get_median_buchholz(self, player_id: int):
+        """Get the Buchholz without the best and the worst scores of the opponents,
+        or the Buchholz with less than 3 opponents
+        Arg:
+        player_id - unique id of the player
+
+        Return:
+        float - median Buchholz"""
+        if len(self.games[player_id]) < 3:
+            return self.buchholz[player_id]
+        opponent_scores = [
+            self.scores[opponent_id] for opponent_id, points in self.games[player_id]
+        ]
+        return self.buchholz[player_id] - max(opponent_scores) - min(opponent_scores)
+
+    def get_cumulative(self, player_id: int):
+        """Get the sum of the scores of a player after each round
+        Arg:
+        player_id - unique id of the player
+
+        Return:
+        float - cumulative score"""
+        score = self.scores[player_id]
+        return (self.last_round_number + 1) * score - self.weighted_points[player_id]
+
+    def get_tie_breaks(self, player_id: int):
+        """Get the tie-breaks of a player, in the order they are applied
+        Arg:
+        player_id - unique id of the player
+
+        Return:
+        tuple - Buchholz, median Buchholz, Sonneborn-Berger and cumulative score"""
+        if player_id not in self.scores:
+            return 0, 0, 0, 0
+        return (
+            self.buchholz[player_id],
+            self.get_median_buchholz(player_id),
+            self.sonneborn_berger[player_id],
+            self.get_cumulative(player_id),
+        )
+
+
+def compute_tie_breaks(player_ids: list, matches: list):
+    """Compute the tie-breaks of a tournament at once from its played matches,
+    for a tournament loaded from the database. Each total is summed once per
+    player from the final scores instead of being updated after each result.
+    Args:
+    player_ids - ids of the players of the tournament
+    matches - Matches of the finished rounds, with their winners
+
+    Return:
+    TieBreaks - tie-breaks of the players"""
+    tie_breaks = TieBreaks(player_ids)
+    for match in matches:
+        winner_ids = [int(winner_id) for winner_id in match.winner]
+        points = 0.5 if len(winner_ids) > 1 else 1.0
+        player_ids_of_match = [player.player_id for player in match.pair_of_players]
+        for player_id in player_ids_of_match:
+            tie_breaks.add_player(player_id)
+        tie_breaks.last_round_number = max(
+            tie_breaks.last_round_number, match.round_number
+        )
+        for player_id in winner_ids:
+            if player_id:
+                tie_breaks.scores[player_id] += points
+                tie_breaks.weighted_points[player_id] += match.round_number * points
+        if 0 not in player_ids_of_match:
+            player_01, player_02 = player_ids_of_match
+            tie_breaks.games[player_01].append(
+                (player_02, points if player_01 in winner_ids else 0)
+            )
+            tie_breaks.games[player_02].append(
+                (player_01, points if player_02 in winner_ids else 0)
+            )
+
+    scores = tie_breaks.scores
+    for player_id, games in tie_breaks.games.items():
+        tie_breaks.buchholz[player_id] = sum(
+            scores[opponent_id] for opponent_id, points in games
+        )
+        tie_breaks.sonneborn_berger[player_id] = sum(
+            points * scores[opponent_id] for opponent_id, points in games
+        )
+    return tie_breaks
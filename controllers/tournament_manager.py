@@ -54,9 +54,7 @@ class TournamentManager:
         Returns:
         Player object"""
 
-        for player in self.db_handler.players:
-            if player.player_id == int(id):
-                return player
+        return self.db_handler.get_player_object_from_id(int(id))
 
     def get_tournament(self, create_tournament_view: CreateTournamentView):
         """Create tournament from user inputs, save it to db
@@ -95,30 +93,21 @@ class TournamentManager:
             )
 
     def update_tournament_in_db(self, tournament: Tournament):
-        """Update tournament data in db for is_finished and list_of_rounds
+        """Update tournament data in db for is_finished, list_of_rounds and scores
 
         Args:
         tournament(Tournament) - instance of tournament
         """
-        tournament.is_finished = True
-        self.db_handler.tournaments_table.update(
-            {"is_finished": True}, doc_ids=[tournament.id]
-        )
-        tournament.final_result = self.round_generator.final_result
-        final_result_serialized = []
-        for player in self.tournament.final_result:
-            serialized_player = player.get_serialized_player()
-            final_result_serialized.append(serialized_player)
-
-        self.db_handler.tournaments_table.update(
-            {"final_result": final_result_serialized}, doc_ids=[tournament.id]
-        )
-        rounds_in_tournament = self.db_handler.rounds_table.search(
-            self.db_handler.QueryItem.tournament_id == tournament.id
-        )
-        self.db_handler.tournaments_table.update(
-            {"list_of_rounds": rounds_in_tournament}, doc_ids=[tournament.id]
-        )
+        with self.db_handler.transaction():
+            tournament.is_finished = True
+            tournament.final_result = self.round_generator.final_result
+            tournament.list_of_rounds = list(
+                self.db_handler.get_rounds_in_a_tournament(tournament.id)
+            )
+            """ The scores saved with each round are also folded into the tournament """
+            self.db_handler.update_tournament_in_db(
+                tournament, ["is_finished", "final_result", "list_of_rounds", "scores"]
+            )
         print("***********Fin du tournoi*************")
 
 
@@ -172,15 +161,15 @@ class OngoingTournamentManager:
 
     def get_generated_rounds(self):
         """Get generated rounds in the tournament from database and populate the generated_rounds list."""
-        for round in self.db_handler.rounds:
-            if int(round.tournament_id) == int(self.tournament.id):
-                self.generated_rounds.append(round)
+        self.generated_rounds.extend(
+            self.db_handler.get_rounds_in_a_tournament(self.tournament.id)
+        )
 
     def get_generated_matches(self):
         """Get generated matches in the tournament from database and populate the generated_matches list."""
-        for match in self.db_handler.matches:
-            if match.tournament_id == self.tournament.id:
-                self.generated_matches.append(match)
+        self.generated_matches.extend(
+            self.db_handler.get_matches_in_a_tournament(self.tournament.id)
+        )
 
     def get_starting_round(self):
         """Get the starting round number of the tournament to load
@@ -262,22 +251,15 @@ class OngoingTournamentManager:
             )
 
     def update_tournament(self):
-        """Update tournament data for is_finished and list_of_rounds"""
-        self.tournament.is_finished = True
-        self.db_handler.tournaments_table.update(
-            {"is_finished": True}, doc_ids=[self.tournament.id]
-        )
-        self.tournament.final_result = self.round_generator.final_result
-        final_result_serialized = []
-        for player in self.tournament.final_result:
-            serialized_player = player.get_serialized_player()
-            final_result_serialized.append(serialized_player)
-        self.db_handler.tournaments_table.update(
-            {"final_result": final_result_serialized}, doc_ids=[self.tournament.id]
-        )
-        rounds_in_tournament = self.db_handler.rounds_table.search(
-            self.db_handler.QueryItem.tournament_id == self.tournament.id
-        )
-        self.db_handler.tournaments_table.update(
-            {"list_of_rounds": rounds_in_tournament}, doc_ids=[self.tournament.id]
-        )
+        """Update tournament data for is_finished, list_of_rounds and scores"""
+        with self.db_handler.transaction():
+            self.tournament.is_finished = True
+            self.tournament.final_result = self.round_generator.final_result
+            self.tournament.list_of_rounds = list(
+                self.db_handler.get_rounds_in_a_tournament(self.tournament.id)
+            )
+            """ The scores saved with each round are also folded into the tournament """
+            self.db_handler.update_tournament_in_db(
+                self.tournament,
+                ["is_finished", "final_result", "list_of_rounds", "scores"],
+            )
@@ -1,9 +1,162 @@
-""" Entry point """
+""" Entry point. Without arguments the interactive menu is launched, with a command
+the report or the maintenance task is run in one process, for scripts and cron jobs:
 
+    python main.py report players --order rank --format csv
+    python main.py report tournament 12 --matches
+    python main.py maintenance info
 
-from views.main_menu import MainMenuView
+The modules of the application are imported by the command which needs them,
+so a command does not load the menus, the pairing and the forecast """
+import argparse
+import os
+import sys
 
 
-if __name__ == "__main__":
+def get_parser():
+    """Build the parser of the command line
+
+    Return:
+    argparse.ArgumentParser - parser with the report and maintenance commands"""
+    from controllers.report_export import EXPORT_FORMATS, PLAYER_ORDERS
+
+    parser = argparse.ArgumentParser(
+        description="CTM - Chess Tournament Manager. Without command, launch the menu."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    report_parser = commands.add_parser("report", help="write a report to stdout")
+    reports = report_parser.add_subparsers(dest="report", required=True)
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    output_parser.add_argument(
+        "--output", help="path of the file to write, stdout by default"
+    )
+
+    players_parser = reports.add_parser(
+        "players", parents=[output_parser], help="all the players"
+    )
+    players_parser.add_argument("--order", choices=PLAYER_ORDERS, default="name")
+    reports.add_parser(
+        "tournaments", parents=[output_parser], help="history of the tournaments"
+    )
+    reports.add_parser(
+        "matches", parents=[output_parser], help="matches of all the tournaments"
+    )
+
+    tournament_parser = reports.add_parser(
+        "tournament", parents=[output_parser], help="report of one tournament"
+    )
+    tournament_parser.add_argument("tournament_id", type=int)
+    tournament_parser.add_argument("--order", choices=PLAYER_ORDERS, default="name")
+    tournament_report = tournament_parser.add_mutually_exclusive_group()
+    tournament_report.add_argument(
+        "--players", action="store_const", dest="tournament_report", const="players"
+    )
+    tournament_report.add_argument(
+        "--matches", action="store_const", dest="tournament_report", const="matches"
+    )
+    tournament_report.add_argument(
+        "--standings",
+        action="store_const",
+        dest="tournament_report",
+        const="standings",
+    )
+
+    maintenance_parser = commands.add_parser(
+        "maintenance", help="maintenance of the database"
+    )
+    maintenance_parser.add_argument(
+        "task",
+        choices=("info", "compact"),
+        help="info: schema version and number of documents of each table ;"
+        + " compact: fold the journal into db.json (journal backend)",
+    )
+    return parser
+
+
+def run_report(arguments):
+    """Write the report asked on the command line
+    Arg:
+    arguments - parsed arguments of the report command
+
+    Return:
+    int - exit status"""
+    from controllers.database_handler import DatabaseHandler
+    from controllers.report_export import write_report
+
+    report = arguments.report
+    order = getattr(arguments, "order", "name")
+    tournament_id = None
+    if report == "tournament":
+        tournament_id = arguments.tournament_id
+        if DatabaseHandler().get_tournament_by_id(tournament_id) is None:
+            print(f"Tournoi {tournament_id} introuvable.", file=sys.stderr)
+            return 1
+        report = arguments.tournament_report or "tournaments"
+
+    if arguments.output is None:
+        try:
+            write_report(report, sys.stdout, arguments.format, order, tournament_id)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            """ The reader stopped reading, like head: the rest is discarded """
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    else:
+        with open(arguments.output, "w", encoding="utf-8", newline="") as file:
+            write_report(report, file, arguments.format, order, tournament_id)
+    return 0
+
+
+def run_maintenance(arguments):
+    """Run the maintenance task asked on the command line
+    Arg:
+    arguments - parsed arguments of the maintenance command
+
+    Return:
+    int - exit status"""
+    from controllers.database_handler import DatabaseHandler
+    from models.database import DATABASE_BACKEND
+
+    """ The schema is migrated when the handler is created """
+    db_handler = DatabaseHandler()
+    if arguments.task == "info":
+        print(f"Backend : {DATABASE_BACKEND}")
+        print(f"Version du schéma : {db_handler.get_schema_version()}")
+        for table_name, table in (
+            ("players", db_handler.players_table),
+            ("tournaments", db_handler.tournaments_table),
+            ("rounds", db_handler.rounds_table),
+            ("matches", db_handler.matches_table),
+        ):
+            print(f"{table_name} : {len(table)}")
+    elif arguments.task == "compact":
+        if DATABASE_BACKEND != "journal":
+            print("Seul le backend journal peut être compacté.", file=sys.stderr)
+            return 1
+        db_handler.database.db.storage.compact()
+        print("Journal compacté.")
+    return 0
+
+
+def main(argv=None):
+    """Run the command of the command line, or launch the menu without command
+    Arg:
+    argv - arguments of the command line, sys.argv by default
+
+    Return:
+    int - exit status"""
+    arguments = get_parser().parse_args(argv)
+    if arguments.command == "report":
+        return run_report(arguments)
+    if arguments.command == "maintenance":
+        return run_maintenance(arguments)
+
+    from views.main_menu import MainMenuView
+
     """Instanciate the main menu view"""
-    main_menu = MainMenuView()
+    MainMenuView()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,140 @@
 """ Define database """
+import json
+import os
+
 from tinydb import TinyDB
+from tinydb.storages import Storage
+
+from models.journal_storage import JournalJSONStorage, JournalTinyDB
+
+
+""" Storage backend, "tinydb" (db.json), "journal" (db.json and db.json.journal),
+"sharded" (one file for the players and one per tournament) or "sqlite" (db.sqlite3) """
+DATABASE_BACKEND = os.environ.get("CTM_DB_BACKEND", "tinydb")
+
+""" Doc id of the row of the meta table recording the end of the migration from db.json
+to the sqlite or sharded backend, the schema version being the row 1 """
+MIGRATION_META_ID = 2
+
+
+def get_database():
+    """Get the database of the configured backend
+
+    Return:
+    Database, ShardedDatabase or SQLiteDatabase instance"""
+    if DATABASE_BACKEND == "sqlite":
+        from models.sqlite_database import SQLiteDatabase
+
+        return SQLiteDatabase()
+    if DATABASE_BACKEND == "sharded":
+        from models.sharded_database import ShardedDatabase
+
+        return ShardedDatabase()
+    return Database()
+
+
+class TransactionalJSONStorage(Storage):
+    """TinyDB JSON storage able to buffer the writes of a transaction"""
+
+    def __init__(self, path: str, **kwargs):
+        """Init attributes:
+        path - path of the json file
+        kwargs - arguments passed to json.dumps
+        transaction_data - data of the ongoing transaction, None outside a transaction
+        is_transaction_dirty - the ongoing transaction has buffered writes"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self.path = path
+        self.kwargs = kwargs
+        self.transaction_data = None
+        self.is_transaction_dirty = False
+
+    def read(self):
+        """Read the data, from the transaction buffer during a transaction
+
+        Return:
+        dict - data of the database or None if the file is empty"""
+        if self.transaction_data is not None:
+            return self.transaction_data
+
+        with open(self.path, encoding="utf-8") as json_file:
+            content = json_file.read()
+        if not content:
+            return None
+        return json.loads(content)
+
+    def write(self, data):
+        """Write the data, to the transaction buffer during a transaction
+        Arg:
+        data - data of the database"""
+        if self.transaction_data is not None:
+            self.transaction_data = data
+            self.is_transaction_dirty = True
+        else:
+            self.write_to_file(data)
+
+    def write_to_file(self, data):
+        """Atomically replace the json file with the data
+        Arg:
+        data - data of the database"""
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json_file.write(json.dumps(data, **self.kwargs))
+            json_file.flush()
+            os.fsync(json_file.fileno())
+        os.replace(temporary_path, self.path)
+
+    def begin_transaction(self):
+        """Start buffering the writes"""
+        self.transaction_data = self.read() or {}
+        self.is_transaction_dirty = False
+
+    def commit_transaction(self):
+        """Flush the buffered writes in one write and stop buffering"""
+        data = self.transaction_data
+        is_dirty = self.is_transaction_dirty
+        self.transaction_data = None
+        self.is_transaction_dirty = False
+        if is_dirty:
+            self.write_to_file(data)
+
+    def rollback_transaction(self):
+        """Discard the buffered writes and stop buffering"""
+        self.transaction_data = None
+        self.is_transaction_dirty = False
 
 
 class Database:
     """Database class"""
 
-    def __init__(self):
+    """ All the tables are stored in the same file """
+    is_sharded = False
+
+    """ Reading one document reads the whole json file """
+    reads_whole_file = True
+
+    """ The documents of a tournament are found by reading the whole table """
+    indexes_tournament_id = False
+
+    def __init__(self, file_path="db.json"):
         """Init attributes:
         file_path - file path to create the json file
+        storage_class - tinydb storage, appending to a journal with the journal backend
+        tinydb_class - TinyDB class, journaling the touched documents
+        with the journal backend
         db - tinydb instance
 
         Init method:
         load_db - load tinydb instance from json file"""
 
-        self.file_path = "db.json"
+        self.file_path = file_path
+        if DATABASE_BACKEND == "journal":
+            self.storage_class = JournalJSONStorage
+            self.tinydb_class = JournalTinyDB
+        else:
+            self.storage_class = TransactionalJSONStorage
+            self.tinydb_class = TinyDB
         self.db = None
 
         self.load_db()
@@ -28,7 +149,28 @@ class Database:
         """Loads a TinyDB object from a JSON file."""
 
         try:
-            self.db = TinyDB(self.file_path)
+            self.db = self.tinydb_class(self.file_path, storage=self.storage_class)
         except FileNotFoundError:
             self.create_empty_db()
             self.load_db()
+
+    def table(self, name: str):
+        """Get a table of the database
+        Arg:
+        name - name of the table
+
+        Return:
+        tinydb table"""
+        return self.db.table(name)
+
+    def begin_transaction(self):
+        """Buffer the following writes in memory"""
+        self.db.storage.begin_transaction()
+
+    def commit_transaction(self):
+        """Write the buffered data to the file in one atomic write"""
+        self.db.storage.commit_transaction()
+
+    def rollback_transaction(self):
+        """Discard the buffered writes"""
+        self.db.storage.rollback_transaction()
@@ -0,0 +1,300 @@
+""" Define the journal storage, appending each change to a journal file
+instead of rewriting the whole json file """
+import json
+import os
+import threading
+from collections.abc import MutableMapping
+
+from tinydb import TinyDB
+from tinydb.storages import Storage
+from tinydb.table import Table
+
+
+""" Size of the journal, in bytes, above which it is folded into the snapshot """
+COMPACTION_THRESHOLD = int(os.environ.get("CTM_JOURNAL_COMPACTION_BYTES", 1_000_000))
+
+""" Serialize the journal appends, the reloads and the compactions of all the storage
+instances, DatabaseHandler.reload creates a new instance while a compaction may be
+running """
+JOURNAL_LOCK = threading.Lock()
+
+
+class TouchedDocuments(MutableMapping):
+    """Documents of a table by integer id, as tinydb passes them to its updaters,
+    remembering the ids of the documents handed out, set or deleted by the update.
+    The documents are those of the storage, updated in place."""
+
+    def __init__(self, raw_table: dict, document_id_class=int):
+        """Init attributes:
+        raw_table - documents of the table by id string, as stored
+        document_id_class - class of the ids used by tinydb
+        touched_ids - id strings of the documents the update may have changed"""
+        self.raw_table = raw_table
+        self.document_id_class = document_id_class
+        self.touched_ids = set()
+
+    def __getitem__(self, doc_id):
+        """Get a document, which may then be updated in place"""
+        document = self.raw_table[str(doc_id)]
+        self.touched_ids.add(str(doc_id))
+        return document
+
+    def __setitem__(self, doc_id, document):
+        """Set a document"""
+        self.raw_table[str(doc_id)] = document
+        self.touched_ids.add(str(doc_id))
+
+    def __delitem__(self, doc_id):
+        """Delete a document"""
+        del self.raw_table[str(doc_id)]
+        self.touched_ids.add(str(doc_id))
+
+    def __contains__(self, doc_id):
+        """Check if a document exists without touching it"""
+        return str(doc_id) in self.raw_table
+
+    def __iter__(self):
+        """Iterate over the ids of the documents"""
+        return (self.document_id_class(doc_id) for doc_id in self.raw_table)
+
+    def __len__(self):
+        """Number of documents in the table"""
+        return len(self.raw_table)
+
+
+class JournalTable(Table):
+    """TinyDB table updating the documents of the journal storage in place
+    and telling it which documents each write touched"""
+
+    def _update_table(self, updater):
+        """Perform a table update operation on the documents of the storage,
+        then write only the touched documents
+        Arg:
+        updater - function updating the documents by id, given by tinydb"""
+        documents = TouchedDocuments(
+            self._storage.read().setdefault(self.name, {}), self.document_id_class
+        )
+        updater(documents)
+        self._storage.write_documents(self.name, documents.touched_ids)
+        self.clear_cache()
+
+
+class JournalTinyDB(TinyDB):
+    """TinyDB instance whose tables journal the documents they touch"""
+
+    table_class = JournalTable
+
+
+class JournalJSONStorage(Storage):
+    """TinyDB storage keeping a json snapshot and a journal of the changes made since.
+    Each write appends one line holding the touched documents to the journal,
+    startup replays the journal on top of the snapshot. Use with JournalTinyDB."""
+
+    def __init__(self, path: str, **kwargs):
+        """Init attributes:
+        path - path of the json snapshot file
+        journal_path - path of the journal file
+        kwargs - arguments passed to json.dumps
+        data - current data of the database, updated in place by JournalTable
+        transaction_changes - changed documents of the ongoing transaction by table and id,
+        None outside a transaction
+        compaction_thread - thread folding the journal into the snapshot
+
+        Init method:
+        load - read the snapshot and replay the journal"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.kwargs = kwargs
+        self.data = {}
+        self.transaction_changes = None
+        self.compaction_thread = None
+
+        self.load()
+
+    def load(self):
+        """Read the snapshot and replay the journal lines on top of it.
+        A last line cut by a crash is removed, its changes were never committed."""
+        with JOURNAL_LOCK:
+            with open(self.path, encoding="utf-8") as json_file:
+                content = json_file.read()
+            self.data = json.loads(content) if content else {}
+
+            if not os.path.exists(self.journal_path):
+                return
+            valid_size = 0
+            with open(self.journal_path, "rb") as journal_file:
+                for line in journal_file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.apply_changes(self.data, entry["changes"])
+                    valid_size += len(line)
+            if valid_size < os.path.getsize(self.journal_path):
+                os.truncate(self.journal_path, valid_size)
+            journal_size = valid_size
+
+        if journal_size > COMPACTION_THRESHOLD:
+            self.start_compaction()
+
+    @staticmethod
+    def apply_changes(data: dict, changes: list):
+        """Apply journal changes to the data
+        Args:
+        data - data of the database, updated in place
+        changes - list of [table name, document id, document or None if deleted].
+        [None, None, data] replaces the whole data."""
+        for table_name, doc_id, document in changes:
+            if table_name is None:
+                data.clear()
+                data.update(document)
+                continue
+            table = data.setdefault(table_name, {})
+            if document is None:
+                table.pop(doc_id, None)
+            else:
+                table[doc_id] = document
+
+    def read(self):
+        """Read the data from memory, without copy: JournalTable updates
+        the documents in place and tells which ones through write_documents
+
+        Return:
+        dict - data of the database"""
+        return self.data
+
+    def write_documents(self, table_name: str, doc_ids):
+        """Append the touched documents of a table to the journal,
+        or keep them until the commit during a transaction
+        Args:
+        table_name - name of the table
+        doc_ids - id strings of the touched documents"""
+        table = self.data.get(table_name, {})
+        self.write_changes(
+            [[table_name, doc_id, table.get(doc_id)] for doc_id in doc_ids]
+        )
+
+    def write(self, data):
+        """Replace the whole data, as TinyDB.drop_tables and drop_table do.
+        The whole data is journaled.
+        Arg:
+        data - data of the database"""
+        self.data = data
+        self.write_changes([[None, None, data]])
+
+    def write_changes(self, changes: list):
+        """Append changes to the journal,
+        or keep them until the commit during a transaction
+        Arg:
+        changes - list of [table name, document id, document or None if deleted]"""
+        if self.transaction_changes is not None:
+            """ Keep only the last version of each document, which is the one
+            updated in place until the commit, in the order of their last write """
+            for table_name, doc_id, document in changes:
+                self.transaction_changes.pop((table_name, doc_id), None)
+                self.transaction_changes[(table_name, doc_id)] = document
+        elif changes:
+            self.append_to_journal(changes)
+
+    def append_to_journal(self, changes: list):
+        """Append the changes as one line, so they are replayed all or none
+        Arg:
+        changes - list of [table name, document id, document or None if deleted]"""
+        line = json.dumps({"changes": changes}, **self.kwargs) + "\n"
+        with JOURNAL_LOCK:
+            with open(self.journal_path, "a", encoding="utf-8") as journal_file:
+                journal_file.write(line)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            journal_size = os.path.getsize(self.journal_path)
+        if journal_size > COMPACTION_THRESHOLD:
+            self.start_compaction()
+
+    def get_snapshot(self):
+        """Copy the committed data with the size of the journal it contains.
+        Called outside a transaction, the copy is made once per compaction and the
+        documents are copied shallowly as the writes only replace their fields.
+
+        Return:
+        tuple - copy of the data, size of the journal in bytes"""
+        with JOURNAL_LOCK:
+            data = {
+                table_name: {
+                    doc_id: dict(document) for doc_id, document in table.items()
+                }
+                for table_name, table in self.data.items()
+            }
+            if not os.path.exists(self.journal_path):
+                return data, 0
+            return data, os.path.getsize(self.journal_path)
+
+    def start_compaction(self):
+        """Fold the journal into the snapshot in a background thread"""
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return
+        self.compaction_thread = threading.Thread(
+            target=self.write_snapshot, args=self.get_snapshot(), daemon=True
+        )
+        self.compaction_thread.start()
+
+    def compact(self):
+        """Fold the journal into the snapshot"""
+        self.close()
+        self.write_snapshot(*self.get_snapshot())
+
+    def write_snapshot(self, data: dict, journal_offset: int):
+        """Write the data as the new snapshot, then drop the journal lines
+        it contains. Replaying a journal line already in the snapshot sets the same
+        documents again, so a crash between the two steps loses nothing.
+        Args:
+        data - committed data of the database
+        journal_offset - size of the journal contained in the data"""
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json_file.write(json.dumps(data, **self.kwargs))
+            json_file.flush()
+            os.fsync(json_file.fileno())
+        os.replace(temporary_path, self.path)
+
+        with JOURNAL_LOCK:
+            if not os.path.exists(self.journal_path):
+                return
+            with open(self.journal_path, "rb") as journal_file:
+                journal_file.seek(journal_offset)
+                journal_tail = journal_file.read()
+            temporary_path = self.journal_path + ".tmp"
+            with open(temporary_path, "wb") as journal_file:
+                journal_file.write(journal_tail)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(temporary_path, self.journal_path)
+
+    def begin_transaction(self):
+        """Start keeping the changes in memory"""
+        self.transaction_changes = {}
+
+    def commit_transaction(self):
+        """Append the changes of the transaction as one journal line"""
+        changes = [
+            [table_name, doc_id, document]
+            for (table_name, doc_id), document in self.transaction_changes.items()
+        ]
+        self.transaction_changes = None
+        if changes:
+            self.append_to_journal(changes)
+
+    def rollback_transaction(self):
+        """Discard the changes of the transaction, made in place in the data,
+        by reading the committed data again"""
+        self.transaction_changes = None
+        self.load()
+
+    def close(self):
+        """Wait for the running compaction to finish"""
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
@@ -4,20 +4,30 @@
 class Match:
     """Match class"""
 
+    __slots__ = (
+        "tournament_id",
+        "round_id",
+        "round_number",
+        "pair_of_players",
+        "match_id",
+        "winner",
+        "game_duration",
+    )
+
     def __init__(
         self,
         tournament_id=0,
         round_id=0,
         round_number=0,
-        pair_of_players=[],
+        pair_of_players=(),
         match_id=0,
-        winner=[],
+        winner=None,
     ):
         """Init the following attributes:
         -tournament_id: unique id of the tournament
                         in which the match is happening
         -round_id: unique id of the round in which the round is happening
-        -pair_of_players: list of the 2 players
+        -pair_of_players: tuple of the 2 players
         -match_id: unique id of the match
         -player_01: first player in the list pair_of_players
         -player_02: second player in the list pair_of_players
@@ -27,19 +37,27 @@ class Match:
         self.round_id = round_id
         self.round_number = round_number
         self.pair_of_players = pair_of_players
-        self.player_01 = pair_of_players[0]
-        self.player_02 = pair_of_players[1]
         self.match_id = match_id
-        self.winner = winner
+        self.winner = [] if winner is None else winner
         self.game_duration = ""
 
+    @property
+    def player_01(self):
+        """First player in the pair_of_players"""
+        return self.pair_of_players[0]
+
+    @property
+    def player_02(self):
+        """Second player in the pair_of_players"""
+        return self.pair_of_players[1]
+
     def __str__(self):
         """Used in print"""
         string = f"{self.player_01} Vs {self.player_02}"
         return string
 
     def get_serialized_match(self):
-        """Serialize match
+        """Serialize match, referencing players by their id
 
         Return:
         dict - serialized match"""
@@ -47,9 +65,7 @@ class Match:
             "tournament_id": self.tournament_id,
             "round_id": self.round_id,
             "round_number": self.round_number,
-            "pair_of_players": [
-                player.get_serialized_player() for player in self.pair_of_players
-            ],
+            "pair_of_players": [player.player_id for player in self.pair_of_players],
             "match_id": self.match_id,
             "winner": self.winner,
         }
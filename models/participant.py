@@ -0,0 +1,85 @@
+"""Define the participant of a tournament"""
+from models.player import Player
+
+
+class Participant:
+    """Player taking part in a tournament. The participants of all the tournaments
+    of a player share the same Player, only the score, the opponents and the ranking
+    at the time of the tournament are their own.
+    """
+
+    __slots__ = ("player", "total_score", "opponents", "ranking")
+
+    def __init__(self, player, total_score=0, opponents=None, ranking=None):
+        """Init the following attributes:
+        -player: Player taking part in the tournament
+        -total_score: total score of the player in the tournament
+        -opponents: set of opponent player ids in the tournament,
+        checking a rematch does not depend on the number of rounds played
+        -ranking: ranking of the player when the tournament was created,
+        the current ranking of the player by default
+        """
+        self.player = player
+        self.total_score = total_score
+        self.opponents = set() if opponents is None else set(opponents)
+        self.ranking = player.ranking if ranking is None else ranking
+
+    def __str__(self):
+        """Used in print"""
+        return str(self.player)
+
+    @property
+    def player_id(self):
+        """Unique id of the player"""
+        return self.player.player_id
+
+    @property
+    def last_name(self):
+        """Last name of the player"""
+        return self.player.last_name
+
+    @property
+    def first_name(self):
+        """First name of the player"""
+        return self.player.first_name
+
+    @property
+    def date_of_birth(self):
+        """Date of birth of the player"""
+        return self.player.date_of_birth
+
+    @property
+    def sex(self):
+        """Sex of the player"""
+        return self.player.sex
+
+    def get_serialized_score(self):
+        """Serialize the score, the opponents and the ranking of the player
+        in the tournament, the opponents are stored once each, sorted by id
+
+        Return:
+        dict - serialized score"""
+        serialized_score = {
+            "total_score": self.total_score,
+            "opponents_list": sorted(self.opponents),
+            "ranking": self.ranking,
+        }
+
+        return serialized_score
+
+
+def create_no_player():
+    """Create the player named nobody, added to a tournament with an odd number
+    of players: the player paired with nobody gets the bye
+
+    Return:
+    participant(Participant) - nobody player, with id 0"""
+    no_player = Player(
+        player_id=0,
+        last_name="nobody",
+        first_name="nobody",
+        date_of_birth="",
+        sex="",
+        ranking=1000000,
+    )
+    return Participant(no_player)
@@ -5,14 +5,27 @@ from datetime import datetime
 class Round:
     """Round class"""
 
+    __slots__ = (
+        "id",
+        "round_number",
+        "round_name",
+        "tournament_id",
+        "is_round_finished",
+        "matches",
+        "start_date_time",
+        "end_date_time",
+        "score_changes",
+    )
+
     def __init__(
         self,
         id=0,
         round_number=0,
         round_name="",
         tournament_id=0,
-        matches=[],
+        matches=None,
         is_round_finished=False,
+        score_changes=None,
     ):
         """Init the following attirbutes:
         -id: unique id for the round
@@ -23,15 +36,18 @@ class Round:
         -is_round_finished: boolean to indicate end of the round
         -matches: list of matches assosciated with the round
         -start_date_time: date and time of the beginning of the round
-        -end_date_time: date and time of the ending"""
+        -end_date_time: date and time of the ending
+        -score_changes: total score and new opponents of the players whose
+                        score changed in the round, by player id"""
         self.id = id
         self.round_number = round_number
         self.round_name = round_name
         self.tournament_id = tournament_id
         self.is_round_finished = is_round_finished
-        self.matches = matches
+        self.matches = [] if matches is None else matches
         self.start_date_time = datetime.now()
         self.end_date_time = ""
+        self.score_changes = {} if score_changes is None else score_changes
 
     def __str__(self):
         """Used in print"""
@@ -39,7 +55,7 @@ class Round:
         return string
 
     def get_serialized_round(self):
-        """Serialize round
+        """Serialize round, referencing matches by their id
 
         Return:
         dict - serialized round"""
@@ -48,10 +64,11 @@ class Round:
             "round_number": self.round_number,
             "round_name": self.round_name,
             "tournament_id": self.tournament_id,
-            "matches": [match.get_serialized_match() for match in self.matches],
+            "matches": [match.match_id for match in self.matches],
             "is_round_finished": self.is_round_finished,
             "start_date_time": str(self.start_date_time),
             "end_date_time": str(self.end_date_time),
+            "score_changes": self.score_changes,
         }
 
         return serialized_round
@@ -0,0 +1,433 @@
+""" Define the sharded database, storing the players in one file
+and each tournament with its rounds and matches in its own file """
+import json
+import os
+import sys
+
+from tinydb.table import Document
+
+from models.database import MIGRATION_META_ID, Database
+
+
+""" Fields of a tournament written to its shard, the other fields are written
+to the tournaments catalog of the main file """
+SHARD_FIELDS = ("list_of_players", "scores", "list_of_rounds")
+
+""" Number of round and match ids reserved at once in the main file,
+so that saving a round or a match only writes to the shard of its tournament """
+ID_BLOCK_SIZE = 1000
+
+
+def split_tournament_document(document: dict):
+    """Split a tournament document between the catalog and the shard.
+    The catalog keeps the players of the tournament to list them without
+    opening the shard, the scores and the rounds are only in the shard.
+    Arg:
+    document - tournament dict
+
+    Return:
+    catalog_document, shard_document - dicts"""
+    catalog_document = dict(document, scores={}, list_of_rounds=[])
+    shard_document = {
+        field: document[field] for field in SHARD_FIELDS if field in document
+    }
+    return catalog_document, shard_document
+
+
+class ShardedTable:
+    """Rounds or matches table, each document being stored in the shard of its tournament"""
+
+    def __init__(self, database, name: str):
+        """Init attributes:
+        database - ShardedDatabase instance
+        name - name of the table"""
+        self.database = database
+        self.name = name
+
+    def get_shard_table(self, tournament_id: int):
+        """Get the table in the shard of a tournament
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        tinydb table"""
+        return self.database.open_shard(tournament_id).table(self.name)
+
+    def insert(self, document):
+        """Insert a document in the shard of its tournament
+        Arg:
+        document - document with a doc_id attribute
+
+        Return:
+        doc_id(int) - id of the inserted document"""
+        tournament_id = document["tournament_id"]
+        self.database.reserve_id(self.name, document.doc_id)
+        self.database.shard_ids_by_document[self.name][document.doc_id] = tournament_id
+        return self.get_shard_table(tournament_id).insert(document)
+
+    def get(self, doc_id: int):
+        """Get a document of an opened shard from its doc_id
+        Arg:
+        doc_id - id of the document
+
+        Return:
+        tinydb Document or None"""
+        tournament_id = self.database.shard_ids_by_document[self.name].get(doc_id)
+        if tournament_id is None:
+            return None
+        return self.get_shard_table(tournament_id).get(doc_id=doc_id)
+
+    def update(self, fields, doc_ids=None):
+        """Update the given fields of the documents, in the shards holding them
+        Args:
+        fields - dict of the fields to update, or function updating a document in place
+        doc_ids - ids of the documents to update, all documents of all shards if None
+
+        Return:
+        list - ids of the updated documents"""
+        if doc_ids is None:
+            self.database.open_all_shards()
+            doc_ids = list(self.database.shard_ids_by_document[self.name].keys())
+
+        doc_ids_by_shard = {}
+        for doc_id in doc_ids:
+            tournament_id = self.database.shard_ids_by_document[self.name].get(doc_id)
+            if tournament_id is not None:
+                doc_ids_by_shard.setdefault(tournament_id, []).append(doc_id)
+
+        updated_ids = []
+        for tournament_id, shard_doc_ids in doc_ids_by_shard.items():
+            updated_ids += self.get_shard_table(tournament_id).update(
+                fields, doc_ids=shard_doc_ids
+            )
+        return updated_ids
+
+    def get_documents_in_shard(self, tournament_id: int):
+        """Get the documents of one tournament
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of tinydb Documents"""
+        return list(self.get_shard_table(tournament_id))
+
+    def __iter__(self):
+        """Iterate over the documents of the opened shards only"""
+        for tournament_id in list(self.database.shards.keys()):
+            yield from self.get_shard_table(tournament_id)
+
+    def __len__(self):
+        """Number of documents in all the shards, opening them"""
+        self.database.open_all_shards()
+        return len(self.database.shard_ids_by_document[self.name])
+
+
+class ShardedTournamentsTable:
+    """Tournaments table: the catalog in the main file lists all the tournaments,
+    the fields changing during the rounds are written to the tournament's shard"""
+
+    def __init__(self, database):
+        """Init attributes:
+        database - ShardedDatabase instance
+        catalog - tournaments table of the main file"""
+        self.database = database
+        self.catalog = database.main_database.table("tournaments")
+
+    def get_shard_table(self, tournament_id: int):
+        """Get the tournaments table in the shard of a tournament
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        tinydb table"""
+        return self.database.open_shard(tournament_id).table("tournaments")
+
+    def write_document(self, document: dict, doc_id: int):
+        """Write a whole tournament document to the catalog and to its shard
+        Args:
+        document - tournament dict
+        doc_id - unique id of the tournament"""
+        catalog_document, shard_document = split_tournament_document(document)
+        for table, table_document in [
+            (self.catalog, catalog_document),
+            (self.get_shard_table(doc_id), shard_document),
+        ]:
+            if table.get(doc_id=doc_id) is None:
+                table.insert(Document(table_document, doc_id=doc_id))
+            else:
+                table.update(table_document, doc_ids=[doc_id])
+
+    def insert(self, document):
+        """Insert a tournament in the catalog and create its shard
+        Arg:
+        document - document with a doc_id attribute
+
+        Return:
+        doc_id(int) - id of the inserted document"""
+        self.write_document(document, document.doc_id)
+        return document.doc_id
+
+    def get(self, doc_id: int):
+        """Get a whole tournament document, opening its shard
+        Arg:
+        doc_id - id of the tournament
+
+        Return:
+        tinydb Document or None"""
+        catalog_document = self.catalog.get(doc_id=doc_id)
+        if catalog_document is None:
+            return None
+        document = dict(catalog_document)
+        shard_document = self.get_shard_table(doc_id).get(doc_id=doc_id)
+        if shard_document is not None:
+            document.update(shard_document)
+        return Document(document, doc_id=doc_id)
+
+    def update(self, fields, doc_ids=None):
+        """Update the given fields of the tournaments. The fields of SHARD_FIELDS
+        are only written to the shard, the others only to the catalog.
+        Args:
+        fields - dict of the fields to update, or function updating a document in place
+        doc_ids - ids of the tournaments to update, all tournaments if None
+
+        Return:
+        list - ids of the updated tournaments"""
+        if doc_ids is None:
+            doc_ids = [document.doc_id for document in self.catalog]
+
+        updated_ids = []
+        for doc_id in doc_ids:
+            if callable(fields):
+                document = self.get(doc_id)
+                if document is None:
+                    continue
+                fields(document)
+                self.write_document(document, doc_id)
+            else:
+                catalog_fields = {
+                    field: value
+                    for field, value in fields.items()
+                    if field not in SHARD_FIELDS
+                }
+                shard_fields = {
+                    field: value
+                    for field, value in fields.items()
+                    if field in SHARD_FIELDS
+                }
+                if catalog_fields:
+                    self.catalog.update(catalog_fields, doc_ids=[doc_id])
+                if shard_fields:
+                    self.get_shard_table(doc_id).update(shard_fields, doc_ids=[doc_id])
+            updated_ids.append(doc_id)
+        return updated_ids
+
+    def __iter__(self):
+        """Iterate over the catalog documents, without opening the shards"""
+        return iter(self.catalog)
+
+    def __len__(self):
+        """Number of tournaments in the catalog"""
+        return len(self.catalog)
+
+
+class ShardedDatabase:
+    """Database stored in a directory: players.json holds the players and the
+    tournaments catalog, tournament_<id>.json holds a tournament with its rounds
+    and matches. The shards are opened on first use."""
+
+    """ The tournaments are stored in their own file """
+    is_sharded = True
+
+    """ Reading one player reads the whole json file of the players """
+    reads_whole_file = True
+
+    """ The documents of a tournament are read from its shard """
+    indexes_tournament_id = False
+
+    def __init__(self):
+        """Init attributes:
+        directory_path - path of the directory holding the files
+        json_file_path - path of the TinyDB json file to migrate from
+        main_database - Database of players.json
+        shards - opened Databases by tournament id
+        shard_ids_by_document - tournament id of the documents of the opened shards,
+            by table name, then by doc_id
+        is_in_transaction - a transaction is in progress
+        reserved_ids - first id not reserved yet by table name, for rounds and matches
+
+        Init method:
+        migrate_from_json - copy db.json to the directory until the copy is complete"""
+        self.directory_path = os.environ.get("CTM_SHARDS_PATH", "db")
+        self.json_file_path = "db.json"
+        self.shards = {}
+        self.shard_ids_by_document = {"rounds": {}, "matches": {}}
+        self.is_in_transaction = False
+
+        os.makedirs(self.directory_path, exist_ok=True)
+        self.main_database = Database(os.path.join(self.directory_path, "players.json"))
+        self.reserved_ids = dict(
+            self.main_database.table("reserved_ids").get(doc_id=1) or {}
+        )
+
+        if os.path.exists(self.json_file_path) and not self.is_migrated():
+            self.migrate_from_json(self.json_file_path)
+
+    def is_migrated(self):
+        """Check that the documents of db.json were copied: the migration recorded
+        its end in the meta table of the main file, or the database was migrated
+        before it was recorded and holds players or tournaments
+
+        Return:
+        bool - db.json must not be copied again"""
+        if self.main_database.table("meta").get(doc_id=MIGRATION_META_ID) is not None:
+            return True
+        return any(
+            len(self.main_database.table(name)) > 0
+            for name in ["players", "tournaments"]
+        )
+
+    def table(self, name: str):
+        """Get a table of the database
+        Arg:
+        name - name of the table
+
+        Return:
+        tinydb table of the main file, or table routing to the shards"""
+        if name == "tournaments":
+            return ShardedTournamentsTable(self)
+        if name in self.shard_ids_by_document.keys():
+            return ShardedTable(self, name)
+        return self.main_database.table(name)
+
+    def get_shard_path(self, tournament_id: int):
+        """Get the path of the file of a tournament
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        str - path of the shard"""
+        return os.path.join(self.directory_path, f"tournament_{tournament_id}.json")
+
+    def open_shard(self, tournament_id: int):
+        """Open the file of a tournament, creating it if needed
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        Database of the tournament"""
+        shard = self.shards.get(tournament_id)
+        if shard is not None:
+            return shard
+
+        shard = Database(self.get_shard_path(tournament_id))
+        self.shards[tournament_id] = shard
+        for name, shard_ids in self.shard_ids_by_document.items():
+            for document in shard.table(name):
+                shard_ids[document.doc_id] = tournament_id
+        if self.is_in_transaction:
+            shard.begin_transaction()
+        return shard
+
+    def open_all_shards(self):
+        """Open the files of all the tournaments of the catalog"""
+        for document in self.main_database.table("tournaments"):
+            self.open_shard(document.doc_id)
+
+    def get_next_id(self, name: str):
+        """Get the first id not reserved yet for a rounds or matches table
+        Arg:
+        name - name of the table
+
+        Return:
+        int - next unique id"""
+        return self.reserved_ids.get(name, 1)
+
+    def reserve_id(self, name: str, doc_id: int):
+        """Reserve a block of ids in the main file when doc_id is not reserved yet
+        Args:
+        name - name of the table
+        doc_id - id of the document to insert"""
+        if doc_id < self.get_next_id(name):
+            return
+        reserved_ids_table = self.main_database.table("reserved_ids")
+        if reserved_ids_table.get(doc_id=1) is None:
+            reserved_ids_table.insert(Document({}, doc_id=1))
+        self.reserved_ids[name] = doc_id + ID_BLOCK_SIZE
+        reserved_ids_table.update({name: self.reserved_ids[name]}, doc_ids=[1])
+
+    def migrate_from_json(self, json_file_path: str):
+        """Copy all the documents of a TinyDB json file, in one transaction.
+        The data of each file is built first and written at once,
+        inserting the documents one by one would read the whole shard each time.
+        The main file, holding the meta row recording the migration, is written last.
+        Arg:
+        json_file_path - path of the json file"""
+        with open(json_file_path, encoding="utf-8") as json_file:
+            content = json_file.read()
+        data = json.loads(content) if content else {}
+
+        main_data = {
+            name: documents
+            for name, documents in data.items()
+            if name not in ["tournaments"] + list(self.shard_ids_by_document.keys())
+        }
+        main_data["tournaments"] = {}
+        shards_data = {}
+        for doc_id, document in data.get("tournaments", {}).items():
+            catalog_document, shard_document = split_tournament_document(document)
+            main_data["tournaments"][doc_id] = catalog_document
+            shards_data.setdefault(int(doc_id), {})["tournaments"] = {
+                doc_id: shard_document
+            }
+        for name in self.shard_ids_by_document.keys():
+            documents = data.get(name, {})
+            for doc_id, document in documents.items():
+                shard_data = shards_data.setdefault(document["tournament_id"], {})
+                shard_data.setdefault(name, {})[doc_id] = document
+            self.reserved_ids[name] = (
+                max([int(doc_id) for doc_id in documents.keys()], default=0)
+                + ID_BLOCK_SIZE
+            )
+        main_data["reserved_ids"] = {"1": self.reserved_ids}
+        main_data.setdefault("meta", {})[str(MIGRATION_META_ID)] = {
+            "migrated_from": json_file_path
+        }
+
+        self.begin_transaction()
+        try:
+            self.main_database.db.storage.write(main_data)
+            for tournament_id, shard_data in shards_data.items():
+                self.open_shard(tournament_id).db.storage.write(shard_data)
+        except BaseException:
+            self.rollback_transaction()
+            raise
+        self.commit_transaction()
+        """ Reopen the shards on first use, to index their documents """
+        self.shards = {}
+        """ On stderr, the reports of the command line being written to stdout """
+        print(
+            f"Base de données {json_file_path} migrée vers {self.directory_path}.",
+            file=sys.stderr,
+        )
+
+    def begin_transaction(self):
+        """Buffer the following writes of the main file and of the shards in memory"""
+        self.is_in_transaction = True
+        self.main_database.begin_transaction()
+        for shard in self.shards.values():
+            shard.begin_transaction()
+
+    def commit_transaction(self):
+        """Write the buffered data of each file, the shards before the main file
+        so that the catalog never lists a tournament missing from its shard"""
+        self.is_in_transaction = False
+        for shard in self.shards.values():
+            shard.commit_transaction()
+        self.main_database.commit_transaction()
+
+    def rollback_transaction(self):
+        """Discard the buffered writes of all the files"""
+        self.is_in_transaction = False
+        for shard in self.shards.values():
+            shard.rollback_transaction()
+        self.main_database.rollback_transaction()
@@ -0,0 +1,251 @@
+""" Define the SQLite database, an alternative to the TinyDB json file """
+import json
+import os
+import sqlite3
+import sys
+
+from models.database import MIGRATION_META_ID
+
+
+""" Indexed columns of each table, copied from the documents stored in the data column """
+TABLE_COLUMNS = {
+    "players": ["last_name", "ranking"],
+    "tournaments": ["is_finished"],
+    "rounds": ["tournament_id", "round_number"],
+    "matches": ["tournament_id", "round_number"],
+    "meta": [],
+}
+
+TABLE_INDEXES = {
+    "players": [["last_name"], ["ranking"]],
+    "tournaments": [["is_finished"]],
+    "rounds": [["tournament_id", "round_number"]],
+    "matches": [["tournament_id", "round_number"]],
+    "meta": [],
+}
+
+
+class SQLiteDocument(dict):
+    """Document read from a SQLite table, with its doc_id like a tinydb Document"""
+
+    def __init__(self, value: dict, doc_id: int):
+        """Init attribute:
+        doc_id - unique id of the document"""
+        super().__init__(value)
+        self.doc_id = doc_id
+
+
+class SQLiteTable:
+    """Table of a SQLite database, offering the subset of the tinydb table
+    interface used by DatabaseHandler"""
+
+    def __init__(self, connection, name: str):
+        """Init attributes:
+        connection - sqlite3 connection
+        name - name of the table
+        columns - indexed columns copied from the documents"""
+        self.connection = connection
+        self.name = name
+        self.columns = TABLE_COLUMNS[name]
+
+    def get_column_values(self, document: dict):
+        """Get the values of the indexed columns from a document
+        Arg:
+        document - dict to store
+
+        Return:
+        list of column values"""
+        return [document.get(column) for column in self.columns]
+
+    def insert(self, document):
+        """Insert a document with its doc_id
+        Arg:
+        document - document with a doc_id attribute
+
+        Return:
+        doc_id(int) - id of the inserted document"""
+        column_names = ", ".join(["id"] + self.columns + ["data"])
+        placeholders = ", ".join("?" * (len(self.columns) + 2))
+        self.connection.execute(
+            f"INSERT INTO {self.name} ({column_names}) VALUES ({placeholders})",
+            [document.doc_id]
+            + self.get_column_values(document)
+            + [json.dumps(dict(document))],
+        )
+        return document.doc_id
+
+    def get(self, doc_id: int):
+        """Get a document from its doc_id
+        Arg:
+        doc_id - id of the document
+
+        Return:
+        SQLiteDocument or None"""
+        row = self.connection.execute(
+            f"SELECT data FROM {self.name} WHERE id = ?", (doc_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return SQLiteDocument(json.loads(row[0]), doc_id)
+
+    def update(self, fields, doc_ids=None):
+        """Update the given fields of the documents
+        Args:
+        fields - dict of the fields to update, or function updating a document in place
+        doc_ids - ids of the documents to update, all documents if None
+
+        Return:
+        list - ids of the updated documents"""
+        if doc_ids is None:
+            doc_ids = [document.doc_id for document in self]
+        updated_ids = []
+        assignments = ", ".join(f"{column} = ?" for column in self.columns + ["data"])
+        for doc_id in doc_ids:
+            document = self.get(doc_id)
+            if document is None:
+                continue
+            if callable(fields):
+                fields(document)
+            else:
+                document.update(fields)
+            self.connection.execute(
+                f"UPDATE {self.name} SET {assignments} WHERE id = ?",
+                self.get_column_values(document)
+                + [json.dumps(dict(document)), doc_id],
+            )
+            updated_ids.append(doc_id)
+        return updated_ids
+
+    def search_by_tournament(self, tournament_id: int):
+        """Get the documents of a tournament, through the tournament_id index.
+        Only the rounds and matches tables have a tournament_id column.
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        list of SQLiteDocuments, in the order of their ids"""
+        cursor = self.connection.execute(
+            f"SELECT id, data FROM {self.name} WHERE tournament_id = ? ORDER BY id",
+            (tournament_id,),
+        )
+        return [SQLiteDocument(json.loads(data), doc_id) for doc_id, data in cursor]
+
+    def __iter__(self):
+        """Iterate over the documents in the order of their ids"""
+        cursor = self.connection.execute(
+            f"SELECT id, data FROM {self.name} ORDER BY id"
+        )
+        for doc_id, data in cursor:
+            yield SQLiteDocument(json.loads(data), doc_id)
+
+    def __len__(self):
+        """Number of documents in the table"""
+        row = self.connection.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()
+        return row[0]
+
+
+class SQLiteDatabase:
+    """SQLite database class"""
+
+    """ All the tables are stored in the same file """
+    is_sharded = False
+
+    """ Reading one document only reads its row """
+    reads_whole_file = False
+
+    """ The rounds and matches of a tournament are read through the tournament_id index """
+    indexes_tournament_id = True
+
+    def __init__(self):
+        """Init attributes:
+        file_path - path of the SQLite file
+        json_file_path - path of the TinyDB json file to migrate from
+        connection - sqlite3 connection in autocommit mode
+
+        Init methods:
+        create_tables - create the tables and their indexes if needed
+        migrate_from_json - copy db.json to the SQLite file until the copy is complete"""
+        self.file_path = os.environ.get("CTM_SQLITE_PATH", "db.sqlite3")
+        self.json_file_path = "db.json"
+
+        self.connection = sqlite3.connect(self.file_path, isolation_level=None)
+        self.create_tables()
+
+        if os.path.exists(self.json_file_path) and not self.is_migrated():
+            self.migrate_from_json(self.json_file_path)
+
+    def create_tables(self):
+        """Create the tables and their indexes if they do not exist"""
+        for name, columns in TABLE_COLUMNS.items():
+            column_definitions = ", ".join(
+                ["id INTEGER PRIMARY KEY"] + columns + ["data TEXT NOT NULL"]
+            )
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} ({column_definitions})"
+            )
+            for index_columns in TABLE_INDEXES[name]:
+                index_name = f"{name}_{'_'.join(index_columns)}"
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    + f"ON {name} ({', '.join(index_columns)})"
+                )
+
+    def is_migrated(self):
+        """Check that the documents of db.json were copied: the migration recorded
+        its end in the meta table, or the database was migrated before it was
+        recorded and holds players or tournaments
+
+        Return:
+        bool - db.json must not be copied again"""
+        if self.table("meta").get(MIGRATION_META_ID) is not None:
+            return True
+        return len(self.table("players")) > 0 or len(self.table("tournaments")) > 0
+
+    def table(self, name: str):
+        """Get a table of the database
+        Arg:
+        name - name of the table
+
+        Return:
+        SQLiteTable"""
+        return SQLiteTable(self.connection, name)
+
+    def migrate_from_json(self, json_file_path: str):
+        """Copy all the documents of a TinyDB json file, in one transaction
+        ending with the meta row recording the migration
+        Arg:
+        json_file_path - path of the json file"""
+        with open(json_file_path, encoding="utf-8") as json_file:
+            content = json_file.read()
+        data = json.loads(content) if content else {}
+
+        self.begin_transaction()
+        try:
+            for name in TABLE_COLUMNS.keys():
+                table = self.table(name)
+                for doc_id, document in data.get(name, {}).items():
+                    table.insert(SQLiteDocument(document, int(doc_id)))
+            self.table("meta").insert(
+                SQLiteDocument({"migrated_from": json_file_path}, MIGRATION_META_ID)
+            )
+        except BaseException:
+            self.rollback_transaction()
+            raise
+        self.commit_transaction()
+        """ On stderr, the reports of the command line being written to stdout """
+        print(
+            f"Base de données {json_file_path} migrée vers {self.file_path}.",
+            file=sys.stderr,
+        )
+
+    def begin_transaction(self):
+        """Start a SQLite transaction"""
+        self.connection.execute("BEGIN")
+
+    def commit_transaction(self):
+        """Commit the SQLite transaction"""
+        self.connection.execute("COMMIT")
+
+    def rollback_transaction(self):
+        """Roll back the SQLite transaction"""
+        self.connection.execute("ROLLBACK")
@@ -4,6 +4,20 @@
 class Tournament:
     """Tournament class"""
 
+    __slots__ = (
+        "id",
+        "name",
+        "location",
+        "date",
+        "number_of_rounds",
+        "list_of_rounds",
+        "list_of_players",
+        "time_control",
+        "description",
+        "is_finished",
+        "final_result",
+    )
+
     def __init__(
         self,
         id=0,
@@ -11,12 +25,12 @@ class Tournament:
         location="",
         date="",
         number_of_rounds=4,
-        list_of_rounds=[],
-        list_of_players=[],
+        list_of_rounds=None,
+        list_of_players=None,
         time_control="",
         description="",
         is_finished=False,
-        final_result=[],
+        final_result=None,
     ):
         """Init the following attributes:
         -id: Tournament's unique id, 0 by default
@@ -25,31 +39,42 @@ class Tournament:
         -date: tournament date
         -number_of_rounds: 4 by default
         -list_of_rounds: list of round objects
-        -list_of_players: list of player objects
+        -list_of_players: list of Participants
         -time_control: type of time limit for
             a tournament (bullet, blitz or rapid)
         -description: general remarks of the tournament director
         -is_finished: boolean to indicate end of the tournament
-        -final_result: sorted list of players according to their ranking and then by score
+        -final_result: sorted list of Participants according to their ranking and then by score
         """
         self.id = id
         self.name = name
         self.location = location
         self.date = date
         self.number_of_rounds = number_of_rounds
-        self.list_of_rounds = list_of_rounds
-        self.list_of_players = list_of_players
+        self.list_of_rounds = [] if list_of_rounds is None else list_of_rounds
+        self.list_of_players = [] if list_of_players is None else list_of_players
         self.time_control = time_control
         self.description = description
         self.is_finished = is_finished
-        self.final_result = final_result
+        self.final_result = [] if final_result is None else final_result
 
     def __str__(self):
         """Used in print"""
         return f"Tournoi {self.name}, Lieu : {self.location}, le {self.date}"
 
+    def get_serialized_scores(self):
+        """Serialize the score and the opponents of each player in the tournament
+
+        Return:
+        dict - score and opponents list by player id"""
+        serialized_scores = {}
+        for player in self.list_of_players + self.final_result:
+            serialized_scores[str(player.player_id)] = player.get_serialized_score()
+        return serialized_scores
+
     def get_serialized_tournament(self):
-        """Serialize tournament
+        """Serialize tournament, referencing rounds and players by their id.
+        The scores of the players in the tournament are kept in "scores".
 
         Return:
         dict - serialized tournament"""
@@ -59,16 +84,13 @@ class Tournament:
             "location": self.location,
             "date": self.date,
             "number_of_rounds": self.number_of_rounds,
-            "list_of_rounds": [
-                round.get_serialized_round() for round in self.list_of_rounds
-            ],
-            "list_of_players": [
-                player.get_serialized_player() for player in self.list_of_players
-            ],
+            "list_of_rounds": [round.id for round in self.list_of_rounds],
+            "list_of_players": [player.player_id for player in self.list_of_players],
+            "scores": self.get_serialized_scores(),
             "time_control": self.time_control,
             "description": self.description,
             "is_finished": self.is_finished,
-            "final_result": self.final_result,
+            "final_result": [player.player_id for player in self.final_result],
         }
 
         return serialized_tournament
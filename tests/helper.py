@@ -0,0 +1,137 @@
+""" Test case running in an empty directory with its own database """
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from views.round import RoundView
+from controllers.database_handler import DatabaseHandler
+from controllers.round_generator import RoundGenerator
+
+
+""" Winner prompt of RoundView """
+WINNER_PROMPT = "Veuillez entrer l'id du gagnant du match "
+
+
+class RecordingRoundView(RoundView):
+    """RoundView keeping the round being played, to answer its winner prompts"""
+
+    rounds = []
+
+    def __init__(self, round, *args):
+        """Record the round, then prompt for its winners"""
+        self.rounds.append(round)
+        super().__init__(round, *args)
+
+
+def answer_winner(prompt=""):
+    """Answer a winner prompt with the first player of the match,
+    the bye being won by the other player
+    Arg:
+    prompt - text of the prompt
+
+    Return:
+    str - winner id"""
+    match_number = int(prompt[len(WINNER_PROMPT):].split()[0])
+    match = RecordingRoundView.rounds[-1].matches[match_number - 1]
+    return str(match.player_01.player_id or match.player_02.player_id)
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case run in a temporary directory, the database files being created
+    there by a new DatabaseHandler"""
+
+    """ Storage backend of the tests, see models.database.DATABASE_BACKEND """
+    backend = "tinydb"
+
+    def setUp(self):
+        """Move to a temporary directory and discard the shared DatabaseHandler,
+        both restored at the end of the test"""
+        working_directory = os.getcwd()
+        directory = tempfile.TemporaryDirectory()
+        os.chdir(directory.name)
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, working_directory)
+
+        backend_patch = mock.patch("models.database.DATABASE_BACKEND", self.backend)
+        backend_patch.start()
+        self.addCleanup(backend_patch.stop)
+
+        DatabaseHandler.instance = None
+        self.addCleanup(setattr, DatabaseHandler, "instance", None)
+        RecordingRoundView.rounds.clear()
+
+    def create_players(self, number_of_players: int):
+        """Create and save players, ranked in the order of their creation
+        Arg:
+        number_of_players - number of players
+
+        Return:
+        list - saved Players"""
+        db_handler = DatabaseHandler()
+        players = []
+        with db_handler.transaction():
+            for i in range(number_of_players):
+                player = db_handler.create_player(
+                    last_name=f"PLAYER{i + 1}",
+                    first_name="Test",
+                    date_of_birth="01/01/1990",
+                    sex="M",
+                    ranking=i + 1,
+                )
+                db_handler.save_player_to_db(player)
+                players.append(player)
+        return players
+
+    def create_tournament(self, players: list, number_of_rounds: int):
+        """Create and save a tournament
+        Args:
+        players - Players of the tournament
+        number_of_rounds - number of rounds in the tournament
+
+        Return:
+        tournament(Tournament) - saved tournament"""
+        db_handler = DatabaseHandler()
+        tournament = db_handler.create_tournament(
+            "Test open",
+            "Paris",
+            "01/01/2099",
+            number_of_rounds,
+            "Blitz",
+            "Test",
+            len(players),
+            players,
+        )
+        db_handler.save_tournament_to_db(tournament)
+        return tournament
+
+    def play_tournament(
+        self,
+        number_of_players: int,
+        number_of_rounds: int,
+        number_of_played_rounds=None,
+    ):
+        """Create a tournament and play its rounds through RoundGenerator,
+        each match being won by its first player
+        Args:
+        number_of_players - number of players in the tournament
+        number_of_rounds - number of rounds in the tournament
+        number_of_played_rounds - number of rounds played, all of them by default
+
+        Return:
+        tournament(Tournament) - played tournament"""
+        tournament = self.create_tournament(
+            self.create_players(number_of_players), number_of_rounds
+        )
+        with mock.patch("builtins.input", answer_winner), mock.patch(
+            "controllers.round_generator.RoundView", RecordingRoundView
+        ), contextlib.redirect_stdout(io.StringIO()):
+            RoundGenerator(
+                tournament.id,
+                tournament.list_of_players,
+                number_of_played_rounds or number_of_rounds,
+                load_from_first_match=True,
+            )
+        return tournament
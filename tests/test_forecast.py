@@ -0,0 +1,170 @@
+""" Check that the forecast ranks the simulated finals like the standings """
+import random
+import unittest
+
+from models.participant import Participant, create_no_player
+from models.player import Player
+from models.round import Round
+
+from controllers.forecast import forecast_top_n, get_top_n
+from controllers.standings import Standings
+from controllers.swiss_system import apply_results, pair_round
+from controllers.tie_break import TieBreaks, compute_tie_breaks
+
+
+def create_participants(random_generator: random.Random, number_of_players: int):
+    """Create participants with random rankings, some of them tied,
+    with the nobody player if their number is odd
+    Args:
+    random_generator - random.Random instance
+    number_of_players - number of players, without the nobody player
+
+    Return:
+    list - Participants without score"""
+    players = [
+        Participant(
+            Player(
+                player_id=player_id,
+                last_name=f"PLAYER{player_id}",
+                first_name="Test",
+                date_of_birth="01/01/1990",
+                sex="M",
+                ranking=random_generator.randint(1, number_of_players),
+            )
+        )
+        for player_id in range(1, number_of_players + 1)
+    ]
+    if number_of_players % 2:
+        players.append(create_no_player())
+    return players
+
+
+def play_rounds(
+    random_generator: random.Random, players: list, first_round: int, last_round: int
+):
+    """Pair and play rounds with random results, draws included
+    Args:
+    random_generator - random.Random instance
+    players - list of Participants, updated in place
+    first_round - number of the first round played
+    last_round - number of the last round played
+
+    Return:
+    list - Matches of the rounds with their winners"""
+    matches = []
+    for round_number in range(first_round, last_round + 1):
+        round_matches = pair_round(players, round_number)
+        results = []
+        for match in round_matches:
+            player_ids = [match.player_01.player_id, match.player_02.player_id]
+            if 0 in player_ids:
+                results.append([player_id for player_id in player_ids if player_id])
+            else:
+                results.append(
+                    random_generator.choice(
+                        [player_ids[:1], player_ids[1:], player_ids]
+                    )
+                )
+        apply_results(Round(round_number=round_number, matches=round_matches), results)
+        matches += round_matches
+    return matches
+
+
+def get_simulated_rounds(matches: list):
+    """Get the simulated rounds of get_top_n from played matches
+    Arg:
+    matches - Matches with their winners
+
+    Return:
+    list - (round number, pairs, points of the first player of each pair)"""
+    simulated_rounds = {}
+    for match in matches:
+        round_number, pairs, points_of_round = simulated_rounds.setdefault(
+            match.round_number, (match.round_number, [], [])
+        )
+        pairs.append((match.player_01, match.player_02))
+        if match.player_01.player_id not in match.winner:
+            points_of_round.append(0.0)
+        elif len(match.winner) > 1:
+            points_of_round.append(0.5)
+        else:
+            points_of_round.append(1.0)
+    return list(simulated_rounds.values())
+
+
+def get_ids(players: list):
+    """Get the ids of players
+    Arg:
+    players - list of Participants
+
+    Return:
+    list - player ids"""
+    return [player.player_id for player in players]
+
+
+class TestForecastRanking(unittest.TestCase):
+    """The top N of a simulated final is the top N of Standings"""
+
+    def test_top_n(self):
+        """Random tournaments, each place of the standings as N, rematches
+        forced in the tournaments with more rounds than half the players"""
+        for number_of_players in (2, 5, 8, 13, 20, 41):
+            for number_of_played_rounds in (0, 1, 3):
+                for seed in range(5):
+                    random_generator = random.Random(
+                        f"{number_of_players}-{number_of_played_rounds}-{seed}"
+                    )
+                    players = create_participants(random_generator, number_of_players)
+                    player_ids = get_ids(players)
+                    played_matches = play_rounds(
+                        random_generator, players, 1, number_of_played_rounds
+                    )
+                    played_tie_breaks = compute_tie_breaks(player_ids, played_matches)
+                    simulated_matches = play_rounds(
+                        random_generator, players, number_of_played_rounds + 1, 9
+                    )
+                    standings = Standings(
+                        players,
+                        compute_tie_breaks(
+                            player_ids, played_matches + simulated_matches
+                        ),
+                    )
+                    ranked_players = [player for player in players if player.player_id]
+                    for top_n in range(1, number_of_players + 1):
+                        with self.subTest(
+                            players=number_of_players,
+                            played_rounds=number_of_played_rounds,
+                            seed=seed,
+                            top_n=top_n,
+                        ):
+                            top_players = get_top_n(
+                                ranked_players,
+                                top_n,
+                                TieBreaks(),
+                                played_tie_breaks,
+                                get_simulated_rounds(simulated_matches),
+                            )
+                            self.assertCountEqual(
+                                get_ids(top_players), get_ids(standings.top(top_n))
+                            )
+
+    def test_finished_tournament(self):
+        """Without rounds left, the top N of the standings has probability 1"""
+        random_generator = random.Random(0)
+        players = create_participants(random_generator, 15)
+        matches = play_rounds(random_generator, players, 1, 5)
+        standings = Standings(players, compute_tie_breaks(get_ids(players), matches))
+        probabilities = forecast_top_n(players, 5, 5, 4, matches, seed=0)
+        self.assertEqual(
+            {
+                player_id
+                for player_id, probability in probabilities.items()
+                if probability == 1
+            },
+            set(get_ids(standings.top(4))),
+        )
+        self.assertEqual(sum(probabilities.values()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
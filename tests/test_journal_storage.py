@@ -0,0 +1,155 @@
+""" Check the journal backend after crashes, rollbacks and compactions """
+import os
+import unittest
+from unittest import mock
+
+from controllers.database_handler import DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+class TestJournalStorage(DatabaseTestCase):
+    """The snapshot and the journal always replay to the committed data"""
+
+    backend = "journal"
+
+    def setUp(self):
+        """Save players and a tournament, each transaction being one journal line"""
+        super().setUp()
+        self.tournament = self.create_tournament(self.create_players(4), 3)
+
+    def get_storage(self):
+        """Get the journal storage of the database
+
+        Return:
+        JournalJSONStorage"""
+        return DatabaseHandler().database.db.storage
+
+    def reopen(self):
+        """Open the database again, replaying the journal on the snapshot
+
+        Return:
+        DatabaseHandler"""
+        self.get_storage().close()
+        DatabaseHandler.instance = None
+        return DatabaseHandler()
+
+    def get_state(self, db_handler: DatabaseHandler):
+        """Get the players and tournaments of the database
+        Arg:
+        db_handler - DatabaseHandler
+
+        Return:
+        tuple - (id, ranking) of the players, ids of the tournaments"""
+        return (
+            [(player.player_id, player.ranking) for player in db_handler.players],
+            [tournament.id for tournament in db_handler.tournaments],
+        )
+
+    def read_journal(self):
+        """Read the journal file
+
+        Return:
+        bytes - content of the journal"""
+        with open("db.json.journal", "rb") as journal_file:
+            return journal_file.read()
+
+    def test_replay(self):
+        """The journal holds one line per transaction, replayed on launch"""
+        number_of_lines = self.read_journal().count(b"\n")
+        self.create_players(3)
+        self.assertEqual(self.read_journal().count(b"\n"), number_of_lines + 1)
+        state = self.get_state(DatabaseHandler())
+        self.assertEqual(self.get_state(self.reopen()), state)
+
+    def test_torn_last_line(self):
+        """A last line cut by a crash is dropped whole and truncated"""
+        journal = self.read_journal()
+        state = self.get_state(DatabaseHandler())
+        self.create_players(2)
+        last_line = self.read_journal()[len(journal):]
+        for size in (1, len(last_line) // 2, len(last_line) - 1):
+            with self.subTest(size=size):
+                with open("db.json.journal", "wb") as journal_file:
+                    journal_file.write(journal + last_line[:size])
+                self.assertEqual(self.get_state(self.reopen()), state)
+                self.assertEqual(self.read_journal(), journal)
+
+        """ The next line starts after the truncated journal """
+        players = self.create_players(1)
+        self.assertEqual(
+            self.get_state(self.reopen())[0], state[0] + [(players[0].player_id, 1)]
+        )
+
+    def test_rollback(self):
+        """A rolled back transaction appends nothing and restores the data"""
+        db_handler = DatabaseHandler()
+        state = self.get_state(db_handler)
+        journal = self.read_journal()
+        with self.assertRaises(ZeroDivisionError):
+            with db_handler.transaction():
+                self.create_players(1)
+                db_handler.players[0].ranking = 10
+                db_handler.update_player_in_db(db_handler.players[0], ["ranking"])
+                1 / 0
+        self.assertEqual(self.read_journal(), journal)
+        self.assertEqual(self.get_state(db_handler), state)
+        self.assertEqual(self.get_storage().data["players"]["1"]["ranking"], 1)
+        self.assertEqual(self.get_state(self.reopen()), state)
+
+    def test_storage_rollback(self):
+        """The storage restores the documents updated in place by the transaction"""
+        db_handler = DatabaseHandler()
+        storage = self.get_storage()
+        journal = self.read_journal()
+        db_handler.database.begin_transaction()
+        db_handler.players_table.update({"ranking": 10}, doc_ids=[1])
+        self.assertEqual(storage.data["players"]["1"]["ranking"], 10)
+        db_handler.database.rollback_transaction()
+        self.assertEqual(storage.data["players"]["1"]["ranking"], 1)
+        self.assertEqual(db_handler.players_table.get(doc_id=1)["ranking"], 1)
+        self.assertEqual(self.read_journal(), journal)
+
+    def test_replay_after_compaction(self):
+        """The lines written after a compaction are replayed on the new snapshot"""
+        self.get_storage().compact()
+        self.assertEqual(self.read_journal(), b"")
+        db_handler = DatabaseHandler()
+        db_handler.players[0].ranking = 10
+        db_handler.update_player_in_db(db_handler.players[0], ["ranking"])
+        self.create_players(1)
+        state = self.get_state(db_handler)
+        self.assertEqual(self.read_journal().count(b"\n"), 2)
+        self.assertEqual(self.get_state(self.reopen()), state)
+
+    def test_background_compaction(self):
+        """A journal over the threshold is folded into the snapshot in the background"""
+        with mock.patch("models.journal_storage.COMPACTION_THRESHOLD", 1):
+            self.create_players(1)
+            state = self.get_state(DatabaseHandler())
+            self.get_storage().close()
+        self.assertEqual(self.read_journal(), b"")
+        self.assertEqual(self.get_state(self.reopen()), state)
+
+    def test_interrupted_compaction(self):
+        """A compaction interrupted before or after writing the snapshot
+        loses nothing, the journal lines being replayed again"""
+        state = self.get_state(DatabaseHandler())
+        journal = self.read_journal()
+        replace = os.replace
+        for interrupted_path in ("db.json.tmp", "db.json.journal.tmp"):
+            with self.subTest(interrupted_path=interrupted_path):
+
+                def interrupt(source, destination):
+                    if source == interrupted_path:
+                        raise OSError
+                    replace(source, destination)
+
+                with mock.patch("models.journal_storage.os.replace", interrupt):
+                    with self.assertRaises(OSError):
+                        self.get_storage().compact()
+                self.assertEqual(self.read_journal(), journal)
+                self.assertEqual(self.get_state(self.reopen()), state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+""" Check the maintenance tasks of the command line on each storage backend """
+import contextlib
+import io
+import unittest
+
+import main
+from controllers.database_handler import DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+class TestMaintenanceInfo(DatabaseTestCase):
+    """maintenance info counts the documents of all the tables"""
+
+    def test_info(self):
+        """The documents are counted once the database is opened again"""
+        self.play_tournament(5, 3)
+        DatabaseHandler.instance = None
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main.main(["maintenance", "info"]), 0)
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                f"Backend : {self.backend}",
+                "Version du schéma : 2",
+                "players : 5",
+                "tournaments : 1",
+                "rounds : 3",
+                "matches : 9",
+            ],
+        )
+
+
+class TestJournalMaintenanceInfo(TestMaintenanceInfo):
+    """maintenance info with the journal backend"""
+
+    backend = "journal"
+
+
+class TestShardedMaintenanceInfo(TestMaintenanceInfo):
+    """maintenance info with the sharded backend, its shards being closed"""
+
+    backend = "sharded"
+
+
+class TestSQLiteMaintenanceInfo(TestMaintenanceInfo):
+    """maintenance info with the SQLite backend"""
+
+    backend = "sqlite"
+
+
+if __name__ == "__main__":
+    unittest.main()
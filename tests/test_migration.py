@@ -0,0 +1,198 @@
+""" Check the copy of db.json to the sqlite and sharded backends,
+and the migration of the documents stored with schema version 1 """
+import contextlib
+import io
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import main
+from models.database import TransactionalJSONStorage
+from models.sqlite_database import SQLiteTable
+
+from controllers.database_handler import SCHEMA_VERSION, DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+""" db.json of a tournament of 3 players and 2 rounds, saved with schema version 1:
+the rankings of the players 1 and 3 changed after the tournament """
+SCHEMA_V1_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "db_v1.json")
+
+
+class TestMigrationFromJson(DatabaseTestCase):
+    """db.json is copied until a migration completes, then never again"""
+
+    def setUp(self):
+        """Save players and a tournament to db.json"""
+        super().setUp()
+        self.tournament = self.create_tournament(self.create_players(4), 3)
+        self.addCleanup(mock.patch.stopall)
+
+    def open_database(self, backend: str):
+        """Open the database of a backend with a new DatabaseHandler
+        Arg:
+        backend - "sqlite" or "sharded"
+
+        Return:
+        DatabaseHandler"""
+        DatabaseHandler.instance = None
+        mock.patch("models.database.DATABASE_BACKEND", backend).start()
+        with contextlib.redirect_stderr(io.StringIO()), contextlib.redirect_stdout(
+            io.StringIO()
+        ):
+            return DatabaseHandler()
+
+    def assert_migrated(self, db_handler: DatabaseHandler):
+        """Check the documents of db.json are in the database
+        Arg:
+        db_handler - DatabaseHandler of the migrated database"""
+        self.assertEqual(
+            [player.last_name for player in db_handler.players],
+            ["PLAYER1", "PLAYER2", "PLAYER3", "PLAYER4"],
+        )
+        tournament = db_handler.get_tournament_by_id(self.tournament.id)
+        self.assertEqual(tournament.name, "Test open")
+        self.assertEqual(len(tournament.list_of_players), 4)
+
+    def test_sqlite_failed_migration(self):
+        """A migration failing before its end is run again on next start"""
+        with mock.patch.object(SQLiteTable, "insert", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.open_database("sqlite")
+        self.assert_migrated(self.open_database("sqlite"))
+        """ Copying again would insert the same ids """
+        self.assert_migrated(self.open_database("sqlite"))
+
+    def test_sharded_interrupted_migration(self):
+        """Shards written without the main file are written again on next start"""
+        write_to_file = TransactionalJSONStorage.write_to_file
+
+        def fail_on_main_file(storage, data):
+            if storage.path.endswith("players.json"):
+                raise OSError
+            write_to_file(storage, data)
+
+        with mock.patch.object(
+            TransactionalJSONStorage, "write_to_file", fail_on_main_file
+        ):
+            with self.assertRaises(OSError):
+                self.open_database("sharded")
+        self.assert_migrated(self.open_database("sharded"))
+        self.assert_migrated(self.open_database("sharded"))
+
+    def test_migrated_before_meta_row(self):
+        """A database migrated before the migration was recorded is not copied again"""
+        db_handler = self.open_database("sqlite")
+        db_handler.database.connection.execute("DELETE FROM meta WHERE id = 2")
+        self.assert_migrated(self.open_database("sqlite"))
+
+    def test_report_output(self):
+        """The notice of the migration is written to stderr, not to the csv report"""
+        for backend in ("sqlite", "sharded"):
+            with self.subTest(backend=backend):
+                DatabaseHandler.instance = None
+                mock.patch("models.database.DATABASE_BACKEND", backend).start()
+                output = io.StringIO()
+                errors = io.StringIO()
+                with contextlib.redirect_stdout(output), contextlib.redirect_stderr(
+                    errors
+                ):
+                    self.assertEqual(main.main(["report", "players"]), 0)
+                self.assertEqual(
+                    output.getvalue().splitlines()[0],
+                    "player_id,last_name,first_name,date_of_birth,sex,ranking",
+                )
+                self.assertEqual(len(output.getvalue().splitlines()), 5)
+                self.assertIn("migrée", errors.getvalue())
+
+
+class TestSchemaMigration(DatabaseTestCase):
+    """The documents embedding copies of the players, rounds and matches
+    reference them by id once migrated"""
+
+    def setUp(self):
+        """Open the database of db.json saved with schema version 1"""
+        super().setUp()
+        shutil.copy(SCHEMA_V1_FIXTURE, "db.json")
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.db_handler = DatabaseHandler()
+
+    def test_documents(self):
+        """The stored documents reference the players, rounds and matches by id"""
+        self.assertEqual(self.db_handler.get_schema_version(), SCHEMA_VERSION)
+        tournament = self.db_handler.tournaments_table.get(doc_id=1)
+        self.assertEqual(tournament["list_of_players"], [1, 2, 3])
+        self.assertEqual(tournament["final_result"], [1, 3, 2, 0])
+        self.assertEqual(tournament["list_of_rounds"], [1, 2])
+        self.assertEqual(
+            tournament["scores"],
+            {
+                "1": {"total_score": 1.5, "opponents_list": [2, 3], "ranking": 1},
+                "2": {"total_score": 1, "opponents_list": [1, 0], "ranking": 2},
+                "3": {"total_score": 1.5, "opponents_list": [0, 1], "ranking": 3},
+                "0": {"total_score": 0, "opponents_list": [3, 2], "ranking": 1000000},
+            },
+        )
+        self.assertEqual(self.db_handler.rounds_table.get(doc_id=2)["matches"], [3, 4])
+        self.assertEqual(
+            [
+                self.db_handler.matches_table.get(doc_id=match_id)["pair_of_players"]
+                for match_id in range(1, 5)
+            ],
+            [[1, 2], [3, 0], [1, 3], [2, 0]],
+        )
+
+    def test_tournament(self):
+        """The tournament is loaded with the scores and rankings it was played with,
+        its matches sharing its players"""
+        tournament = self.db_handler.get_tournament_by_id(1)
+        players_by_id = {
+            player.player_id: player
+            for player in tournament.list_of_players + tournament.final_result
+        }
+        self.assertEqual(
+            [player.player_id for player in tournament.final_result], [1, 3, 2, 0]
+        )
+        self.assertEqual(
+            {
+                player_id: (player.total_score, player.ranking, set(player.opponents))
+                for player_id, player in players_by_id.items()
+            },
+            {
+                1: (1.5, 1, {2, 3}),
+                2: (1, 2, {1, 0}),
+                3: (1.5, 3, {0, 1}),
+                0: (0, 1000000, {3, 2}),
+            },
+        )
+        self.assertEqual(self.db_handler.get_player_object_from_id(1).ranking, 4)
+        self.assertEqual(
+            [round.round_number for round in tournament.list_of_rounds], [1, 2]
+        )
+        for match in self.db_handler.get_matches_in_a_tournament(1):
+            for player in match.pair_of_players:
+                self.assertIs(player, players_by_id[player.player_id])
+
+    def test_migrated_once(self):
+        """The migrated documents are not migrated again"""
+        tournament = dict(self.db_handler.tournaments_table.get(doc_id=1))
+        DatabaseHandler.instance = None
+        db_handler = DatabaseHandler()
+        self.assertEqual(dict(db_handler.tournaments_table.get(doc_id=1)), tournament)
+
+
+class TestSQLiteSchemaMigration(TestSchemaMigration):
+    """Migration of schema version 1 copied from db.json to the SQLite backend"""
+
+    backend = "sqlite"
+
+
+class TestShardedSchemaMigration(TestSchemaMigration):
+    """Migration of schema version 1 copied from db.json to the sharded backend"""
+
+    backend = "sharded"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+""" Check the linked list greedy pairing against the two-pass pairing it replaced """
+import random
+import unittest
+from math import ceil
+
+from models.participant import Participant, create_no_player
+from models.player import Player
+
+from controllers.pairing import pair_players_greedily
+from controllers.swiss_system import sort_players_by_score
+
+
+""" Probabilities for two players to have already met, the highest ones force
+rematches in the second pass """
+MET_PROBABILITIES = (0, 0.2, 0.5, 0.8, 0.95, 1)
+
+""" Number of random rounds checked for each number of players
+and each probability """
+ROUNDS_PER_CASE = 5
+
+
+def generate_match(
+    player_01: Participant,
+    sorted_players: list,
+    has_a_match: dict,
+    matches: list,
+    force_pairing=False,
+):
+    """Reference copy of RoundGenerator.generate_match before the linked list,
+    the match being a (player_01, player_02) tuple
+    Args:
+    player_01 - first player of the potential match
+    sorted_players - sorted list of players by ranking and score
+    has_a_match - dictionary with players as keys and boolean (has a match or not) as values
+    matches - list of matches of a round
+    force pairing - if remaining players without matches, force pairing
+
+    Returns:
+    matches - list of matches in the round
+    has_a_match - dictionary with players as keys and boolean (has a match or not) as values"""
+    if has_a_match[player_01] is False:
+        for opponent in sorted_players:
+            if (
+                opponent is not player_01
+                and has_a_match[opponent] is False
+                and (opponent.player_id not in player_01.opponents or force_pairing)
+            ):
+                player_02 = opponent
+                has_a_match[player_01] = True
+                has_a_match[player_02] = True
+                player_01.opponents.add(player_02.player_id)
+                player_02.opponents.add(player_01.player_id)
+                matches.append((player_01, player_02))
+                break
+    return matches, has_a_match
+
+
+def generate_next_round(players: list):
+    """Reference copy of the two passes of RoundGenerator.generate_next_round
+    before the linked list
+    Arg:
+    players - list of Participants sorted by score and ranking
+
+    Return:
+    list - (player_01, player_02) tuples"""
+    has_a_match = {}
+    for player in players:
+        has_a_match[player] = False
+
+    matches = []
+
+    for i in range(0, int(len(players))):
+        player_01 = players[i]
+        match_generation = generate_match(
+            player_01, players, has_a_match, matches, False
+        )
+        matches = match_generation[0]
+        has_a_match = match_generation[1]
+
+    """ In case the previous attempt failed to assign matches to players """
+    number_of_matches_in_round = ceil(len(players) / 2)
+    if number_of_matches_in_round > len(matches):
+        for i in range(0, int(len(players))):
+            player_01 = players[i]
+            match_generation = generate_match(
+                player_01, players, has_a_match, matches, True
+            )
+            matches = match_generation[0]
+            has_a_match = match_generation[1]
+    return matches
+
+
+def create_standings(
+    random_generator: random.Random, number_of_players: int, met_probability: float
+):
+    """Create random participants, with the nobody player if their number is odd
+    Args:
+    random_generator - random.Random instance
+    number_of_players - number of players, without the nobody player
+    met_probability - probability for two players to have already met
+
+    Return:
+    list - Participants with random scores, tied rankings and opponents"""
+    players = [
+        Participant(
+            Player(
+                player_id=player_id,
+                last_name=f"PLAYER{player_id}",
+                first_name="Test",
+                date_of_birth="01/01/1990",
+                sex="M",
+                ranking=random_generator.randint(1, number_of_players),
+            ),
+            total_score=random_generator.randint(0, 14) / 2,
+        )
+        for player_id in range(1, number_of_players + 1)
+    ]
+    if number_of_players % 2 != 0:
+        players.append(create_no_player())
+    for i, player in enumerate(players):
+        for opponent in players[i + 1:]:
+            if random_generator.random() < met_probability:
+                player.opponents.add(opponent.player_id)
+                opponent.opponents.add(player.player_id)
+    return players
+
+
+def get_pair_ids(pairs: list):
+    """Get the player ids of pairs
+    Arg:
+    pairs - list of (player_01, player_02) tuples
+
+    Return:
+    list - (player_01 id, player_02 id) tuples"""
+    return [(player_01.player_id, player_02.player_id) for player_01, player_02 in pairs]
+
+
+class TestGreedyPairing(unittest.TestCase):
+    """pair_players_greedily gives the pairs of the two-pass generate_match"""
+
+    def assert_same_pairs(self, players: list):
+        """Compare the two pairings on copies of the same standings
+        Arg:
+        players - list of Participants"""
+        sorted_players = sort_players_by_score(players)
+        reference_players = [
+            Participant(player.player, player.total_score, player.opponents)
+            for player in sorted_players
+        ]
+        self.assertEqual(
+            get_pair_ids(pair_players_greedily(sorted_players)),
+            get_pair_ids(generate_next_round(reference_players)),
+        )
+
+    def test_random_standings(self):
+        """Even and odd numbers of players, from no opponent met to all met"""
+        for number_of_players in range(1, 41):
+            for met_probability in MET_PROBABILITIES:
+                for seed in range(ROUNDS_PER_CASE):
+                    with self.subTest(
+                        players=number_of_players,
+                        met_probability=met_probability,
+                        seed=seed,
+                    ):
+                        random_generator = random.Random(
+                            f"{number_of_players}-{met_probability}-{seed}"
+                        )
+                        self.assert_same_pairs(
+                            create_standings(
+                                random_generator, number_of_players, met_probability
+                            )
+                        )
+
+    def test_large_standings(self):
+        """Open tournaments, with a few rematches forced"""
+        for number_of_players in (501, 1001):
+            for met_probability in (0.01, 0.2):
+                with self.subTest(
+                    players=number_of_players, met_probability=met_probability
+                ):
+                    random_generator = random.Random(
+                        f"{number_of_players}-{met_probability}"
+                    )
+                    self.assert_same_pairs(
+                        create_standings(
+                            random_generator, number_of_players, met_probability
+                        )
+                    )
+
+    def test_forced_rematches(self):
+        """Every player already met all the others, each pair is a rematch"""
+        for number_of_players in (2, 7, 10):
+            with self.subTest(players=number_of_players):
+                self.assert_same_pairs(
+                    create_standings(random.Random(number_of_players), number_of_players, 1)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+""" Check that each write to the database only invalidates the reports it changes """
+import unittest
+
+from models.match import Match
+from models.round import Round
+
+from controllers.database_handler import DatabaseHandler
+from controllers.report_export import get_ordered_players
+from tests.helper import DatabaseTestCase
+
+
+class TestReportCache(DatabaseTestCase):
+    """The reports on the players, on the list of the tournaments and on one
+    tournament are made again after the writes they read only"""
+
+    def setUp(self):
+        """Play two tournaments"""
+        super().setUp()
+        self.tournament_01 = self.play_tournament(4, 2)
+        self.tournament_02 = self.play_tournament(4, 2)
+        self.db_handler = DatabaseHandler()
+        """ Reports with the dependencies of the player, tournament list
+        and tournament reports """
+        self.dependencies = {
+            "players": ("players",),
+            "tournaments": ("players", "tournaments"),
+            "tournament_01": ("players", ("tournament", self.tournament_01.id)),
+            "tournament_02": ("players", ("tournament", self.tournament_02.id)),
+        }
+
+    def get_made_reports(self, write):
+        """Get the reports made again after a write
+        Arg:
+        write - function writing to the database
+
+        Return:
+        set - names of the reports made again"""
+        made_reports = set()
+        for report_name, dependencies in self.dependencies.items():
+            self.db_handler.report_cache.get_report(
+                report_name, dependencies, lambda report_name=report_name: report_name
+            )
+        write()
+        for report_name, dependencies in self.dependencies.items():
+            self.db_handler.report_cache.get_report(
+                report_name,
+                dependencies,
+                lambda report_name=report_name: made_reports.add(report_name),
+            )
+        return made_reports
+
+    def test_writes(self):
+        """Each write makes again the reports reading what it changed"""
+        db_handler = self.db_handler
+        tournament_id = self.tournament_01.id
+        player = db_handler.get_player_object_from_id(1)
+        round = db_handler.get_rounds_in_a_tournament(tournament_id)[0]
+        match = db_handler.get_matches_in_a_tournament(tournament_id)[0]
+        all_reports = {"players", "tournaments", "tournament_01", "tournament_02"}
+        tournament_reports = {"tournaments", "tournament_01"}
+        for write_name, write, expected_reports in (
+            ("save_player_to_db", lambda: self.create_players(1), all_reports),
+            (
+                "update_player_in_db",
+                lambda: db_handler.update_player_in_db(player, ["ranking"]),
+                all_reports,
+            ),
+            (
+                "save_tournament_to_db",
+                lambda: self.create_tournament(self.tournament_01.list_of_players, 3),
+                {"tournaments"},
+            ),
+            (
+                "update_tournament_in_db",
+                lambda: db_handler.update_tournament_in_db(
+                    self.tournament_01, ["description"]
+                ),
+                tournament_reports,
+            ),
+            (
+                "save_round_to_db",
+                lambda: db_handler.save_round_to_db(
+                    Round(round_number=3, tournament_id=tournament_id, matches=[])
+                ),
+                tournament_reports,
+            ),
+            (
+                "update_round_in_db",
+                lambda: db_handler.update_round_in_db(round, ["end_date_time"]),
+                tournament_reports,
+            ),
+            (
+                "save_match_to_db",
+                lambda: db_handler.save_match_to_db(
+                    Match(
+                        tournament_id=tournament_id,
+                        round_number=3,
+                        pair_of_players=match.pair_of_players,
+                    )
+                ),
+                tournament_reports,
+            ),
+            (
+                "update_match_in_db",
+                lambda: db_handler.update_match_in_db(match, ["winner"]),
+                tournament_reports,
+            ),
+        ):
+            with self.subTest(write=write_name):
+                self.assertEqual(self.get_made_reports(write), expected_reports)
+
+    def test_no_write(self):
+        """Without write, the reports are taken from the cache"""
+        self.assertEqual(self.get_made_reports(lambda: None), set())
+
+    def test_ordered_players(self):
+        """The ordered players are kept until a player or their tournament is written"""
+        tournament_id = self.tournament_01.id
+        players = get_ordered_players("rank")
+        tournament_players = get_ordered_players("rank", tournament_id)
+        self.db_handler.update_tournament_in_db(self.tournament_02, ["description"])
+        self.assertIs(get_ordered_players("rank"), players)
+        self.assertIs(get_ordered_players("rank", tournament_id), tournament_players)
+
+        self.db_handler.update_tournament_in_db(self.tournament_01, ["description"])
+        self.assertIs(get_ordered_players("rank"), players)
+        self.assertIsNot(
+            get_ordered_players("rank", tournament_id), tournament_players
+        )
+
+        player = players[-1]
+        player.ranking = 0
+        self.db_handler.update_player_in_db(player, ["ranking"])
+        self.assertEqual(get_ordered_players("rank")[0], player)
+
+
+if __name__ == "__main__":
+    unittest.main()
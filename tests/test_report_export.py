@@ -0,0 +1,38 @@
+""" Check the export of the reports from the export menu """
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from controllers.database_handler import DatabaseHandler
+from controllers.report_export import write_report
+from views.report_menu import ExportMenuView
+from tests.helper import DatabaseTestCase
+
+
+class TestExportMenu(DatabaseTestCase):
+    """The export menu writes the reports offered by the command line"""
+
+    def test_standings(self):
+        """The standings of the chosen tournament are exported"""
+        self.play_tournament(4, 2)
+        tournament = self.play_tournament(5, 3)
+        report_menu = mock.Mock(db_handler=DatabaseHandler())
+        export_menu_view = ExportMenuView(report_menu)
+        answers = iter(["6", str(tournament.id), "csv", "standings.csv", "2"])
+        with mock.patch("builtins.input", lambda prompt="": next(answers)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                next_screen = export_menu_view.display_menu()
+        self.assertEqual(next_screen, export_menu_view.display_menu)
+
+        expected_report = io.StringIO(newline="")
+        number_of_rows = write_report(
+            "standings", expected_report, "csv", tournament_id=tournament.id
+        )
+        self.assertEqual(number_of_rows, 5)
+        with open("standings.csv", encoding="utf-8", newline="") as file:
+            self.assertEqual(file.read(), expected_report.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+""" Check that the tournaments with an odd number of players are paired with a bye """
+import unittest
+
+from controllers.database_handler import DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+class TestOddNumberOfPlayers(DatabaseTestCase):
+    """Every player meets one opponent per round, the nobody player included"""
+
+    def test_rounds(self):
+        """Each round pairs every player and the nobody player exactly once"""
+        for number_of_players in (3, 7, 9):
+            with self.subTest(players=number_of_players):
+                tournament = self.play_tournament(number_of_players, 3)
+                tournament_player_ids = sorted(
+                    player.player_id for player in tournament.list_of_players
+                )
+                db_handler = DatabaseHandler()
+                for round_number in range(1, 4):
+                    player_ids = []
+                    for match in db_handler.get_matches_in_a_round(
+                        tournament.id, round_number
+                    ):
+                        player_ids += [
+                            match.player_01.player_id,
+                            match.player_02.player_id,
+                        ]
+                    self.assertEqual(sorted(player_ids), [0] + tournament_player_ids)
+                self.assertEqual(len(tournament_player_ids), number_of_players)
+                self.assertEqual(
+                    sum(player.total_score for player in tournament.list_of_players),
+                    3 * (number_of_players + 1) / 2,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
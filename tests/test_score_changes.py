@@ -0,0 +1,116 @@
+""" Check the scores of a tournament loaded from the score changes of its rounds """
+import unittest
+
+from controllers.database_handler import DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+def get_scores(tournament):
+    """Get the scores of the players of a tournament
+    Arg:
+    tournament(Tournament) - tournament
+
+    Return:
+    dict - total score and sorted opponents by player id"""
+    return {
+        player.player_id: (player.total_score, sorted(player.opponents))
+        for player in tournament.list_of_players
+    }
+
+
+class TestApplyScoreChanges(DatabaseTestCase):
+    """The scores saved with each round give the scores of the tournament"""
+
+    def reload_tournament(self, tournament_id: int):
+        """Load a tournament with a new DatabaseHandler
+        Arg:
+        tournament_id - unique id of the tournament
+
+        Return:
+        tournament(Tournament) - loaded tournament"""
+        DatabaseHandler.instance = None
+        return DatabaseHandler().get_tournament_by_id(tournament_id)
+
+    def close_tournament(self, tournament):
+        """Write the final scores to the tournament, as TournamentManager does
+        Arg:
+        tournament(Tournament) - played tournament"""
+        db_handler = DatabaseHandler()
+        tournament.is_finished = True
+        tournament.final_result = list(tournament.list_of_players)
+        tournament.list_of_rounds = list(
+            db_handler.get_rounds_in_a_tournament(tournament.id)
+        )
+        db_handler.update_tournament_in_db(
+            tournament, ["is_finished", "final_result", "list_of_rounds", "scores"]
+        )
+
+    def test_replay(self):
+        """The changes of the rounds are replayed on the scores saved at creation"""
+        tournament = self.play_tournament(6, 3)
+        scores = get_scores(tournament)
+        serialized_scores = DatabaseHandler().tournaments_table.get(
+            doc_id=tournament.id
+        )["scores"]
+        self.assertEqual(
+            {score["total_score"] for score in serialized_scores.values()}, {0}
+        )
+        self.assertEqual(get_scores(self.reload_tournament(tournament.id)), scores)
+
+    def test_replay_twice(self):
+        """Changes already included in the scores of the tournament, or applied
+        twice, give the same scores"""
+        tournament = self.play_tournament(6, 3)
+        scores = get_scores(tournament)
+        self.close_tournament(tournament)
+        loaded_tournament = self.reload_tournament(tournament.id)
+        self.assertEqual(get_scores(loaded_tournament), scores)
+        DatabaseHandler().apply_score_changes(loaded_tournament)
+        self.assertEqual(get_scores(loaded_tournament), scores)
+
+    def test_nobody_player(self):
+        """An ongoing tournament gets back the nobody player of its byes, once,
+        a finished one does not"""
+        tournament = self.play_tournament(5, 3, number_of_played_rounds=2)
+        scores = get_scores(tournament)
+        bye_opponents = set()
+        for match in DatabaseHandler().get_matches_in_a_tournament(tournament.id):
+            player_ids = [player.player_id for player in match.pair_of_players]
+            if 0 in player_ids:
+                bye_opponents.update(player_ids)
+        bye_opponents.discard(0)
+        self.assertEqual(len(bye_opponents), 2)
+
+        loaded_tournament = self.reload_tournament(tournament.id)
+        scores[0] = (0, sorted(bye_opponents))
+        self.assertEqual(get_scores(loaded_tournament), scores)
+        DatabaseHandler().apply_score_changes(loaded_tournament)
+        self.assertEqual(
+            [player.player_id for player in loaded_tournament.list_of_players].count(0),
+            1,
+        )
+
+        tournament = self.play_tournament(5, 3)
+        scores = get_scores(tournament)
+        self.close_tournament(tournament)
+        self.assertEqual(get_scores(self.reload_tournament(tournament.id)), scores)
+
+    def test_rounds_without_score_changes(self):
+        """Rounds saved before the score changes take the scores of the tournament,
+        rewritten after each round"""
+        for number_of_played_rounds in (2, 3):
+            with self.subTest(played_rounds=number_of_played_rounds):
+                tournament = self.play_tournament(6, 3, number_of_played_rounds)
+                scores = get_scores(tournament)
+                db_handler = DatabaseHandler()
+                db_handler.update_tournament_in_db(tournament, ["scores"])
+                db_handler.rounds_table.update(
+                    lambda document: document.pop("score_changes", None)
+                )
+                self.assertEqual(
+                    get_scores(self.reload_tournament(tournament.id)), scores
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
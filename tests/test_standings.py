@@ -0,0 +1,112 @@
+""" Check the standings kept in order against a full sort after each result """
+import random
+import unittest
+
+from controllers.standings import Standings
+from controllers.tie_break import compute_tie_breaks
+from tests.test_forecast import create_participants
+from tests.test_tie_break import get_brute_force_tie_breaks, play_random_round
+
+
+def sort_players(players: list, matches: list):
+    """Sort the players from the definitions of the score and the tie-breaks,
+    then by ranking, the player id ordering the players with the same ranking
+    Args:
+    players - list of Participants, the nobody player included
+    matches - Matches played, with their winners
+
+    Return:
+    list - player ids in the order of the standings"""
+    sort_keys = []
+    for player in players:
+        if not player.player_id:
+            continue
+        score = sum(
+            (0.5 if len(match.winner) > 1 else 1)
+            for match in matches
+            if player.player_id in match.winner
+        )
+        buchholz, median_buchholz, sonneborn_berger, cumulative = (
+            get_brute_force_tie_breaks(player.player_id, matches)
+        )
+        sort_keys.append(
+            (
+                -score,
+                -buchholz,
+                -median_buchholz,
+                -sonneborn_berger,
+                -cumulative,
+                player.ranking,
+                player.player_id,
+            )
+        )
+    return [sort_key[-1] for sort_key in sorted(sort_keys)]
+
+
+class TestStandings(unittest.TestCase):
+    """rank_of, top and get_players follow a full sort of the players"""
+
+    def assert_standings(self, standings: Standings, expected_ids: list):
+        """Check the places and the first players of the standings
+        Args:
+        standings - Standings to check
+        expected_ids - player ids in the order of the standings"""
+        self.assertEqual(
+            [standings.rank_of(player_id) for player_id in expected_ids],
+            list(range(1, len(expected_ids) + 1)),
+        )
+        for number_of_players in range(len(expected_ids) + 2):
+            self.assertEqual(
+                [player.player_id for player in standings.top(number_of_players)],
+                expected_ids[:number_of_players],
+            )
+        self.assertEqual(
+            [player.player_id for player in standings.get_players()], expected_ids
+        )
+
+    def test_each_result(self):
+        """Random tournaments with byes, rematches and tied rankings"""
+        for number_of_players in (2, 5, 8, 13):
+            for seed in range(5):
+                random_generator = random.Random(f"{number_of_players}-{seed}")
+                players = create_participants(random_generator, number_of_players)
+                standings = Standings(players)
+                matches = []
+                for round_number in range(1, 7):
+                    for match in play_random_round(
+                        random_generator, players, round_number
+                    ):
+                        standings.add_result(
+                            [player.player_id for player in match.pair_of_players],
+                            match.winner,
+                            round_number,
+                        )
+                        matches.append(match)
+                        with self.subTest(
+                            players=number_of_players,
+                            seed=seed,
+                            matches=len(matches),
+                        ):
+                            self.assert_standings(
+                                standings, sort_players(players, matches)
+                            )
+
+    def test_loaded_tournament(self):
+        """Standings of a loaded tournament, then updated round by round"""
+        random_generator = random.Random(0)
+        players = create_participants(random_generator, 9)
+        player_ids = [player.player_id for player in players]
+        matches = []
+        for round_number in range(1, 4):
+            matches += play_random_round(random_generator, players, round_number)
+        standings = Standings(players, compute_tie_breaks(player_ids, matches))
+        self.assert_standings(standings, sort_players(players, matches))
+        for round_number in range(4, 7):
+            round_matches = play_random_round(random_generator, players, round_number)
+            standings.add_round(round_matches)
+            matches += round_matches
+            self.assert_standings(standings, sort_players(players, matches))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+""" Check the incremental tie-breaks against their definitions """
+import random
+import unittest
+
+from models.match import Match
+from models.participant import Participant, create_no_player
+from models.player import Player
+
+from controllers.tie_break import TieBreaks, compute_tie_breaks
+
+
+def create_participants(number_of_players: int):
+    """Create participants, with the nobody player if their number is odd
+    Arg:
+    number_of_players - number of players, without the nobody player
+
+    Return:
+    list - Participants"""
+    players = [
+        Participant(
+            Player(
+                player_id=player_id,
+                last_name=f"PLAYER{player_id}",
+                first_name="Test",
+                date_of_birth="01/01/1990",
+                sex="M",
+                ranking=player_id,
+            )
+        )
+        for player_id in range(1, number_of_players + 1)
+    ]
+    if number_of_players % 2:
+        players.append(create_no_player())
+    return players
+
+
+def play_random_round(random_generator: random.Random, players: list, round_number):
+    """Pair the players at random, rematches included, with random results
+    Args:
+    random_generator - random.Random instance
+    players - list of Participants, the nobody player included
+    round_number - number of the round
+
+    Return:
+    list - Matches with their winners, the bye being won by the other player"""
+    shuffled_players = random_generator.sample(players, len(players))
+    matches = []
+    for player_01, player_02 in zip(shuffled_players[::2], shuffled_players[1::2]):
+        player_ids = [player_01.player_id, player_02.player_id]
+        if 0 in player_ids:
+            winner = [player_id for player_id in player_ids if player_id]
+        else:
+            winner = random_generator.choice(
+                [player_ids[:1], player_ids[1:], player_ids]
+            )
+        matches.append(
+            Match(
+                round_number=round_number,
+                pair_of_players=(player_01, player_02),
+                winner=winner,
+            )
+        )
+    return matches
+
+
+def get_brute_force_tie_breaks(player_id: int, matches: list):
+    """Compute the tie-breaks of a player from their definitions
+    Args:
+    player_id - unique id of the player
+    matches - Matches played, with their winners
+
+    Return:
+    tuple - Buchholz, median Buchholz, Sonneborn-Berger and cumulative score"""
+
+    def get_points(match, player_id):
+        if player_id not in match.winner:
+            return 0
+        return 0.5 if len(match.winner) > 1 else 1
+
+    def get_score(player_id, last_round_number):
+        return sum(
+            get_points(match, player_id)
+            for match in matches
+            if match.round_number <= last_round_number
+        )
+
+    last_round_number = max([match.round_number for match in matches], default=0)
+    opponent_scores = []
+    sonneborn_berger = 0
+    for match in matches:
+        player_ids = [player.player_id for player in match.pair_of_players]
+        if player_id not in player_ids or 0 in player_ids:
+            continue
+        opponent_id = sum(player_ids) - player_id
+        opponent_score = get_score(opponent_id, last_round_number)
+        opponent_scores.append(opponent_score)
+        sonneborn_berger += get_points(match, player_id) * opponent_score
+
+    buchholz = sum(opponent_scores)
+    median_buchholz = buchholz
+    if len(opponent_scores) >= 3:
+        median_buchholz -= max(opponent_scores) + min(opponent_scores)
+    cumulative = sum(
+        get_score(player_id, round_number)
+        for round_number in range(1, last_round_number + 1)
+    )
+    return buchholz, median_buchholz, sonneborn_berger, cumulative
+
+
+class TestTieBreaks(unittest.TestCase):
+    """The tie-breaks updated with each result, and computed at once from the
+    matches, are those of the definitions"""
+
+    def test_random_tournaments(self):
+        """Random pairings with byes and rematches, checked after each round"""
+        for number_of_players in (2, 3, 5, 8, 11):
+            for seed in range(10):
+                random_generator = random.Random(f"{number_of_players}-{seed}")
+                players = create_participants(number_of_players)
+                player_ids = [player.player_id for player in players]
+                tie_breaks = TieBreaks(player_ids)
+                matches = []
+                for round_number in range(1, 8):
+                    round_matches = play_random_round(
+                        random_generator, players, round_number
+                    )
+                    matches += round_matches
+                    tie_breaks.add_round(round_matches)
+                    computed_tie_breaks = compute_tie_breaks(player_ids, matches)
+                    for player_id in player_ids[:number_of_players]:
+                        with self.subTest(
+                            players=number_of_players,
+                            seed=seed,
+                            round_number=round_number,
+                            player_id=player_id,
+                        ):
+                            expected_tie_breaks = get_brute_force_tie_breaks(
+                                player_id, matches
+                            )
+                            self.assertEqual(
+                                tie_breaks.get_tie_breaks(player_id),
+                                expected_tie_breaks,
+                            )
+                            self.assertEqual(
+                                computed_tie_breaks.get_tie_breaks(player_id),
+                                expected_tie_breaks,
+                            )
+
+    def test_copy(self):
+        """The results applied to a copy leave the tie-breaks unchanged"""
+        random_generator = random.Random(0)
+        players = create_participants(6)
+        player_ids = [player.player_id for player in players]
+        tie_breaks = TieBreaks(player_ids)
+        matches = play_random_round(random_generator, players, 1)
+        tie_breaks.add_round(matches)
+        expected_tie_breaks = [
+            tie_breaks.get_tie_breaks(player_id) for player_id in player_ids
+        ]
+        tie_breaks.copy().add_round(play_random_round(random_generator, players, 2))
+        self.assertEqual(
+            [tie_breaks.get_tie_breaks(player_id) for player_id in player_ids],
+            expected_tie_breaks,
+        )
+
+    def test_nobody_player(self):
+        """The bye gives its point, without counting as an opponent"""
+        tie_breaks = TieBreaks([1, 2, 3, 0])
+        tie_breaks.add_result([1, 0], [1], 1)
+        tie_breaks.add_result([2, 3], [2, 3], 1)
+        self.assertNotIn(0, tie_breaks.scores)
+        self.assertEqual(tie_breaks.scores[1], 1)
+        self.assertEqual(tie_breaks.games[1], [])
+        self.assertEqual(tie_breaks.get_tie_breaks(1), (0, 0, 0, 1))
+        self.assertEqual(tie_breaks.get_tie_breaks(0), (0, 0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+""" Check the transactions of DatabaseHandler and TransactionalJSONStorage """
+import unittest
+from unittest import mock
+
+from models.database import TransactionalJSONStorage
+
+from controllers.database_handler import DatabaseHandler
+from tests.helper import DatabaseTestCase
+
+
+class TestTransaction(DatabaseTestCase):
+    """The writes of a transaction reach db.json in one write, or not at all"""
+
+    def setUp(self):
+        """Save two players, then count the writes to db.json"""
+        super().setUp()
+        self.players = self.create_players(2)
+        write_to_file = mock.patch.object(
+            TransactionalJSONStorage,
+            "write_to_file",
+            autospec=True,
+            side_effect=TransactionalJSONStorage.write_to_file,
+        )
+        self.write_to_file = write_to_file.start()
+        self.addCleanup(write_to_file.stop)
+
+    def read_db_file(self):
+        """Read db.json
+
+        Return:
+        str - content of db.json"""
+        with open("db.json", encoding="utf-8") as json_file:
+            return json_file.read()
+
+    def test_one_write_per_transaction(self):
+        """The nested blocks are written with the outermost one"""
+        db_handler = DatabaseHandler()
+        with db_handler.transaction():
+            self.create_players(3)
+            with db_handler.transaction():
+                self.create_tournament(self.players, 3)
+                with db_handler.transaction():
+                    self.players[0].ranking = 10
+                    db_handler.update_player_in_db(self.players[0], ["ranking"])
+            self.assertEqual(self.write_to_file.call_count, 0)
+        self.assertEqual(self.write_to_file.call_count, 1)
+
+        DatabaseHandler.instance = None
+        db_handler = DatabaseHandler()
+        self.assertEqual(len(db_handler.players), 5)
+        self.assertEqual(db_handler.get_player_object_from_id(1).ranking, 10)
+        self.assertEqual(len(db_handler.get_tournaments_by_status(False)), 1)
+
+    def test_write_outside_transaction(self):
+        """Each write outside a transaction is written at once"""
+        db_handler = DatabaseHandler()
+        for ranking in (10, 20):
+            self.players[0].ranking = ranking
+            db_handler.update_player_in_db(self.players[0], ["ranking"])
+        self.assertEqual(self.write_to_file.call_count, 2)
+
+    def test_transaction_without_write(self):
+        """A transaction reading only does not write db.json"""
+        db_handler = DatabaseHandler()
+        with db_handler.transaction():
+            db_handler.get_tournaments_by_status(False)
+        self.write_to_file.assert_not_called()
+
+    def test_rollback(self):
+        """An exception discards the writes of all the nested blocks,
+        and the objects, ids and indexes are loaded again from db"""
+        db_handler = DatabaseHandler()
+        content = self.read_db_file()
+        with self.assertRaises(ZeroDivisionError):
+            with db_handler.transaction():
+                self.create_players(2)
+                self.players[1].ranking = 10
+                db_handler.update_player_in_db(self.players[1], ["ranking"])
+                with db_handler.transaction():
+                    self.create_tournament(self.players, 3)
+                    1 / 0
+        self.write_to_file.assert_not_called()
+        self.assertEqual(self.read_db_file(), content)
+        self.assertEqual(db_handler.transaction_depth, 0)
+
+        self.assertEqual(len(db_handler.players), 2)
+        self.assertIsNone(db_handler.get_player_object_from_id(3))
+        self.assertEqual(db_handler.get_player_object_from_id(2).ranking, 2)
+        self.assertIsNot(db_handler.get_player_object_from_id(2), self.players[1])
+        self.assertEqual(db_handler.get_tournaments_by_status(False), [])
+        self.assertEqual(db_handler.tournament_players_by_id, {})
+
+        """ The discarded ids are allocated again """
+        tournament = self.create_tournament(db_handler.players, 3)
+        self.assertEqual(tournament.id, 1)
+        self.assertEqual([player.player_id for player in self.create_players(1)], [3])
+        self.assertEqual(self.write_to_file.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -168,3 +168,29 @@ def display_prompt_after_selection():
     else:
         user_input = 2
         return user_input
+
+
+def get_menu_choice():
+    """Get the number of the option chosen by the user in a menu. The application
+    is left at the end of the input, instead of asking again forever.
+
+    Return:
+    int - number entered by the user, 0 if it is not a number"""
+    try:
+        return int(input("Saisissez votre choix : "))
+    except EOFError:
+        sys.exit()
+    except ValueError:
+        return 0
+
+
+def run_screens(screen):
+    """Display the screens of the menus one after the other in a single loop.
+    A screen is a method displaying a menu or a report and returning the next
+    screen, or None to leave the loop. Going back to a menu returns its screen
+    instead of creating the view again, so the call stack does not grow and
+    the views, created once, keep sharing the loaded DatabaseHandler.
+    Arg:
+    screen - first screen to display"""
+    while screen is not None:
+        screen = screen()
@@ -1,6 +1,5 @@
 """ Define the main menu view """
-import sys
-
+from views.helper import get_menu_choice, run_screens
 from views.report_menu import ReportMenuView
 
 from controllers.tournament_manager import TournamentManager, OngoingTournamentManager
@@ -26,37 +25,42 @@ class MainMenuView:
     """MainMenuView class"""
 
     def __init__(self):
-        """Init the following attribute:
+        """Init the following attributes:
         choice - choice of the user from the MENU_OPTIONS (1 to 6)
+        report_menu - instance of ReportMenuView, created once
 
-        Init methods:
-        display_menu - display the available options with title
-        get_user_selection - user prompt"""
+        Init method:
+        run_screens - display the main menu, then the screens chosen by the user,
+        in one loop until the user quits"""
         self.choice = ""
-        self.display_menu()
-        self.get_user_selection()
+        self.report_menu = ReportMenuView()
+        run_screens(self.display_menu)
 
     def display_menu(self):
-        """Display the main menu with the title of the program."""
+        """Display the main menu with the title of the program.
+
+        Return:
+        next screen"""
         print(TITLE_DECO)
         print(TITLE)
         print(TITLE_DECO)
         for key in MENU_OPTIONS.keys():
             print(key, " : ", MENU_OPTIONS[key])
 
+        return self.get_user_selection()
+
     def get_user_selection(self):
         """Display the user input section to enter a choice
-        and return the choice."""
+        and run the chosen action.
+
+        Return:
+        next screen, the main menu again once an action is done,
+        None to quit the application"""
         self.choice = 0
 
         while self.choice > 6 or self.choice <= 0:
-            try:
-                self.choice = int(input("Saisissez votre choix : "))
-                if self.choice > 6 or self.choice <= 0:
-                    raise Exception
-                else:
-                    pass
-            except Exception:
+            self.choice = get_menu_choice()
+            if self.choice > 6 or self.choice <= 0:
                 print(
                     "Veuillez entrer un nombre entre 1 et 6"
                     + " pour indiquer votre choix"
@@ -76,12 +80,8 @@ class MainMenuView:
             PlayerUpdater()
         elif self.choice == 5:
             """Generate reports"""
-            ReportMenuView()
+            return self.report_menu.display_menu
         elif self.choice == 6:
             """Exit the program"""
-            sys.exit()
-        else:
-            print(
-                "Veuillez entrer un nombre entre 1 et 6" + " pour indiquer votre choix"
-            )
-            self.choice = 0
+            return None
+        return self.display_menu
@@ -80,9 +80,10 @@ class PlayerView:
                 print("Entrée invalide.")
             else:
                 print("Player info :")
-                for player in self.db_handler.players:
-                    if player.player_id == int(self.player_id_to_update):
-                        print(f"{player}; classement : {player.ranking}")
+                player = self.db_handler.get_player_object_from_id(
+                    int(self.player_id_to_update)
+                )
+                print(f"{player}; classement : {player.ranking}")
 
         while not self.new_ranking.isnumeric():
             self.new_ranking = input("Nouvelle valeur de classement : ")
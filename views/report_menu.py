@@ -1,12 +1,35 @@
-""" Define report menu views"""
-import sys
+""" Define report menu views. Each menu or report is a screen: a method returning
+the next screen to display, run by run_screens in views/helper.py """
 from controllers.database_handler import DatabaseHandler
-from views.helper import display_prompt_after_selection
+from controllers.forecast import forecast_top_n
+from controllers.report_export import (
+    EXPORT_FORMATS,
+    export_report,
+    get_ordered_players,
+)
+from controllers.report_query import (
+    generate_standing_rows,
+    get_all_tournaments,
+    get_rounds_with_matches,
+    get_winners,
+)
+from views.helper import display_prompt_after_selection, get_menu_choice
 
 REPORTMENU_OPTIONS = {
     1: "Les joueurs",
     2: "Les tournois",
-    3: "Quitter l'application",
+    3: "Exporter un rapport",
+    4: "Quitter l'application",
+}
+
+EXPORT_REPORT_OPTIONS = {
+    1: "Joueurs par ordre alphabétique",
+    2: "Joueurs par classement",
+    3: "Historique des tournois",
+    4: "Matchs d'un tournoi",
+    5: "Matchs de tous les tournois",
+    6: "Classement d'un tournoi",
+    7: "Retourner au menu précédent",
 }
 
 PLAYER_REPORT_OPTIONS = {
@@ -25,7 +48,9 @@ TOURNAMENT_REPORT_OPTIONS = {
     1: "Liste de tous les joueurs du tournoi",
     2: "Liste de tous les tours du tournoi",
     3: "Liste de tous les matchs du tournoi",
-    4: "Retourner au menu précédent",
+    4: "Classement du tournoi",
+    5: "Prévision des chances de finir dans les N premiers",
+    6: "Retourner au menu précédent",
 }
 
 
@@ -33,223 +58,314 @@ class ReportMenuView:
     """ReportMenuView class"""
 
     def __init__(self):
-        """Init method:
-        display_menu - prompt for user to choose"""
-        self.display_menu()
+        """Init attributes, the views of the sub menus being created once:
+        db_handler - instance of DatabaseHandler
+        player_report_menu - instance of PlayerReportMenuView
+        tournament_report_menu - instance of TournamentReportMenuView
+        export_menu - instance of ExportMenuView
+
+        The menu is displayed by running its display_menu screen."""
+        self.db_handler = DatabaseHandler()
+        self.player_report_menu = PlayerReportMenuView(self)
+        self.tournament_report_menu = TournamentReportMenuView(self)
+        self.export_menu = ExportMenuView(self)
 
     def display_menu(self):
-        """Display prompt for user to choose from given options"""
+        """Display prompt for user to choose from given options
+
+        Return:
+        next screen, None to quit the application"""
         print("------------------")
         print("VOIR LES RAPPORTS")
         print("------------------")
-        choice = ""
 
         for key in REPORTMENU_OPTIONS.keys():
             print(key, " : ", REPORTMENU_OPTIONS[key])
 
-        try:
-            choice = int(input("Saisissez votre choix : "))
-        except Exception:
-            print(
-                "Veuillez entrer un nombre entre 1 et 4" + " pour indiquer votre choix"
-            )
+        choice = get_menu_choice()
 
         if choice == 1:
             """Show player's report menu"""
-            PlayerReportMenuView()
+            return self.player_report_menu.display_menu
         elif choice == 2:
             """Show tournament specific menu"""
-            TournamentReportMenuView()
+            return self.tournament_report_menu.display_tournament_main_menu
         elif choice == 3:
+            """Show the export menu"""
+            return self.export_menu.display_menu
+        elif choice == 4:
             """Exit the programme"""
-            sys.exit()
+            return None
         else:
             """Show a message in the case of invalid entry"""
-            print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 3 !!!")
-            self.display_menu()
+            print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 4 !!!")
+            return self.display_menu
+
+
+class ExportMenuView:
+    """ExportMenuView class"""
+
+    def __init__(self, report_menu: ReportMenuView):
+        """Init attributes:
+        report_menu - ReportMenuView to go back to
+        db_handler - instance of DatabaseHandler"""
+        self.report_menu = report_menu
+        self.db_handler = report_menu.db_handler
+
+    def display_menu(self):
+        """Display user prompt to choose the report to export, then its format
+        and its file
+
+        Return:
+        next screen"""
+        for key in EXPORT_REPORT_OPTIONS.keys():
+            print(key, " : ", EXPORT_REPORT_OPTIONS[key])
+
+        choice = get_menu_choice()
+
+        if choice == 1:
+            return self.export("players", order="name")
+        elif choice == 2:
+            return self.export("players", order="rank")
+        elif choice == 3:
+            return self.export("tournaments")
+        elif choice == 4:
+            return self.export("matches", tournament_id=self.get_tournament_id())
+        elif choice == 5:
+            return self.export("matches")
+        elif choice == 6:
+            return self.export("standings", tournament_id=self.get_tournament_id())
+        elif choice == 7:
+            """Go back to report menu"""
+            return self.report_menu.display_menu
+        else:
+            """Show a message in the case of invalid entry"""
+            print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 7 !!!")
+            return self.display_menu
+
+    def get_tournament_id(self):
+        """Get the id of the tournament to export from the user
+
+        Return:
+        int - unique id of an existing tournament"""
+        print("Voici la liste des tournois avec leur id dans la base de donnée")
+        for tournament in self.db_handler.tournaments:
+            print(f"({tournament.id}) {tournament}")
+        while True:
+            try:
+                tournament_id = int(input("Saisissez l'id d'un tournoi : "))
+            except ValueError:
+                tournament_id = 0
+            if self.db_handler.get_tournament_by_id(tournament_id) is not None:
+                return tournament_id
+            print("Entrée invalide. Veuillez choisir un id depuis la liste donnée.")
+
+    def get_export_format(self):
+        """Get the format of the exported file from the user
+
+        Return:
+        str - format of the file, one of EXPORT_FORMATS"""
+        while True:
+            export_format = input(
+                "Format du fichier (" + ", ".join(EXPORT_FORMATS) + ") : "
+            )
+            if export_format.strip().lower() in EXPORT_FORMATS:
+                return export_format.strip().lower()
+            print("Format invalide.")
+
+    def export(self, report: str, order="name", tournament_id=None):
+        """Export a report to the file chosen by the user
+        Args:
+        report - "players", "tournaments", "matches" or "standings"
+        order - order of the players, "name" or "rank"
+        tournament_id - unique id of the tournament of the matches or the standings,
+        all the tournaments by default
+
+        Return:
+        next screen"""
+        export_format = self.get_export_format()
+        file_path = input("Chemin du fichier : ").strip() or f"{report}.{export_format}"
+        try:
+            number_of_rows = export_report(
+                report, file_path, export_format, order, tournament_id
+            )
+            print(f"{number_of_rows} lignes exportées dans {file_path}")
+        except OSError as error:
+            print(f"Le fichier n'a pas pu être écrit : {error}")
+        """ Ask if quit or go back to the export menu """
+        display_prompt_after_selection()
+        return self.display_menu
 
 
 class PlayerReportMenuView:
     """PlayerReportMenuView class"""
 
-    def __init__(self):
-        """Init attribute:
-        db_handler - instance of DatabaseHandler
-
-        Init method:
-        display_menu - display user prompt to choose
-        get_user_selection - get user choice and act accordingly"""
-        self.db_handler = DatabaseHandler()
-        self.display_menu()
-        self.get_user_selection()
+    def __init__(self, report_menu: ReportMenuView):
+        """Init attributes:
+        report_menu - ReportMenuView to go back to
+        db_handler - instance of DatabaseHandler"""
+        self.report_menu = report_menu
+        self.db_handler = report_menu.db_handler
 
     def display_menu(self):
-        """Display user prompt to choose"""
+        """Display user prompt to choose
+
+        Return:
+        next screen"""
         for key in PLAYER_REPORT_OPTIONS.keys():
             print(key, " : ", PLAYER_REPORT_OPTIONS[key])
 
+        return self.get_user_selection()
+
     def get_user_selection(self):
-        """Get user choice and show ordered players according to user choice"""
-        choice = ""
+        """Get user choice and show ordered players according to user choice
 
-        try:
-            choice = int(input("Saisissez votre choix : "))
-        except Exception:
-            print(
-                "Veuillez entrer un nombre entre 1 et 3" + " pour indiquer votre choix"
-            )
+        Return:
+        next screen"""
+        choice = get_menu_choice()
 
         if choice == 1:
             """Sort all player in the database in alphabetical order"""
             print("Voici la liste des joueurs dans l'ordre alphabetique et leur id :")
-            ordered_players = self.db_handler.order_player_alphabetically(
-                self.db_handler.players
-            )
-            for player in ordered_players:
+            for player in get_ordered_players("name"):
                 print(f"{player} ({player.player_id})")
-            """ Ask if quit or go back """
-            final_choice = display_prompt_after_selection()
         elif choice == 2:
             """Sort all player in the database in their ranking's order"""
             print("Voici la liste des joueurs dans l'ordre de leur classement :")
-            ordered_players_by_rank = self.db_handler.order_player_by_rank(
-                self.db_handler.players
-            )
-            for player in ordered_players_by_rank:
+            for player in get_ordered_players("rank"):
                 print(f"{player} ({player.player_id}) : {player.ranking}")
-            """ Ask if quit or go back """
-            final_choice = display_prompt_after_selection()
         elif choice == 3:
             """Show the main report generator menu"""
-            ReportMenuView()
+            return self.report_menu.display_menu
         else:
             """Show a message in the case of invalid entry"""
             print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 3 !!!")
-            self.get_user_selection()
+            return self.get_user_selection
 
-        if final_choice == 2:
-            """Go back to report menu"""
-            ReportMenuView()
+        """ Ask if quit or go back to report menu """
+        display_prompt_after_selection()
+        return self.report_menu.display_menu
 
 
 class TournamentReportMenuView:
     """TournamentReportMenuView class"""
 
-    def __init__(self):
+    def __init__(self, report_menu: ReportMenuView):
         """Init attributes:
+        report_menu - ReportMenuView to go back to
         tournament_id(int) - id of the tournament given by the user
-        players(list) - list of players in the tournament
-        db_handler - instance of DatabaseHandler
-
-        Init method:
-        display_tournament_selection_menu - display user prompt for tournament selection"""
+        db_handler - instance of DatabaseHandler"""
+        self.report_menu = report_menu
         self.tournament_id = 0
-        self.players = []
-        self.db_handler = DatabaseHandler()
-
-        self.display_tournament_main_menu()
+        self.db_handler = report_menu.db_handler
 
     def display_tournament_main_menu(self):
-        """Display menu to choose which report to be generated, all tournaments' or one specific"""
-        option = ""
+        """Display menu to choose which report to be generated, all tournaments' or one specific
 
+        Return:
+        next screen"""
         for key in TOURNAMENT_REPORT_MAIN_OPTIONS.keys():
             print(key, " : ", TOURNAMENT_REPORT_MAIN_OPTIONS[key])
 
-        try:
-            option = int(input("Saisissez votre choix : "))
-        except Exception:
-            print("Veuillez entrer un nombre entre 1 et 3 pour indiquer votre choix")
+        option = get_menu_choice()
 
         if option == 1:
             """Show the list of all the tournament"""
             self.display_all_tournaments()
-            final_choice = display_prompt_after_selection()
+            """ Ask if quit or go back """
+            display_prompt_after_selection()
+            return self.display_tournament_main_menu
         elif option == 2:
             """Display list of tournaments to choose one from it"""
-            self.display_tournament_selection_menu()
+            return self.display_tournament_selection_menu
         elif option == 3:
             """Go back to the previous menu"""
-            ReportMenuView()
+            return self.report_menu.display_menu
         else:
             """Show a message in the case of invalid entry"""
             print("!!!Choix invalide. Veuillez entrer un nombre entre 1 et 3 !!!")
-            self.display_tournament_main_menu()
-
-        if final_choice == 2:
-            """Go back to the previous menu"""
-            self.display_tournament_main_menu()
+            return self.display_tournament_main_menu
 
     def display_all_tournaments(self):
-        """Display all tournaments in db"""
-        print("-------Liste de tous les tournois---------")
+        """Display all tournaments in db, rendered again only after a write
+        to a player or a tournament"""
+        print(
+            self.db_handler.report_cache.get_report(
+                "all_tournaments",
+                ("players", "tournaments"),
+                self.render_all_tournaments,
+            ),
+            end="",
+        )
+
+    def render_all_tournaments(self):
+        """Render the report of all tournaments in db
+
+        Return:
+        str - text of the report"""
+        lines = ["-------Liste de tous les tournois---------"]
         i = 1
-        for tournament in self.db_handler.tournaments:
-            print(
+        for tournament in get_all_tournaments():
+            lines.append(
                 f"{i}. Nom : {tournament.name}, Lieu : {tournament.location}, Date : {tournament.date}\n"
             )
-            print("")
-            print("Liste des joueurs :")
+            lines.append("")
+            lines.append("Liste des joueurs :")
             for player in tournament.list_of_players:
-                print(f"    {player}")
-            print("")
-            print("Nombre de tours : ", tournament.number_of_rounds)
-            for round in self.db_handler.rounds:
-                if round.tournament_id == tournament.id:
-                    print("")
-                    print(
-                        f"{round.round_name}, Numéro du tour : {round.round_number},"
-                        + f" Tour terminé : {round.is_round_finished}"
-                    )
-                    print("")
-                    print("Matchs :")
-                    for match in self.db_handler.matches:
-                        if (
-                            match.tournament_id == tournament.id
-                            and match.round_number == round.round_number
-                        ):
-                            self.get_printable_match_with_winners(match)
-            print("")
-            print(
+                lines.append(f"    {player}")
+            lines.append("")
+            lines.append(f"Nombre de tours :  {tournament.number_of_rounds}")
+            for round, matches in get_rounds_with_matches(tournament.id):
+                lines.append("")
+                lines.append(
+                    f"{round.round_name}, Numéro du tour : {round.round_number},"
+                    + f" Tour terminé : {round.is_round_finished}"
+                )
+                lines.append("")
+                lines.append("Matchs :")
+                for match in matches:
+                    lines.extend(self.get_match_with_winners_lines(match))
+            lines.append("")
+            lines.append(
                 f"Control du temps : {tournament.time_control}, Description : {tournament.description}\n"
                 + f"Tournoi fini : {tournament.is_finished}"
             )
             if tournament.is_finished:
-                print("")
-                print(" Résultats du tournoi :")
+                lines.append("")
+                lines.append(" Résultats du tournoi :")
                 for player in tournament.final_result:
-                    print(
+                    lines.append(
                         f"   {player} ({player.player_id}), classement : {player.ranking},"
                         + f" Score : {player.total_score}"
                     )
-            print("------")
+            lines.append("------")
             i += 1
+        return "\n".join(lines) + "\n"
 
     def display_tournament_selection_menu(self):
-        """Display user prompt to choose tournament to generate report"""
-        choice = ""
+        """Display user prompt to choose tournament to generate report
 
-        try:
-            print("Saisissez l'id d'un tournoi pour afficher son rapport")
-            print("Voici la liste des tournois avec leur id dans la base de donnée")
-            for tournament in self.db_handler.tournaments:
-                print(f"({tournament.id}) {tournament}")
+        Return:
+        next screen"""
+        print("Saisissez l'id d'un tournoi pour afficher son rapport")
+        print("Voici la liste des tournois avec leur id dans la base de donnée")
+        for tournament in self.db_handler.tournaments:
+            print(f"({tournament.id}) {tournament}")
 
+        try:
             choice = int(input("Saisissez l'id d'un tournoi : "))
-            """ Ask if quit or continue """
-        except Exception:
+        except ValueError:
             print("Veuillez entrer un id valide !")
-            self.display_tournament_selection_menu()
+            return self.display_tournament_selection_menu
 
         """ Validate if tournament exists in db else request again """
-        if self.validate_tournament_in_db(choice):
-            self.tournament_id = choice
-        else:
+        if not self.validate_tournament_in_db(choice):
             print("Entrée invalide. Veuillez choisir un id depuis la liste donnée.")
-            self.display_tournament_selection_menu()
+            return self.display_tournament_selection_menu
 
+        self.tournament_id = choice
         """ Display the menu to choose which report to be generated """
-        self.display_menu()
+        return self.display_menu
 
     def validate_tournament_in_db(self, tournament_id: int):
         """Validate the selected tournament exists
@@ -258,145 +374,227 @@ class TournamentReportMenuView:
 
         Returns:
         bool - tournament exist in the database"""
-        tournament_ids = []
-        for tournament in self.db_handler.tournaments:
-            tournament_ids.append(tournament.id)
-
-        if tournament_id in tournament_ids:
-            return True
-        else:
-            return False
+        return self.db_handler.get_tournament_by_id(tournament_id) is not None
 
     def display_menu(self):
-        """Display menu to choose which report to be generated"""
-        option = ""
+        """Display menu to choose which report to be generated
 
+        Return:
+        next screen"""
         for key in TOURNAMENT_REPORT_OPTIONS.keys():
             print(key, " : ", TOURNAMENT_REPORT_OPTIONS[key])
 
-        try:
-            option = int(input("Saisissez votre choix : "))
-        except Exception:
-            print("Veuillez entrer un nombre entre 1 et 4 pour indiquer votre choix")
+        option = get_menu_choice()
 
         if option == 1:
             """Show players' menu to choose the order"""
-            self.display_player_menu()
+            return self.display_player_menu
         elif option == 2:
             """Display rounds in the tournament"""
-            self.display_rounds()
+            return self.display_rounds
         elif option == 3:
             """Display matches in the tournament"""
-            self.display_matches()
+            return self.display_matches
         elif option == 4:
+            """Display the standings with the tie-breaks"""
+            return self.display_standings
+        elif option == 5:
+            """Display the forecast of the final standings"""
+            return self.display_forecast
+        elif option == 6:
             """Go back to the previous menu to choose tournament"""
-            self.display_tournament_selection_menu()
+            return self.display_tournament_selection_menu
         else:
             """Show a message in the case of invalid entry"""
-            print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 4 !!!")
-            self.display_menu()
+            print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 6 !!!")
+            return self.display_menu
 
     def display_player_menu(self):
-        """Display menu to choose in which order players' to be listed"""
+        """Display menu to choose in which order players' to be listed
+
+        Return:
+        next screen"""
         for key in PLAYER_REPORT_OPTIONS.keys():
             print(key, " : ", PLAYER_REPORT_OPTIONS[key])
 
-        for tournament in self.db_handler.tournaments:
-            if tournament.id == self.tournament_id:
-                self.players = tournament.list_of_players
-
         """ Get player sorting selection from user """
-        self.get_player_order_selection()
+        return self.get_player_order_selection()
 
     def get_player_order_selection(self):
-        """Get user's choice on in which order players to be listed"""
-        choice = ""
+        """Get user's choice on in which order players to be listed
 
-        try:
-            choice = int(input("Saisissez votre choix : "))
-        except Exception:
-            print(
-                "Veuillez entrer un nombre entre 1 et 3" + " pour indiquer votre choix"
-            )
+        Return:
+        next screen"""
+        choice = get_menu_choice()
 
         if choice == 1:
             print("Voici la liste des joueurs dans l'ordre alphabetique et leur id :")
-            ordered_players = self.db_handler.order_player_alphabetically(self.players)
-            for player in ordered_players:
+            for player in get_ordered_players("name", self.tournament_id):
                 print(f"{player} ({player.player_id})")
-            """ Ask if quit or go back """
-            final_choice = display_prompt_after_selection()
         elif choice == 2:
             print("Voici la liste des joueurs dans l'ordre de leur classement :")
-            ordered_players_by_rank = self.db_handler.order_player_by_rank(self.players)
-            for player in ordered_players_by_rank:
+            for player in get_ordered_players("rank", self.tournament_id):
                 print(f"{player} ({player.player_id}) : {player.ranking}")
-            """ Ask if quit or go back """
-            final_choice = display_prompt_after_selection()
         elif choice == 3:
             """Go back to the previous menu"""
-            self.display_menu()
+            return self.display_menu
         else:
             """Show a message in the case of invalid entry"""
             print("!!!Choix invalide." + " Veuillez entrer un nombre entre 1 et 3 !!!")
-            self.get_player_order_selection()
+            return self.get_player_order_selection
 
-        if final_choice == 2:
-            """Go back to the previous menu"""
-            self.display_player_menu()
+        """ Ask if quit or go back """
+        display_prompt_after_selection()
+        return self.display_player_menu
 
     def display_rounds(self):
-        """Display rounds of the tournament"""
-        print("\n Les tours du tournoi", self.tournament_id, "\n\n")
-        for round in self.db_handler.rounds:
-            if round.tournament_id == self.tournament_id:
-                print("")
-                print(f"{round.round_name}; Numéro de tour : {round.round_number} ;")
-                print("")
-                print("Matchs dans le tour : ")
-                for match in self.db_handler.matches:
-                    if (
-                        match.tournament_id == round.tournament_id
-                        and match.round_number == round.round_number
-                    ):
-                        self.get_printable_match_with_winners(match)
-        print("\n\n")
+        """Display rounds of the tournament
+
+        Return:
+        next screen"""
+        self.print_tournament_report("rounds", self.render_rounds)
         """ Ask if quit or go back """
-        final_choice = display_prompt_after_selection()
-        if final_choice == 2:
-            """Go back to previous menu"""
-            self.display_menu()
+        display_prompt_after_selection()
+        return self.display_menu
 
     def display_matches(self):
-        """Display matches in the tournament"""
-        print("\n Les matchs du tournoi", self.tournament_id, "\n\n")
-        for match in self.db_handler.matches:
-            if match.tournament_id == self.tournament_id:
-                self.get_printable_match_with_winners(match)
+        """Display matches in the tournament
+
+        Return:
+        next screen"""
+        self.print_tournament_report("matches", self.render_matches)
+        """ Ask if quit or go back """
+        display_prompt_after_selection()
+        return self.display_menu
+
+    def display_standings(self):
+        """Display the standings of the tournament after its finished rounds,
+        with the tie-breaks of the players
+
+        Return:
+        next screen"""
+        self.print_tournament_report("standings", self.render_standings)
+        """ Ask if quit or go back """
+        display_prompt_after_selection()
+        return self.display_menu
+
+    def display_forecast(self):
+        """Display the probability of each player of the tournament to finish
+        in the top N, simulated from the current scores and the remaining rounds
+
+        Return:
+        next screen"""
+        top_n = 0
+        try:
+            top_n = int(input("Nombre de places à prévoir (N) : "))
+        except ValueError:
+            pass
+        if top_n <= 0:
+            print("Veuillez entrer un nombre de places supérieur à 0 !")
+            return self.display_forecast
+
+        tournament = self.db_handler.get_tournament_by_id(self.tournament_id)
+        number_of_played_rounds = len(
+            [
+                round
+                for round in self.db_handler.get_rounds_in_a_tournament(
+                    self.tournament_id
+                )
+                if round.is_round_finished
+            ]
+        )
+        print("Simulation des tours restants...")
+        probabilities = forecast_top_n(
+            tournament.list_of_players,
+            number_of_played_rounds,
+            int(tournament.number_of_rounds),
+            top_n,
+            self.db_handler.get_matches_of_finished_rounds(self.tournament_id),
+        )
+        print(
+            f"\n Chances de finir dans les {top_n} premiers après"
+            + f" {number_of_played_rounds} tour(s) sur {tournament.number_of_rounds} :\n"
+        )
+        for player in sorted(
+            tournament.list_of_players,
+            key=lambda player: probabilities[player.player_id],
+            reverse=True,
+        ):
+            print(
+                f"{player} ({player.player_id}), Score : {player.total_score} :"
+                + f" {probabilities[player.player_id]:.1%}"
+            )
         print("\n\n")
         """ Ask if quit or go back """
-        final_choice = display_prompt_after_selection()
-        if final_choice == 2:
-            """Go back to previous menu"""
-            self.display_menu()
+        display_prompt_after_selection()
+        return self.display_menu
+
+    def print_tournament_report(self, report_name: str, render_report):
+        """Print a report of the selected tournament, rendered again only after
+        a write to a player or to the tournament, its rounds or its matches
+        Args:
+        report_name - name of the report in the cache
+        render_report - method rendering the report"""
+        print(
+            self.db_handler.report_cache.get_report(
+                (report_name, self.tournament_id),
+                ("players", ("tournament", self.tournament_id)),
+                render_report,
+            ),
+            end="",
+        )
+
+    def render_rounds(self):
+        """Render the rounds of the tournament with their matches
 
-    def get_winners_from_list(self, winners: list):
-        """Get winners from the list of their ids
-        Arg:
-        winners(list) - list of winner ids
+        Return:
+        str - text of the report"""
+        lines = [f"\n Les tours du tournoi {self.tournament_id} \n\n"]
+        for round, matches in get_rounds_with_matches(self.tournament_id):
+            lines.append("")
+            lines.append(f"{round.round_name}; Numéro de tour : {round.round_number} ;")
+            lines.append("")
+            lines.append("Matchs dans le tour : ")
+            for match in matches:
+                lines.extend(self.get_match_with_winners_lines(match))
+        lines.append("\n\n")
+        return "\n".join(lines) + "\n"
+
+    def render_matches(self):
+        """Render the matches of the tournament
+
+        Return:
+        str - text of the report"""
+        lines = [f"\n Les matchs du tournoi {self.tournament_id} \n\n"]
+        for match in self.db_handler.get_matches_in_a_tournament(self.tournament_id):
+            lines.extend(self.get_match_with_winners_lines(match))
+        lines.append("\n\n")
+        return "\n".join(lines) + "\n"
+
+    def render_standings(self):
+        """Render the standings of the tournament after its finished rounds,
+        with the tie-breaks of the players
+
+        Return:
+        str - text of the report"""
+        lines = [f"\n Classement du tournoi {self.tournament_id} \n"]
+        for row in generate_standing_rows(self.tournament_id):
+            lines.append(
+                f"{row['rank']}. {row['player']} ({row['player_id']}),"
+                + f" Score : {row['score']}, Buchholz : {row['buchholz']},"
+                + f" Buchholz médian : {row['median_buchholz']},"
+                + f" Sonneborn-Berger : {row['sonneborn_berger']},"
+                + f" Cumulatif : {row['cumulative']}"
+            )
+        lines.append("\n\n")
+        return "\n".join(lines) + "\n"
+
+    def get_match_with_winners_lines(self, match):
+        """Get the lines of a match followed by its winners, one by one
 
         Return:
-        List of player objects"""
-        winner_list = []
-        for w in winners:
-            winner = self.db_handler.get_player_object_from_id(w)
-            winner_list.append(winner)
-        return winner_list
-
-    def get_printable_match_with_winners(self, match):
-        """Get winners of a match and print one by one."""
-        print("")
-        winner = self.get_winners_from_list(match.winner)
-        print(f"{match} ; gagnant/s :")
-        for i in range(0, len(winner)):
-            print(" ", winner[i])
+        list of str - lines of the match"""
+        lines = ["", f"{match} ; gagnant/s :"]
+        for winner in get_winners(match):
+            lines.append(f"  {winner}")
+        return lines
@@ -20,8 +20,10 @@ class RoundView:
         matches - list of Match objects
 
         Init methods:
-        display_round_prompt - Prompt for the user
-        save_round_to_db_with_matches - Save round with the current matches to the db"""
+        display_round_prompt - Prompt for the user, each result is saved when entered
+
+        The round itself is saved by the caller with save_round_to_db_with_matches,
+        once all the results are entered"""
         self.db_handler = DatabaseHandler()
         self.round = round
         self.number_of_matches = number_of_matches
@@ -30,19 +32,25 @@ class RoundView:
         self.winners_list = []
         self.matches = []
 
+        """ Matches of the round already saved before an interruption """
+        previously_saved_matches = list(
+            self.db_handler.get_matches_in_a_round(
+                self.round.tournament_id, self.round.round_number
+            )
+        )
+
         self.display_round_prompt()
 
-        """ Get winners of the matches in the round and saved matches in the round """
-        for match in self.db_handler.matches:
-            if (
-                match.tournament_id == self.round.tournament_id
-                and match.round_number == self.round.round_number
-            ):
-                self.winners_list.append(match.winner)
-                self.matches.append(match)
+        """ Get winners of the previously saved matches and all saved matches in the round.
+        The shared db_handler already holds the matches saved in display_round_prompt. """
+        for match in self.db_handler.get_matches_in_a_round(
+            self.round.tournament_id, self.round.round_number
+        ):
+            if match in previously_saved_matches:
+                self.winners_list.append([str(w) for w in match.winner])
+            self.matches.append(match)
 
         self.round_end_date_time = datetime.now()
-        self.save_round_to_db_with_matches()
 
     def display_round_prompt(self):
         """Diplay generated matches and prompt for winners and end date time."""
@@ -80,14 +88,11 @@ class RoundView:
                 for w in winner_to_list:
                     if w.isnumeric():
                         self.round.matches[match_number - 1].winner.append(int(w))
-                        self.round.matches[
-                            match_number - 1
-                        ].round_number = self.round.round_number
-                        """ Save match to db """
-                        serialized_match = self.db_handler.save_match_to_db(
-                            self.round.matches[match_number - 1]
-                        )
-                        match = self.db_handler.get_deserialized_match(serialized_match)
+                self.round.matches[
+                    match_number - 1
+                ].round_number = self.round.round_number
+                """ Save match to db once, even in case of a draw """
+                self.db_handler.save_match_to_db(self.round.matches[match_number - 1])
             self.winners_list.append(winner_to_list)
             iterations -= 1
 
@@ -143,10 +143,9 @@ class OngoingTournamentView:
         tournament(Tournament) - tournament object corresponding to user entry"""
 
         print("Liste de nom/s et id/s de tournoi en cours : ")
-        for tournament in self.db_handler.tournaments:
-            if tournament.is_finished is False:
-                print(f"{tournament.name} : {tournament.id}")
-                self.ongoing_tournaments.append(tournament)
+        for tournament in self.db_handler.get_tournaments_by_status(False):
+            print(f"{tournament.name} : {tournament.id}")
+            self.ongoing_tournaments.append(tournament)
         while not self.tournament_id.isnumeric():
             self.tournament_id = input("L'id du tournoi a charger : ")
 
@@ -158,30 +157,26 @@ class OngoingTournamentView:
                 print("Entrée invalide. Veuillez choisir un id depuis la liste ci-dessus.")
 
         print("Vous avez choisi", self.tournament_id, "voici les infos lieés :")
-        for tournament in self.db_handler.tournaments:
-            if int(self.tournament_id) == tournament.id:
-                print(
-                    f"Nom du tournoi : {tournament.name} \nLieu : {tournament.location} \n"
-                    + f"Date : {tournament.date} \nNombre de tours : {tournament.number_of_rounds} \nListe de tours :"
-                )
-                for round in self.db_handler.rounds:
-                    if round.tournament_id == tournament.id:
-                        print(" ", round, "avec les matchs :")
-                        for match in self.db_handler.matches:
-                            if (
-                                round.tournament_id == match.tournament_id
-                                and round.round_number == match.round_number
-                            ):
-                                print(match)
-                print(
-                    f"Nombre de joueurs : {len(tournament.list_of_players)} \nListe de Joueurs :"
-                )
-                for player in tournament.list_of_players:
-                    print(" ", player)
-                print(
-                    f"Contrôl du temps : {tournament.time_control} \nDescription : {tournament.description}"
-                )
-                return tournament
+        tournament = self.db_handler.get_tournament_by_id(int(self.tournament_id))
+        print(
+            f"Nom du tournoi : {tournament.name} \nLieu : {tournament.location} \n"
+            + f"Date : {tournament.date} \nNombre de tours : {tournament.number_of_rounds} \nListe de tours :"
+        )
+        for round in self.db_handler.get_rounds_in_a_tournament(tournament.id):
+            print(" ", round, "avec les matchs :")
+            for match in self.db_handler.get_matches_in_a_round(
+                tournament.id, round.round_number
+            ):
+                print(match)
+        print(
+            f"Nombre de joueurs : {len(tournament.list_of_players)} \nListe de Joueurs :"
+        )
+        for player in tournament.list_of_players:
+            print(" ", player)
+        print(
+            f"Contrôl du temps : {tournament.time_control} \nDescription : {tournament.description}"
+        )
+        return tournament
 
     def validate_tournament_in_list(self, tournament_id: int):
         """Validate the tournament selected by the user is an unfinished one.
@@ -190,10 +185,5 @@ class OngoingTournamentView:
 
         Return:
         bool - tournament is in the ongoing_tournaments list"""
-        tournament_ids = []
-        for tournament in self.ongoing_tournaments:
-            tournament_ids.append(tournament.id)
-        if tournament_id in tournament_ids:
-            return True
-        else:
-            return False
+        tournament = self.db_handler.get_tournament_by_id(tournament_id)
+        return tournament is not None and tournament in self.ongoing_tournaments